@@ -0,0 +1,92 @@
+"""
+bench_api.py – Response times of the JSON API against full dashboard renders
+
+Rooms of 10k and 100k seats (tables of 4, 90% seated, 1000 people waiting
+for a seat) are served by the Flask app through its test client. For each
+request it reports the median time over --repeat calls:
+
+- dashboard:      GET /dashboard, what every form action redirects to
+- add + redirect: POST /add_person followed by GET /dashboard (one click before)
+- api/room:       GET /api/room summary
+- api/tables:     GET /api/tables, one page of 100 tables
+- api/tables 304: the same with If-None-Match on the current version
+- api/unseated:   GET /api/unseated, one page of 100 names
+- api add:        POST /api/people, answered with the changed tables only
+
+Usage:
+------
+>>> python benchmarks/bench_api.py
+>>> python benchmarks/bench_api.py --seats 10000 --repeat 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from model.openspace import Openspace
+from user_interface import webapp
+from utils.room_state import LocalRoomState
+
+SEATS_PER_TABLE = 4
+WAITING = 1000
+
+
+def median_ms(repeat: int, request) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = request()
+        timings.append(time.perf_counter() - start)
+        assert response.status_code in (200, 302, 304), response.status_code
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON API benchmark")
+    parser.add_argument("--seats", type=int, nargs="+", default=[10_000, 100_000], help="room sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="calls per request")
+    options = parser.parse_args()
+
+    client = webapp.app.test_client()
+    print(f"{'seats':>8}{'dashboard':>11}{'add+redir':>11}{'api/room':>10}{'api/tables':>12}"
+          f"{'tables 304':>12}{'unseated':>10}{'api add':>9}   (ms)")
+    for seats in options.seats:
+        room = Openspace.with_capacities([SEATS_PER_TABLE] * (seats // SEATS_PER_TABLE))
+        names = [f"Person{i}" for i in range(seats * 9 // 10)]
+        room.organize(names, strategy="first_fit", seed=0)
+        room.unassigned.extend(f"Waiting{i}" for i in range(WAITING))
+        webapp.room_state = LocalRoomState()
+        webapp.room_state.replace(room)
+        middle = seats // SEATS_PER_TABLE // 2
+        counter = iter(range(10 ** 9))
+
+        def add_and_redirect():
+            client.post("/add_person", data={"name": f"Click{next(counter)}"})
+            return client.get("/dashboard")
+
+        page = f"/api/tables?offset={middle}&limit=100"
+
+        timings = [
+            median_ms(options.repeat, lambda: client.get("/dashboard")),
+            median_ms(options.repeat, add_and_redirect),
+            median_ms(options.repeat, lambda: client.get("/api/room")),
+        ]
+        etag = client.get(page).headers["ETag"]
+        timings += [
+            median_ms(options.repeat, lambda: client.get(page)),
+            median_ms(options.repeat, lambda: client.get(page, headers={"If-None-Match": etag})),
+            median_ms(options.repeat, lambda: client.get("/api/unseated?limit=100")),
+            median_ms(options.repeat, lambda: client.post("/api/people", json={"name": f"Api{next(counter)}"})),
+        ]
+        widths = (11, 11, 10, 12, 12, 10, 9)
+        print(f"{seats:>8}" + "".join(f"{timing:>{width}.1f}" for timing, width in zip(timings, widths)))
+
+
+if __name__ == "__main__":
+    main()
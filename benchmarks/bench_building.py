@@ -0,0 +1,86 @@
+"""
+bench_building.py – Scaling of the Building model from 1 to 50 rooms
+
+Every room has 200 tables of mixed sizes (2, 4, 4, 6 and 8 seats) and the
+roster fills 90% of the building. For each building size it reports:
+
+- serial:   one Openspace.organize() per room, the roster split by room capacity
+- batched:  Building.organize(), one shuffle and one allocation for all rooms
+- post:     Building.eliminate_lonely_tables() in-process, then with a
+            process pool of --workers processes, after 40% of the people
+            left their seat so that every room has lonely tables to fix
+
+Usage:
+------
+>>> python benchmarks/bench_building.py
+>>> python benchmarks/bench_building.py --workers 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.building import Building
+from model.openspace import Openspace
+
+TABLE_SIZES = [2, 4, 4, 6, 8]
+TABLES_PER_ROOM = 200
+ROOM_COUNTS = [1, 5, 10, 25, 50]
+
+
+def make_building(rooms: int) -> Building:
+    building = Building()
+    for index in range(rooms):
+        building.add_room(f"Floor {index + 1}", TABLE_SIZES * (TABLES_PER_ROOM // len(TABLE_SIZES)))
+    return building
+
+
+def serial(rooms: int, names) -> float:
+    """
+    Organize each room on its own, as callers had to before the Building layer.
+    """
+    spaces = [Openspace.with_capacities(TABLE_SIZES * (TABLES_PER_ROOM // len(TABLE_SIZES))) for _ in range(rooms)]
+    share = len(names) // rooms
+    start = time.perf_counter()
+    for index, room in enumerate(spaces):
+        room.organize(names[index * share:(index + 1) * share], strategy="first_fit", seed=index)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Building scaling benchmark")
+    parser.add_argument("--workers", type=int, default=4, help="processes of the parallel post-pass")
+    options = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}, post-pass pool: {options.workers} workers\n")
+    print(f"{'rooms':>6}{'people':>9}{'serial s':>10}{'batched s':>11}{'post s':>9}{'post pool s':>13}"
+          f"{'alone after':>13}")
+    for rooms in ROOM_COUNTS:
+        seats = rooms * sum(TABLE_SIZES) * (TABLES_PER_ROOM // len(TABLE_SIZES))
+        names = [f"Person{i}" for i in range(seats * 9 // 10)]
+        serial_seconds = serial(rooms, names)
+
+        timings = []
+        for workers in (0, options.workers):
+            building = make_building(rooms)
+            start = time.perf_counter()
+            building.organize(names, strategy="first_fit", seed=0)
+            batched = time.perf_counter() - start
+            leaving = random.Random(rooms).sample(names, len(names) * 4 // 10)
+            for name in leaving:
+                room_name = building.locate(name)[0]
+                building.rooms[room_name].remove_person_from_room(name)
+            start = time.perf_counter()
+            building.eliminate_lonely_tables(workers=workers)
+            timings.append(time.perf_counter() - start)
+        alone = sum(len(people) for people in building.lonely_people().values())
+        print(f"{rooms:>6}{len(names):>9}{serial_seconds:>10.3f}{batched:>11.3f}{timings[0]:>9.3f}{timings[1]:>13.3f}"
+              f"{alone:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+bench_constraints.py – Whitelist/blacklist seating at scale
+
+Generates rosters with sparse and dense constraint graphs and times
+Openspace.organize() with them, then checks the layout: blacklisted pairs
+sharing a table, whitelisted pairs split, people left without a seat and
+people sitting alone.
+
+- sparse: 10k people, 1k sit-together pairs, 2k avoid pairs
+- dense:  10k people, 4k sit-together pairs (groups of up to 4), 40k avoid pairs
+- huge:   50k people, 10k sit-together pairs, 100k avoid pairs
+
+The room has 10% more seats than people, 4 per table.
+
+Usage:
+------
+>>> python benchmarks/bench_constraints.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.constraints import PairConstraints
+from model.openspace import Openspace
+
+SEATS_PER_TABLE = 4
+
+ROSTERS = [
+    ("sparse", 10_000, 1_000, 2_000),
+    ("dense", 10_000, 4_000, 40_000),
+    ("huge", 50_000, 10_000, 100_000),
+]
+
+
+def make_roster(people: int, together: int, apart: int, seed: int = 0):
+    """
+    Build names and random constraints. Sit-together pairs chain people in
+    small clusters (consecutive ids) so that groups stay table sized.
+    """
+    rng = random.Random(seed)
+    names = [f"Person{i}" for i in range(people)]
+    constraints = PairConstraints()
+    for _ in range(together):
+        first = rng.randrange(0, people - 1, 4)
+        constraints.add_together(names[first + rng.randrange(4)], names[min(first + rng.randrange(4), people - 1)])
+    for _ in range(apart):
+        constraints.add_apart(names[rng.randrange(people)], names[rng.randrange(people)])
+    return names, constraints
+
+
+def check(room: Openspace, names, constraints: PairConstraints) -> tuple:
+    """
+    Count broken wishes and unseated / lonely people in a layout.
+    """
+    table_of = {}
+    for name in names:
+        location = room.seat_store.locate(name)
+        if location:
+            table_of[name] = location[0]
+    clashes = sum(1 for a, b in constraints.apart if a in table_of and table_of.get(a) == table_of.get(b))
+    split = sum(1 for a, b in constraints.together if a in table_of and b in table_of and table_of[a] != table_of[b])
+    return clashes, split, len(names) - len(table_of), len(room.seat_store.lonely_tables())
+
+
+def main() -> None:
+    print(f"{'roster':<8}{'people':>8}{'pairs':>9}{'organize s':>12}{'clashes':>9}{'split':>7}"
+          f"{'unseated':>10}{'alone':>7}{'reported':>10}")
+    for label, people, together, apart in ROSTERS:
+        names, constraints = make_roster(people, together, apart)
+        tables = (people * 11 // 10) // SEATS_PER_TABLE + 1
+        room = Openspace(tables, SEATS_PER_TABLE)
+        start = time.perf_counter()
+        room.organize(names, seed=0, constraints=constraints)
+        elapsed = time.perf_counter() - start
+        clashes, split, unseated, alone = check(room, names, constraints)
+        print(f"{label:<8}{people:>8}{len(constraints):>9}{elapsed:>12.3f}{clashes:>9}{split:>7}"
+              f"{unseated:>10}{alone:>7}{len(room.constraint_violations):>10}")
+
+
+if __name__ == "__main__":
+    main()
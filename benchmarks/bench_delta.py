@@ -0,0 +1,118 @@
+"""
+bench_delta.py – Incremental repair (Openspace.apply_delta) against a full reorganize
+
+A room of 20k tables of mixed sizes (2, 4, 4, 6 and 8 seats) is seated at
+80% with the first_fit strategy and cleared of lonely tables. Then, for
+deltas of 1 to 1000 people arriving and as many leaving, it reports:
+
+- delta:  time of apply_delta(), people it moved and lonely tables left
+- full:   time of organize() + eliminate_lonely_tables() on the resulting
+          roster, people who changed table and lonely tables left
+
+The repo has no test suite, so the script also checks, on --trials small
+random rooms seated with the balanced strategy, that apply_delta() never
+leaves more lonely tables than both the room before the change and a full
+reorganize of the same people.
+
+Usage:
+------
+>>> python benchmarks/bench_delta.py
+>>> python benchmarks/bench_delta.py --tables 50000 --trials 0
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+
+TABLE_SIZES = [2, 4, 4, 6, 8]
+DELTAS = [1, 10, 100, 1000]
+
+
+def seated_room(capacities, names, seed, strategy="first_fit") -> Openspace:
+    room = Openspace.with_capacities(capacities)
+    room.organize(names, strategy=strategy, seed=seed)
+    room.eliminate_lonely_tables()
+    return room
+
+
+def table_of(room: Openspace):
+    store = room.seat_store
+    return {name: position for position in range(len(store.capacities)) for name in store.table_occupants(position)}
+
+
+def check(trials: int) -> int:
+    """
+    Compare apply_delta() with a full reorganize on small random rooms.
+
+    :return: Number of rooms left with more lonely tables than both references
+    """
+    worse = 0
+    for trial in range(trials):
+        worse += _check_room(trial)
+    return worse
+
+
+def _check_room(trial: int) -> bool:
+    rng = random.Random(trial)
+    capacities = [rng.randint(1, 6) for _ in range(rng.randint(1, 12))]
+    names = [f"Person{i}" for i in range(rng.randint(0, sum(capacities) + 3))]
+    room = seated_room(capacities, names, trial, "balanced")
+    before = len(room.seat_store.lonely_tables())
+    removed = rng.sample(names, rng.randint(0, len(names)))
+    added = [f"Newcomer{i}" for i in range(rng.randint(0, 5))]
+    room.apply_delta(added, removed)
+
+    remaining = set(names).difference(removed).union(added)
+    assert room.total_people_in_room() == len(remaining), trial
+    assert all(not room.is_person_seated(name) and name not in room.unassigned for name in removed), trial
+
+    if len(remaining) < 2:
+        return False  # sitting alone is the only option; organize() leaves them unseated instead
+    full = seated_room(capacities, sorted(remaining), trial, "balanced")
+    return len(room.seat_store.lonely_tables()) > max(before, len(full.seat_store.lonely_tables()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental repair benchmark")
+    parser.add_argument("--tables", type=int, default=20_000, help="tables in the room")
+    parser.add_argument("--trials", type=int, default=2000, help="small random rooms to check; 0 to skip")
+    options = parser.parse_args()
+
+    capacities = TABLE_SIZES * (options.tables // len(TABLE_SIZES))
+    names = [f"Person{i}" for i in range(sum(capacities) * 8 // 10)]
+    print(f"{len(capacities)} tables, {len(names)} people\n")
+    print(f"{'delta':>7}{'delta s':>10}{'moved':>7}{'lonely':>8}{'full s':>9}{'moved':>9}{'lonely':>8}")
+    for size in DELTAS:
+        room = seated_room(capacities, names, size)
+        before = table_of(room)
+        removed = random.Random(size).sample(names, size)
+        added = [f"Newcomer{i}" for i in range(size)]
+
+        start = time.perf_counter()
+        report = room.apply_delta(added, removed)
+        delta_seconds = time.perf_counter() - start
+
+        remaining = [name for name in names if name not in set(removed)] + added
+        start = time.perf_counter()
+        full = seated_room(capacities, remaining, size)
+        full_seconds = time.perf_counter() - start
+        after = table_of(full)
+        full_moved = sum(1 for name, position in before.items() if name in after and after[name] != position)
+        print(f"{size:>7}{delta_seconds:>10.4f}{len(report['moved']):>7}{len(room.seat_store.lonely_tables()):>8}"
+              f"{full_seconds:>9.3f}{full_moved:>9}{len(full.seat_store.lonely_tables()):>8}")
+
+    if options.trials:
+        worse = check(options.trials)
+        print(f"\n{options.trials} random rooms: {worse} left with more lonely tables than before and than a full reorganize")
+        if worse:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
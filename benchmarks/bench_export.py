@@ -0,0 +1,101 @@
+"""
+bench_export.py – Seating plan export, per format
+
+Fills a 200k-seat room (4 seats per table, 7/8 occupied) and exports it in
+every format of utils.exporters, reporting wall time, traced peak memory
+and file size. Two references show the paths the exporters replace:
+
+- views csv:     csv.writer.writerow per seat through Table/Seat views
+                 (the former Openspace.store)
+- pandas xlsx:   list of dicts -> DataFrame -> xlsxwriter engine
+                 (the former /store_csv route)
+
+Parquet and Arrow are skipped when pyarrow is not installed.
+
+Usage:
+------
+>>> python benchmarks/bench_export.py
+>>> python benchmarks/bench_export.py 50000   # another number of seats
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+from utils.exporters import export_seating
+
+SEATS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+SEATS_PER_TABLE = 4
+
+
+def views_csv(room: Openspace, path: str) -> None:
+    with open(path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Table", "Seat", "Occupant"])
+        for table_index, table in enumerate(room.tables, start=1):
+            for seat_index, seat in enumerate(table.seats, start=1):
+                writer.writerow([table_index, seat_index, seat.occupant if not seat.free else "Free"])
+
+
+def pandas_xlsx(room: Openspace, path: str) -> None:
+    import pandas as pd
+
+    rows = []
+    for table_index, table in enumerate(room.tables, start=1):
+        for seat_number, seat in enumerate(table.seats, start=1):
+            rows.append({"Table": table_index, "Seat": seat_number, "Name": seat.occupant or "Free"})
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        pd.DataFrame(rows).to_excel(writer, index=False, sheet_name="Seating")
+
+
+CASES = [
+    ("views csv (before)", "csv", views_csv),
+    ("csv", "csv", None),
+    ("jsonl", "jsonl", None),
+    ("parquet", "parquet", None),
+    ("arrow", "arrow", None),
+    ("pandas xlsx (before)", "xlsx", pandas_xlsx),
+    ("xlsx", "xlsx", None),
+]
+
+
+def measure(room: Openspace, path: str, fmt: str, function) -> tuple:
+    """
+    Export once for the time and once under tracemalloc for the peak memory.
+    """
+    run = (lambda: function(room, path)) if function else (lambda: export_seating(room, path, fmt))
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, os.path.getsize(path)
+
+
+def main() -> None:
+    room = Openspace(SEATS // SEATS_PER_TABLE, SEATS_PER_TABLE)
+    room.organize([f"Person{i}" for i in range(SEATS - SEATS // 8)], seed=0)
+
+    print(f"{SEATS} seats\n")
+    print(f"{'export':<24}{'seconds':>10}{'peak MB':>10}{'file MB':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        for label, fmt, function in CASES:
+            path = os.path.join(folder, f"plan.{fmt}")
+            try:
+                elapsed, peak, size = measure(room, path, fmt, function)
+            except ImportError as error:
+                print(f"{label:<24}skipped ({error})")
+                continue
+            print(f"{label:<24}{elapsed:>10.2f}{peak / 2**20:>10.1f}{size / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+bench_ingestion.py – Streaming roster ingestion versus the pandas path
+
+Generates a CSV and an XLSX roster of 100k names, then measures, each in a
+fresh interpreter, the wall time (imports included) and peak RSS of:
+
+- pandas:    pd.read_csv / pd.read_excel into a DataFrame, then to a list
+- streaming: utils.file_utils.iter_names_from_csv / iter_names_from_excel,
+             counted without building a list
+- organize:  the streaming reader fed straight into Openspace.organize()
+
+Usage:
+------
+>>> python benchmarks/bench_ingestion.py
+>>> python benchmarks/bench_ingestion.py 200000   # another roster size
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from utils.file_utils import write_names_to_excel
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+# Each snippet gets the roster path as `path` and sets `count`
+CASES = {
+    "pandas csv": (
+        "csv",
+        "import pandas as pd\n"
+        "names = pd.read_csv(path, header=None).iloc[:, 0].dropna().astype(str).str.strip().tolist()\n"
+        "count = len(names)",
+    ),
+    "streaming csv": (
+        "csv",
+        "from utils.file_utils import iter_names_from_csv\n"
+        "count = sum(1 for _ in iter_names_from_csv(path))",
+    ),
+    "pandas xlsx": (
+        "xlsx",
+        "import pandas as pd\n"
+        "names = pd.read_excel(path, usecols='A').iloc[:, 0].dropna().astype(str).str.strip().tolist()\n"
+        "count = len(names)",
+    ),
+    "streaming xlsx": (
+        "xlsx",
+        "from utils.file_utils import iter_names_from_excel\n"
+        "count = sum(1 for _ in iter_names_from_excel(path))",
+    ),
+    "streaming csv -> organize": (
+        "csv",
+        "from model.openspace import Openspace\n"
+        "from utils.file_utils import iter_names_from_csv\n"
+        "room = Openspace(count_hint // 4 + 1, 4)\n"
+        "room.organize(iter_names_from_csv(path), strategy='packing', seed=0)\n"
+        "count = room.total_people_in_room()",
+    ),
+}
+
+# Peak RSS comes from VmHWM (reset on exec, unlike ru_maxrss which a child
+# inherits from this process) where /proc is available
+RUNNER = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+path, count_hint = {path!r}, {rows}
+{code}
+elapsed = time.perf_counter() - start
+try:
+    with open("/proc/self/status") as status:
+        peak = next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+except OSError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"count": count, "seconds": elapsed, "peak_rss_mb": peak / 1024}}))
+"""
+
+
+def run(code: str, path: str) -> dict:
+    """
+    Run one snippet in a fresh interpreter and return its measurements.
+    """
+    script = RUNNER.format(root=ROOT, path=path, rows=ROWS, code=code)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        paths = {"csv": os.path.join(folder, "roster.csv"), "xlsx": os.path.join(folder, "roster.xlsx")}
+        names = [f"Person{i}" for i in range(ROWS)]
+        with open(paths["csv"], "w", encoding="utf-8") as file:
+            file.writelines(f"{name}\n" for name in names)
+        write_names_to_excel(names, paths["xlsx"])
+
+        print(f"{ROWS} rows; wall time includes imports\n")
+        print(f"{'path':<28}{'rows':>10}{'seconds':>10}{'peak RSS MB':>14}")
+        for label, (kind, code) in CASES.items():
+            result = run(code, paths[kind])
+            print(f"{label:<28}{result['count']:>10}{result['seconds']:>10.2f}{result['peak_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+bench_lonely.py – Regression benchmark for lonely-table elimination
+
+Generates random layouts (mixed table sizes, random fill), runs
+Openspace.eliminate_lonely_tables() and compares the outcome and timing
+with the previous first-fit pass, re-implemented here as the reference.
+The run fails if any layout ends up with more lonely people than the
+reference.
+
+Usage:
+------
+>>> python benchmarks/bench_lonely.py
+"""
+
+import os
+import random
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+
+Layout = List[List[Optional[str]]]
+
+
+def random_layout(rng: random.Random, tables: int) -> Layout:
+    """
+    Build a layout of `tables` tables of 1 to 6 seats with random occupants.
+    """
+    layout = []
+    counter = 0
+    for _ in range(tables):
+        seats: List[Optional[str]] = []
+        fill = rng.random()
+        for _ in range(rng.randint(1, 6)):
+            if rng.random() < fill * 0.6:
+                seats.append(f"P{counter}")
+                counter += 1
+            else:
+                seats.append(None)
+        layout.append(seats)
+    return layout
+
+
+def build_room(layout: Layout) -> Openspace:
+    """
+    Create an Openspace matching a layout.
+    """
+    room = Openspace(0, 0)
+    for seats in layout:
+        room.add_table(len(seats))
+    for table, seats in zip(room.tables, layout):
+        for seat, name in zip(table.seats, seats):
+            if name is not None:
+                seat.set_occupant(name)
+    return room
+
+
+def reference_first_fit(layout: Layout) -> Layout:
+    """
+    The first-fit pass eliminate_lonely_tables() used before the batch planner.
+    """
+    layout = [list(seats) for seats in layout]
+    lonely = []
+    receiving = []
+    for seats in layout:
+        occupied = [index for index, name in enumerate(seats) if name is not None]
+        if len(occupied) == 1:
+            lonely.append((seats, occupied[0]))
+        elif len(occupied) < len(seats):
+            receiving.append(seats)
+    for seats, index in lonely:
+        for target in receiving:
+            if None in target:
+                target[target.index(None)] = seats[index]
+                seats[index] = None
+                break
+    return layout
+
+
+def lonely_count(layout: Layout) -> int:
+    return sum(1 for seats in layout if sum(name is not None for name in seats) == 1)
+
+
+def main() -> None:
+    rng = random.Random(2024)
+    print(f"{'tables':>8} {'layouts':>8} {'lonely before':>14} {'first-fit':>10} {'batch':>8} {'first-fit s':>12} {'batch s':>8}")
+    for tables, layouts in ((10, 2000), (1_000, 50), (100_000, 3)):
+        before = after_ref = after_new = 0
+        ref_time = new_time = 0.0
+        for _ in range(layouts):
+            layout = random_layout(rng, tables)
+            before += lonely_count(layout)
+
+            start = time.perf_counter()
+            reference = reference_first_fit(layout)
+            ref_time += time.perf_counter() - start
+
+            room = build_room(layout)
+            start = time.perf_counter()
+            room.eliminate_lonely_tables()
+            new_time += time.perf_counter() - start
+
+            ref_lonely = lonely_count(reference)
+            new_lonely = len(room.seat_store.lonely_tables())
+            if new_lonely > ref_lonely:
+                raise SystemExit(f"Regression: {new_lonely} lonely people vs {ref_lonely} with first-fit")
+            after_ref += ref_lonely
+            after_new += new_lonely
+        print(f"{tables:>8} {layouts:>8} {before:>14} {after_ref:>10} {after_new:>8} {ref_time:>12.3f} {new_time:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
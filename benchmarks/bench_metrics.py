@@ -0,0 +1,79 @@
+"""
+bench_metrics.py – Cost of the instrumentation, disabled and enabled
+
+Times the instrumented hot paths with utils.metrics off (the default) and
+on: Openspace.organize() of 100k names, eliminate_lonely_tables() on a
+room of 100k seats where one table in five has someone alone, and the
+bare metrics calls. Each figure is the best of --repeat runs.
+
+Usage:
+------
+>>> python benchmarks/bench_metrics.py
+>>> python benchmarks/bench_metrics.py --people 1000000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+from utils import metrics
+
+SEATS_PER_TABLE = 4
+
+
+def lonely_room(people: int) -> Openspace:
+    room = Openspace.with_capacities([SEATS_PER_TABLE] * (people // SEATS_PER_TABLE))
+    store = room.seat_store
+    counter = 0
+    for position in range(store.table_count):
+        for seat in range(1 if position % 5 == 0 else 2):
+            store.take(position, seat, f"Person{counter}")
+            counter += 1
+    return Openspace.from_store(store)
+
+
+def best_of(repeat: int, setup, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        value = setup()
+        start = time.perf_counter()
+        run(value)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Instrumentation overhead benchmark")
+    parser.add_argument("--people", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+    names = [f"Person{i}" for i in range(options.people)]
+    tables = [SEATS_PER_TABLE] * (options.people // SEATS_PER_TABLE)
+
+    print(f"{'':<32}{'disabled':>12}{'enabled':>12}")
+    rows = {}
+    for enabled in (False, True):
+        metrics.enable() if enabled else metrics.disable()
+        rows.setdefault("organize (s)", []).append(best_of(
+            options.repeat, lambda: Openspace.with_capacities(tables),
+            lambda room: room.organize(names, strategy="first_fit", seed=0)))
+        rows.setdefault("eliminate_lonely_tables (s)", []).append(best_of(
+            options.repeat, lambda: lonely_room(options.people), lambda room: room.eliminate_lonely_tables()))
+        calls = 1_000_000
+        rows.setdefault("metrics.inc() (ns per call)", []).append(
+            timeit.timeit(lambda: metrics.inc("bench_total"), number=calls) / calls * 1e9)
+        rows.setdefault("metrics.timer() block (ns)", []).append(
+            timeit.timeit("with timer('bench_seconds'): pass", globals={"timer": metrics.timer},
+                          number=calls) / calls * 1e9)
+    metrics.disable()
+    for label, (disabled, enabled) in rows.items():
+        print(f"{label:<32}{disabled:>12.4g}{enabled:>12.4g}")
+
+
+if __name__ == "__main__":
+    main()
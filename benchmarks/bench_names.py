@@ -0,0 +1,126 @@
+"""
+bench_names.py – Name normalization and validation of a large roster
+
+Builds a roster of --rows names (1M by default, see roster_generator.py)
+with 1% repeated names, then turns some into names real rosters hold:
+compound and apostrophe names ("EmmaRossi-Vos", "O'EmmaRossi"), stray
+spaces, and accents in decomposed Unicode form. It times:
+
+- isalpha (before): the former upload check, str.isalpha() per name, which
+                    rejects the compound names and ignores repeats
+- per name:         the same normalization and checks as validate_names(),
+                    done name by name in Python (reference)
+- batched:          utils.file_utils.validate_names(), whole-column passes
+
+and checks that the per-name and batched results agree. A second roster
+with 0.1% names holding digits times the report of every error at once.
+
+Usage:
+------
+>>> python benchmarks/bench_names.py
+>>> python benchmarks/bench_names.py --rows 100000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+import unicodedata
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from roster_generator import generate_names
+from utils.file_utils import NameRules, NameValidationError, validate_names
+
+
+def realistic_names(rows: int, invalid: float = 0.0) -> List[str]:
+    """
+    Generated names with compound names, stray spaces, decomposed accents
+    and, with `invalid`, a share of names holding digits.
+    """
+    names = generate_names(rows, duplicates=0.01)
+    for index in range(0, rows, 7):
+        kind = index % 4
+        if kind == 0:
+            names[index] += "-Vos"
+        elif kind == 1:
+            names[index] = "O'" + names[index]
+        elif kind == 2:
+            names[index] = f"  {names[index]}   Jr "
+        else:
+            names[index] = unicodedata.normalize("NFD", names[index] + "é")
+    if invalid:
+        for index in range(0, rows, int(1 / invalid)):
+            names[index] += "2"
+    return names
+
+
+def per_name(names: List[str], rules: NameRules) -> Tuple[List[str], List[Tuple[int, str]]]:
+    """
+    validate_names() written as a plain loop over the names.
+    """
+    cleaned, errors = [], []
+    for position, name in enumerate(names, start=1):
+        name = " ".join(unicodedata.normalize(rules.normalization, name).split())
+        if not rules.matches(name) or len(name) > rules.max_length:
+            errors.append((position, name))
+        cleaned.append(name)
+    if errors:
+        raise NameValidationError([(position, name, "invalid") for position, name in errors])
+    counts: Dict[str, int] = {}
+    for name in cleaned:
+        counts[name.casefold()] = counts.get(name.casefold(), 0) + 1
+    taken, seen, renamed = set(counts), set(), []
+    for position, name in enumerate(cleaned, start=1):
+        key = name.casefold()
+        if counts[key] > 1:
+            if key in seen:
+                suffix = 2
+                while f"{key} ({suffix})" in taken:
+                    suffix += 1
+                taken.add(f"{key} ({suffix})")
+                cleaned[position - 1] = f"{name} ({suffix})"
+                renamed.append((position, cleaned[position - 1]))
+            seen.add(key)
+    return cleaned, renamed
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> Tuple[float, object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = function()
+        except NameValidationError as error:
+            result = error
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Roster name validation benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+    rules = NameRules()
+
+    names = realistic_names(options.rows)
+    print(f"{options.rows} names, valid roster")
+    seconds, rejected = best_of(options.repeat, lambda: [name for name in names if not name.strip().isalpha()])
+    print(f"  {'isalpha (before)':<18}{seconds:>8.3f} s   {len(rejected)} names rejected")
+    reference_seconds, reference = best_of(options.repeat, lambda: per_name(names, rules))
+    print(f"  {'per name':<18}{reference_seconds:>8.3f} s   {len(reference[1])} repeats renamed")
+    seconds, result = best_of(options.repeat, lambda: validate_names(names, rules))
+    print(f"  {'batched':<18}{seconds:>8.3f} s   {len(result[1])} repeats renamed")
+    assert result == reference, "batched and per-name results differ"
+
+    names = realistic_names(options.rows, invalid=0.001)
+    seconds, error = best_of(options.repeat, lambda: validate_names(names, rules))
+    print(f"{options.rows} names, 0.1% invalid\n  {'batched':<18}{seconds:>8.3f} s   "
+          f"{len(error.errors)} errors reported at once")
+
+
+if __name__ == "__main__":
+    main()
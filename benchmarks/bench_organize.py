@@ -0,0 +1,111 @@
+"""
+bench_organize.py – Timing benchmark for Openspace.organize()
+
+Seats synthetic rosters of 1k, 10k and 100k names in a room sized to fit
+everyone (4 seats per table) and compares the wall time of organize() with
+the previous implementation, re-implemented here as the reference: each
+person scanned every table and every seat for a free spot next to someone.
+The time of rendering the report and the layout as main.py does (one line
+per person or seat, written at once) is printed as well.
+
+The reference grows with people x seats (about 30 s at 10k names, so close
+to an hour at 100k): it only runs up to --reference-max names, 10k by
+default, and larger sizes print "-" in its columns.
+
+Usage:
+------
+>>> python benchmarks/bench_organize.py                             # all sizes
+>>> python benchmarks/bench_organize.py 1000 10000                  # selected sizes
+>>> python benchmarks/bench_organize.py --reference-max 100000      # reference at 100k too
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+
+SEATS_PER_TABLE = 4
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def reference_organize(names: List[str], tables: int, capacity: int) -> List[List[Optional[str]]]:
+    """
+    The previous organize(): every person is offered the first free seat
+    at a table with someone, found by scanning all tables; those who would
+    open a table wait and are then seated together at the empty tables.
+    Tables are lists of seats, None for a free seat.
+    """
+    names = list(names)
+    random.shuffle(names)
+    layout: List[List[Optional[str]]] = [[None] * capacity for _ in range(tables)]
+    to_group: List[str] = []
+    for name in names:
+        preferred, fallback = [], []
+        for table in layout:
+            if any(seat is None for seat in table):
+                if sum(1 for seat in table if seat is not None) >= 1:
+                    preferred.append(table)
+                else:
+                    fallback.append(table)
+        if preferred:
+            table = preferred[0]
+            table[table.index(None)] = name
+        elif fallback:
+            to_group.append(name)
+
+    empty = [table for table in layout if all(seat is None for seat in table)]
+    waiting = iter(to_group)
+    for table in empty:
+        for index in range(len(table)):
+            table[index] = next(waiting, None)
+    return layout
+
+
+def time_organize(count: int) -> Tuple[float, float]:
+    """
+    Organize `count` synthetic names and return the elapsed times in
+    seconds of organize() and of rendering its report and the layout.
+    """
+    names = [f"Person{i}" for i in range(count)]
+    room = Openspace(-(-count // SEATS_PER_TABLE), SEATS_PER_TABLE)
+
+    start = time.perf_counter()
+    report = room.organize(names)
+    organized = time.perf_counter()
+    report.render() + room.format_layout()
+    return organized - start, time.perf_counter() - organized
+
+
+def time_reference(count: int) -> float:
+    names = [f"Person{i}" for i in range(count)]
+    start = time.perf_counter()
+    reference_organize(names, -(-count // SEATS_PER_TABLE), SEATS_PER_TABLE)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="organize() benchmark against the previous implementation")
+    parser.add_argument("sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="roster sizes")
+    parser.add_argument("--reference-max", type=int, default=10_000,
+                        help="largest roster the reference runs on")
+    options = parser.parse_args()
+
+    print(f"{'names':>10}  {'before (s)':>10}  {'organize (s)':>12}  {'speedup':>8}  {'render (s)':>10}")
+    for count in options.sizes:
+        organize, render = time_organize(count)
+        if count <= options.reference_max:
+            before = time_reference(count)
+            before_text, speedup_text = f"{before:.3f}", f"{before / organize:.0f}x"
+        else:
+            before_text = speedup_text = "-"
+        print(f"{count:>10}  {before_text:>10}  {organize:>12.3f}  {speedup_text:>8}  {render:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
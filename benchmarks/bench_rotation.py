@@ -0,0 +1,63 @@
+"""
+bench_rotation.py – Multi-day rotation planning
+
+Plans N days for rosters of up to 5k people (4 seats per table, 10% spare
+seats) with the RotationPlanner, and with the same planner without its
+repair pass (a fresh random seating every day) as the reference. Reports
+the planning time (total and per day), the share of co-seated pairs who
+had already met, the pairs who met on more than one day, and the size of
+the pair history.
+
+Usage:
+------
+>>> python benchmarks/bench_rotation.py
+>>> python benchmarks/bench_rotation.py 1000 60   # people, days
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.rotation import RotationPlanner
+
+SEATS_PER_TABLE = 4
+CASES = [(int(sys.argv[1]), int(sys.argv[2]))] if len(sys.argv) > 2 else [(100, 20), (500, 60), (5_000, 250)]
+
+
+def run(people: int, days: int, attempts: int) -> dict:
+    """
+    Plan `days` days and collect the statistics.
+    """
+    tables = (people * 11 // 10) // SEATS_PER_TABLE + 1
+    planner = RotationPlanner([f"Person{i}" for i in range(people)], [SEATS_PER_TABLE] * tables, seed=0, attempts=attempts)
+    start = time.perf_counter()
+    planner.plan(days)
+    elapsed = time.perf_counter() - start
+
+    # Day N + 1 on top of the existing history
+    start = time.perf_counter()
+    planner.next_day()
+    one_more = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "one_more": one_more,
+        "repeat_rate": planner.repeat_rate(),
+        "repeated_pairs": planner.history.repeated_pairs(),
+        "history_mb": planner.history.nbytes() / 2**20,
+    }
+
+
+def main() -> None:
+    print(f"{'people':>7}{'days':>6}  {'planner':<9}{'seconds':>9}{'day N+1 ms':>12}{'repeat %':>10}"
+          f"{'pairs met 2+':>14}{'history MB':>12}")
+    for people, days in CASES:
+        for label, attempts in (("random", 0), ("rotation", 24)):
+            result = run(people, days, attempts)
+            print(f"{people:>7}{days:>6}  {label:<9}{result['seconds']:>9.2f}{result['one_more'] * 1000:>12.1f}"
+                  f"{result['repeat_rate'] * 100:>10.2f}{result['repeated_pairs']:>14}{result['history_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+bench_snapshot.py – Reloading a saved layout: binary snapshot vs CSV export
+
+A room of 25k tables of 4 seats (100k seats) is seated at 90%. It reports,
+best of --repeat runs:
+
+- csv:       write the CSV export, then rebuild the room by re-parsing it
+             (the only way to read back Openspace.store() dumps)
+- snapshot:  SnapshotStore.save(), then SnapshotStore.load() (mmap + array copies)
+- + log:     load() again after --mutations seat changes were appended to the log
+
+Usage:
+------
+>>> python benchmarks/bench_snapshot.py
+>>> python benchmarks/bench_snapshot.py --seats 1000000 --mutations 100000
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+from model.seat_store import SeatStore
+from utils.exporters import FREE_LABEL, export_seating
+from utils.snapshot_store import SnapshotStore
+
+SEATS_PER_TABLE = 4
+
+
+def load_csv(path: str) -> Openspace:
+    """
+    Rebuild a room from a CSV export (table, seat, occupant rows, free seats included).
+    """
+    store = SeatStore()
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = csv.reader(file)
+        next(rows)
+        for table, seat, name in rows:
+            position, seat = int(table) - 1, int(seat) - 1
+            while store.table_count <= position:
+                store.add_table(0)
+            store.capacities[position] += 1
+            store.occupants.append(-1)
+            store.total_capacity += 1
+            if name != FREE_LABEL:
+                store.take(position, seat, name)
+    return Openspace.from_store(store)
+
+
+def best_of(repeat: int, function) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def reload(store: SnapshotStore) -> Openspace:
+    """
+    Load the room of a store and release its log.
+    """
+    room = store.load()
+    store.close()
+    return room
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot reload benchmark")
+    parser.add_argument("--seats", type=int, default=100_000, help="seats in the room")
+    parser.add_argument("--mutations", type=int, default=10_000, help="seat changes in the log")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measure")
+    options = parser.parse_args()
+
+    room = Openspace.with_capacities([SEATS_PER_TABLE] * (options.seats // SEATS_PER_TABLE))
+    room.organize([f"Person{i}" for i in range(options.seats * 9 // 10)], strategy="first_fit", seed=0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "seating.csv")
+        write_csv = best_of(options.repeat, lambda: export_seating(room, csv_path, "csv"))
+        read_csv = best_of(options.repeat, lambda: load_csv(csv_path))
+        reloaded = load_csv(csv_path)
+        assert reloaded.seat_store.total_occupied == room.seat_store.total_occupied
+
+        # A store locks the log while it owns it: each reload is closed right away
+        persistence = SnapshotStore(directory, compact_after=options.mutations + 1)
+        write_snapshot = best_of(options.repeat, lambda: persistence.save(room))
+        persistence.close()
+        read_snapshot = best_of(options.repeat, lambda: reload(SnapshotStore(directory)))
+        persistence.save(room)
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for step in range(options.mutations // 2):
+            person = f"Person{rng.randrange(options.seats * 9 // 10)}"
+            location = room.seat_store.locate(person)
+            if location is not None:
+                room.tables[location[0]]._release(location[1])
+                room.tables[location[0]].assign_seat(f"Newcomer{step}")
+        log_seconds = time.perf_counter() - start
+        persistence.close()
+        records = persistence.records
+        read_log = best_of(options.repeat, lambda: reload(SnapshotStore(directory, compact_after=records + 1)))
+        assert reload(SnapshotStore(directory)).seat_store.total_occupied == room.seat_store.total_occupied
+
+        print(f"{options.seats} seats, {room.seat_store.total_occupied} people\n")
+        print(f"{'format':<22}{'size KB':>10}{'write s':>10}{'reload s':>10}")
+        print(f"{'csv':<22}{os.path.getsize(csv_path) // 1024:>10}{write_csv:>10.3f}{read_csv:>10.3f}")
+        print(f"{'snapshot':<22}{os.path.getsize(persistence.snapshot_path) // 1024:>10}"
+              f"{write_snapshot:>10.3f}{read_snapshot:>10.3f}")
+        print(f"{f'snapshot + {records} log':<22}{os.path.getsize(persistence.log_path) // 1024:>10}"
+              f"{log_seconds:>10.3f}{read_log:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+bench_startup.py – Startup time of main.py from `python -X importtime`
+
+Runs the CLI end to end (answering "9" to exit the menu) in a fresh
+interpreter with -X importtime, once with --fast-start and once with the
+default Excel round-trip, and reports:
+
+- the total import time and wall time of each run
+- the slowest top-level imports
+- whether heavy libraries (pandas, openpyxl, xlsxwriter, numpy) were loaded
+
+The script exits with status 1 when the fast start loads one of the heavy
+libraries or when its import time exceeds --budget-ms, so it can guard
+against regressions.
+
+Usage:
+------
+>>> python benchmarks/bench_startup.py
+>>> python benchmarks/bench_startup.py --budget-ms 150 --top 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY = ("pandas", "openpyxl", "xlsxwriter", "numpy")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` lines into (module, self us, cumulative us, depth),
+    depth 0 being a module imported directly rather than by another one.
+
+    :return: One entry per imported module, in import order
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|")
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        entries.append((module.strip(), int(own), int(cumulative), depth))
+    return entries
+
+
+def run(arguments: List[str]) -> Dict:
+    """
+    Run main.py once and collect its import statistics.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *arguments],
+        cwd=ROOT,
+        input="9\n",
+        capture_output=True,
+        text=True,
+        env={**os.environ, "TERM": "dumb"},
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"main.py {' '.join(arguments)} failed:\n{result.stderr[-2000:]}")
+    entries = parse_importtime(result.stderr)
+    top_level = [entry for entry in entries if entry[3] == 0]
+    return {
+        "wall": wall,
+        "total_us": sum(entry[2] for entry in top_level),
+        "slowest": sorted(top_level, key=lambda entry: entry[2], reverse=True),
+        "heavy": sorted({entry[0].split(".")[0] for entry in entries} & set(HEAVY)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if the fast start imports take longer")
+    parser.add_argument("--top", type=int, default=8, help="number of slowest imports to list")
+    options = parser.parse_args()
+
+    results = {"--fast-start": run(["--fast-start"]), "default": run([])}
+    for label, result in results.items():
+        print(f"\n{label}: imports {result['total_us'] / 1000:.1f} ms, wall {result['wall'] * 1000:.0f} ms")
+        print(f"  heavy libraries loaded: {', '.join(result['heavy']) or 'none'}")
+        for module, _, cumulative, _ in result["slowest"][:options.top]:
+            print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+    fast = results["--fast-start"]
+    failures = []
+    if fast["heavy"]:
+        failures.append(f"fast start imported {', '.join(fast['heavy'])}")
+    if options.budget_ms is not None and fast["total_us"] / 1000 > options.budget_ms:
+        failures.append(f"fast start imports took {fast['total_us'] / 1000:.1f} ms > {options.budget_ms} ms")
+    if failures:
+        print("\nREGRESSION: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
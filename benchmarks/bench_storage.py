@@ -0,0 +1,82 @@
+"""
+bench_storage.py – Memory and time footprint of the seat storage
+
+Builds rooms of 10k, 100k and 400k seats (4 seats per table), seats 7/8 of
+the capacity, and reports traced memory (the roster itself excluded) along
+with the time of the common read paths.
+
+Usage:
+------
+>>> python benchmarks/bench_storage.py
+>>> python benchmarks/bench_storage.py /tmp/old   # measure another checkout
+
+Running it against a checkout of an older revision gives the numbers of
+the previous object model for comparison.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.abspath(ROOT))
+
+from model.openspace import Openspace
+
+SEATS_PER_TABLE = 4
+SIZES = [10_000, 100_000, 400_000]
+
+
+def measure(seats: int) -> dict:
+    """
+    Build and fill a room of `seats` seats and collect its measurements.
+    """
+    names = [f"Person{i}" for i in range(seats - seats // 8)]
+
+    # Memory first, then timings on a second room: tracing skews timings
+    tracemalloc.start()
+    room = Openspace(seats // SEATS_PER_TABLE, SEATS_PER_TABLE)
+    room.organize(list(names))
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del room
+
+    start = time.perf_counter()
+    room = Openspace(seats // SEATS_PER_TABLE, SEATS_PER_TABLE)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    room.organize(names)
+    organize = time.perf_counter() - start
+
+    start = time.perf_counter()
+    room.seats_left()
+    seats_left = time.perf_counter() - start
+
+    start = time.perf_counter()
+    room.is_there_lonely_person()
+    lonely = time.perf_counter() - start
+
+    return {
+        "seats": seats,
+        "memory_mb": memory / 1e6,
+        "build_s": build,
+        "organize_s": organize,
+        "seats_left_ms": seats_left * 1e3,
+        "lonely_ms": lonely * 1e3,
+    }
+
+
+def main() -> None:
+    print(f"{'seats':>8} {'memory MB':>10} {'build s':>8} {'organize s':>11} {'seats_left ms':>14} {'lonely ms':>10}")
+    for seats in SIZES:
+        row = measure(seats)
+        print(
+            f"{row['seats']:>8} {row['memory_mb']:>10.1f} {row['build_s']:>8.3f} "
+            f"{row['organize_s']:>11.3f} {row['seats_left_ms']:>14.2f} {row['lonely_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
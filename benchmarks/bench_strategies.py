@@ -0,0 +1,57 @@
+"""
+bench_strategies.py – Per-strategy timings for Openspace.organize()
+
+For each seating strategy in model.strategies, organizes rosters of several
+sizes in a room with a little spare capacity (4 seats per table) and
+reports the wall time and the number of people left sitting alone.
+The 'balanced' strategy is only run on the sizes it accepts.
+
+Usage:
+------
+>>> python benchmarks/bench_strategies.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+from model.strategies import STRATEGIES
+
+SEATS_PER_TABLE = 4
+SIZES = [101, 1_001, 10_001, 100_001]
+
+
+def run(strategy: str, count: int):
+    """
+    Organize `count` names with `strategy`.
+
+    :return: (elapsed seconds, lonely people), or None if the strategy refused the room
+    """
+    names = [f"Person{i}" for i in range(count)]
+    room = Openspace(count // SEATS_PER_TABLE + 2, SEATS_PER_TABLE)
+    start = time.perf_counter()
+    try:
+        room.organize(names, strategy=strategy)
+    except ValueError:
+        return None
+    elapsed = time.perf_counter() - start
+    return elapsed, len(room.sat_alone)
+
+
+def main() -> None:
+    print(f"{'strategy':>10} {'names':>8} {'organize s':>11} {'lonely':>7}")
+    for strategy in STRATEGIES:
+        for count in SIZES:
+            result = run(strategy, count)
+            if result is None:
+                print(f"{strategy:>10} {count:>8} {'too large':>11} {'-':>7}")
+                continue
+            elapsed, lonely = result
+            print(f"{strategy:>10} {count:>8} {elapsed:>11.3f} {lonely:>7}")
+
+
+if __name__ == "__main__":
+    main()
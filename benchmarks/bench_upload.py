@@ -0,0 +1,95 @@
+"""
+bench_upload.py – Upload response time with the background job queue
+
+A roster of --people names (in tables of 4) is written to an Excel file
+and uploaded to the Flask app through its test client, asking for JSON.
+It reports:
+
+- upload:  time until POST /upload answers with the job id
+- job:     time until the job has parsed, validated and organized the roster
+- api/room while the job runs: median and worst GET /api/room time,
+           served from the previous room meanwhile
+
+Usage:
+------
+>>> python benchmarks/bench_upload.py
+>>> python benchmarks/bench_upload.py --people 20000 50000
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from user_interface import webapp
+from utils.file_utils import write_roster_to_excel
+from utils.room_state import LocalRoomState
+
+SEATS_PER_TABLE = 4
+
+
+def alphabetic_name(number: int) -> str:
+    """
+    Person name made of letters only, since uploads reject other characters.
+    """
+    letters = ""
+    while True:
+        number, digit = divmod(number, 26)
+        letters += chr(ord("a") + digit)
+        if not number:
+            return "Person" + letters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Background upload benchmark")
+    parser.add_argument("--people", type=int, nargs="+", default=[10_000, 50_000], help="roster sizes")
+    options = parser.parse_args()
+
+    config = webapp.load_config()
+    client = webapp.app.test_client()
+    print(f"{'people':>8}{'upload':>10}{'job':>10}{'api/room':>10}{'worst':>8}   (ms, api/room while the job runs)")
+    for people in options.people:
+        config.update(tables=people // SEATS_PER_TABLE, seats_per_table=SEATS_PER_TABLE, strategy="first_fit")
+        webapp.load_config = lambda *args, config=config: config
+        webapp.room_state = LocalRoomState()
+        webapp.roster_cache.clear()
+        webapp.layout_cache.clear()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"roster{people}.xlsx")
+            write_roster_to_excel(((alphabetic_name(i), [], []) for i in range(people)), path)
+            with open(path, "rb") as file:
+                content = file.read()
+
+        start = time.perf_counter()
+        response = client.post("/upload?format=json", data={"file": (io.BytesIO(content), "roster.xlsx")},
+                               content_type="multipart/form-data")
+        upload_time = time.perf_counter() - start
+        assert response.status_code == 202, response.status_code
+        job_id = response.get_json()["id"]
+
+        reads = []
+        while webapp.job_queue.get(job_id).finished is None:
+            read_start = time.perf_counter()
+            client.get("/api/room")
+            reads.append(time.perf_counter() - read_start)
+            time.sleep(0.01)
+        job = webapp.job_queue.get(job_id)
+        assert job.status == "done", job.error
+        job_time = job.finished - job.created
+
+        median = statistics.median(reads) * 1000 if reads else 0.0
+        worst = max(reads) * 1000 if reads else 0.0
+        print(f"{people:>8}{upload_time * 1000:>10.1f}{job_time * 1000:>10.0f}{median:>10.1f}{worst:>8.1f}")
+    webapp.job_queue.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_upload_io.py – Upload-to-layout latency and disk I/O of an upload
+
+An Excel roster of --people names is built in memory, as the web app
+receives it, and turned into a layout (parse, then organize in tables of 4)
+three ways:
+
+- disk:    the former path: the file is written to a directory under its
+           client name and read back from there
+- memory:  the current path: the bytes are parsed in place from a BytesIO
+- kept:    the current path with a copy kept (UploadStore.save, as with keep=1)
+
+Each figure is the best of --repeat runs, the runs of the three paths
+taking turns so that they see the same machine state. Bytes read and written by the
+process come from /proc/self/io (Linux only; "n/a" elsewhere), as counted
+by the read and write calls, whether or not they reach the disk.
+
+Usage:
+------
+>>> python benchmarks/bench_upload_io.py
+>>> python benchmarks/bench_upload_io.py --people 1000 100000 --repeat 5
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from model.openspace import Openspace
+from utils.file_utils import load_roster, write_roster_to_excel
+from utils.upload_store import UploadStore
+
+SEATS_PER_TABLE = 4
+
+
+def io_counters() -> Optional[Dict[str, int]]:
+    """
+    Bytes read and written so far by this process, None where unavailable.
+    """
+    try:
+        with open("/proc/self/io", encoding="ascii") as file:
+            fields = dict(line.split(": ") for line in file.read().splitlines())
+    except OSError:
+        return None
+    return {"read": int(fields["rchar"]), "written": int(fields["wchar"])}
+
+
+def layout(roster: Tuple) -> Openspace:
+    names = roster[0]
+    room = Openspace(-(-len(names) // SEATS_PER_TABLE), SEATS_PER_TABLE)
+    room.organize(names, strategy="first_fit", seed=0)
+    return room
+
+
+def run(upload: Callable[[], Tuple]) -> Tuple[float, Optional[Dict[str, int]]]:
+    """
+    Time upload() followed by organize() and count the bytes it read and wrote.
+    """
+    before = io_counters()
+    start = time.perf_counter()
+    layout(upload())
+    seconds = time.perf_counter() - start
+    after = io_counters()
+    return seconds, None if before is None else {key: after[key] - before[key] for key in after}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upload path benchmark: disk round-trip against in-memory parsing")
+    parser.add_argument("--people", type=int, nargs="+", default=[1_000, 10_000, 50_000], help="roster sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    print(f"{'people':>8} {'path':<8}{'latency (ms)':>14}{'read (KB)':>12}{'written (KB)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        store = UploadStore(os.path.join(directory, "store"))
+        for people in options.people:
+            buffer = io.BytesIO()
+            write_roster_to_excel(((f"Person{i}", [], []) for i in range(people)), buffer)
+            content = buffer.getvalue()
+            content_hash = hashlib.sha256(content).hexdigest()
+
+            def disk() -> Tuple:
+                path = os.path.join(directory, "roster.xlsx")
+                with open(path, "wb") as file:
+                    file.write(content)
+                return load_roster(path)
+
+            def kept() -> Tuple:
+                store.save(content, content_hash, ".xlsx")
+                return load_roster(io.BytesIO(content), "excel")
+
+            paths = {"disk": disk, "memory": lambda: load_roster(io.BytesIO(content), "excel"), "kept": kept}
+            best = dict.fromkeys(paths, float("inf"))
+            first_io = {}  # a kept upload is only written the first time
+            for _ in range(options.repeat):
+                for label, upload in paths.items():
+                    seconds, moved = run(upload)
+                    best[label] = min(best[label], seconds)
+                    first_io.setdefault(label, moved)
+            for label in paths:
+                seconds, moved = best[label], first_io[label]
+                read, written = ("n/a", "n/a") if moved is None else (
+                    f"{moved['read'] / 1024:.0f}", f"{moved['written'] / 1024:.0f}")
+                print(f"{people:>8} {label:<8}{seconds * 1000:>14.1f}{read:>12}{written:>14}")
+
+
+if __name__ == "__main__":
+    main()
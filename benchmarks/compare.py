@@ -0,0 +1,72 @@
+"""
+compare.py – Compare two benchmark result files written by suite.py
+
+Matches the cases and sizes present in both files and prints, for each,
+the time before and after and their ratio. A case is flagged as a
+regression when it got slower by more than --threshold (10% by default)
+and by more than --min-diff seconds, which keeps the noise of very short
+timings out. The exit status is 1 when anything regressed, so the script
+can gate a change.
+
+Usage:
+------
+>>> python benchmarks/compare.py benchmarks/results/<old>.json benchmarks/results/<new>.json
+>>> python benchmarks/compare.py before.json after.json --stat min --threshold 0.05
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+
+def load_results(path: str) -> Tuple[Dict, Dict[Tuple[str, int], Dict[str, float]]]:
+    """
+    Read a result file: (its description, {(case, size): statistics}).
+    """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return data, {(entry["name"], entry["size"]): entry["stats"] for entry in data["benchmarks"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("before", help="results of the reference commit")
+    parser.add_argument("after", help="results of the commit to check")
+    parser.add_argument("--stat", choices=("median", "min", "mean"), default="median", help="statistic compared")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown flagged as a regression")
+    parser.add_argument("--min-diff", type=float, default=0.0005, help="seconds below which a change is noise")
+    options = parser.parse_args()
+
+    before_data, before = load_results(options.before)
+    after_data, after = load_results(options.after)
+    for label, data in (("before", before_data), ("after", after_data)):
+        commit = data.get("commit", {})
+        print(f"{label}: {commit.get('id', '?')[:12]}{' (dirty)' if commit.get('dirty') else ''}, "
+              f"{data.get('datetime', '?')}, Python {data.get('machine', {}).get('python', '?')}")
+    if before_data.get("machine") != after_data.get("machine"):
+        print("warning: the results come from different machines or Python versions")
+
+    regressions = 0
+    print(f"\n{'case':<28}{'size':>10}{'before (s)':>12}{'after (s)':>12}{'ratio':>8}")
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key][options.stat], after[key][options.stat]
+        ratio = new / old if old else float("inf")
+        verdict = ""
+        if new - old > options.min_diff and ratio > 1 + options.threshold:
+            verdict = "  REGRESSION"
+            regressions += 1
+        elif old - new > options.min_diff and ratio < 1 / (1 + options.threshold):
+            verdict = "  faster"
+        print(f"{key[0]:<28}{key[1]:>10}{old:>12.4f}{new:>12.4f}{ratio:>8.2f}{verdict}")
+    for label, missing in (("before", after.keys() - before.keys()), ("after", before.keys() - after.keys())):
+        if missing:
+            print(f"not in {label}: " + ", ".join(f"{name}@{size}" for name, size in sorted(missing)))
+
+    print(f"\n{regressions} regression(s) over {len(before.keys() & after.keys())} comparisons "
+          f"({options.stat}, threshold {options.threshold:.0%})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
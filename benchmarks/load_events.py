@@ -0,0 +1,251 @@
+"""
+load_events.py – Load test of the /events live feed with many open streams
+
+Serves the Flask app on a local port (threaded werkzeug server, one thread
+per stream) and opens --clients SSE connections to /events, read from a
+single thread with a selector. --slow of them never read until the end,
+with a tiny receive buffer, like stalled browser tabs. Once every stream is
+open, a writer sends --changes API mutations (arrivals, departures, now and
+then a table added or removed) at --rate per second.
+
+It reports the events rendered by the hub against the changes made, the
+events and bytes delivered, the delay between a change and its delivery
+(median and 99th percentile over every fast client), and what the slow
+clients got once they read again (a backlog or a reset). One of the fast
+clients applies every event to a copy of the room read before the
+changes, which must end up equal to the room on the server.
+
+Usage:
+------
+>>> python benchmarks/load_events.py
+>>> python benchmarks/load_events.py --clients 500 --slow 50 --changes 2000 --rate 500
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import selectors
+import socket
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from werkzeug.serving import make_server
+
+from model.openspace import Openspace
+from user_interface import webapp
+from utils.events import EventHub
+from utils.room_state import LocalRoomState
+
+SEATS_PER_TABLE = 4
+
+
+class StreamClient:
+    """
+    One open /events connection and the events read from it so far.
+    """
+
+    def __init__(self, port: int, slow: bool) -> None:
+        self.socket = socket.create_connection(("127.0.0.1", port))
+        if slow:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        self.socket.sendall(b"GET /events HTTP/1.0\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+        self.socket.setblocking(False)
+        self.slow = slow
+        self.buffer = b""
+        self.headers_read = False
+        self.events = []  # (event, data, time received)
+        self.bytes = 0
+
+    def read(self) -> None:
+        try:
+            data = self.socket.recv(1 << 16)
+        except BlockingIOError:
+            return
+        now = time.perf_counter()
+        self.bytes += len(data)
+        self.buffer += data
+        if not self.headers_read:
+            if b"\r\n\r\n" not in self.buffer:
+                return
+            self.buffer = self.buffer.split(b"\r\n\r\n", 1)[1]
+            self.headers_read = True
+        *frames, self.buffer = self.buffer.split(b"\n\n")
+        for frame in frames:
+            fields = dict(line.split(": ", 1) for line in frame.decode().split("\n") if ": " in line)
+            if "event" in fields:
+                self.events.append((fields["event"], json.loads(fields["data"]), now))
+
+
+def snapshot(client) -> tuple:
+    """
+    Read the whole room through the JSON API: (tables, unassigned, version).
+    """
+    tables, offset = [], 0
+    while True:
+        page = client.get(f"/api/tables?offset={offset}&limit=1000").get_json()
+        tables += [table["seats"] for table in page["tables"]]
+        offset += 1000
+        if offset >= page["total"]:
+            break
+    unassigned, offset = set(), 0
+    while True:
+        page = client.get(f"/api/unseated?offset={offset}&limit=1000").get_json()
+        unassigned.update(page["names"])
+        offset += 1000
+        if offset >= page["total"]:
+            return tables, unassigned, page["version"]
+
+
+def apply(room: tuple, change: dict) -> None:
+    """
+    Apply a change event to a room copy made by snapshot().
+    """
+    tables, unassigned, _ = room
+    for number in change["removed_tables"]:
+        del tables[number - 1]
+    for table in change["tables"]:
+        if table["table"] > len(tables):
+            tables.append(None)
+        tables[table["table"] - 1] = table["seats"]
+    if change["unassigned"]["cleared"]:
+        unassigned.clear()
+    unassigned.difference_update(change["unassigned"]["removed"])
+    unassigned.update(change["unassigned"]["added"])
+    assert len(tables) == change["table_count"], (len(tables), change["table_count"])
+
+
+def make_changes(options: argparse.Namespace, people: list, done_at: dict) -> None:
+    """
+    Writer thread: send API mutations at the requested rate, noting when
+    each version was reached.
+    """
+    rng = random.Random(0)
+    client = webapp.app.test_client()
+    start = time.perf_counter()
+    for step in range(options.changes):
+        action = rng.random()
+        if action < 0.5 or not people:
+            name = f"Arrival{step}"
+            response = client.post("/api/people", json={"name": name})
+            people.append(name)
+        elif action < 0.97:
+            name = people.pop(rng.randrange(len(people)))
+            response = client.delete(f"/api/people/{name}")
+        elif action < 0.99:
+            response = client.post("/api/tables", json={"capacity": SEATS_PER_TABLE})
+        else:
+            # The last table, which is empty when it was just added
+            last = client.get("/api/room").get_json()["tables"]
+            response = client.delete(f"/api/tables/{last}")
+        if response.status_code == 200:
+            done_at[response.get_json()["version"]] = time.perf_counter()
+        delay = start + (step + 1) / options.rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE live feed load test")
+    parser.add_argument("--clients", type=int, default=500, help="open /events streams")
+    parser.add_argument("--slow", type=int, default=50, help="streams that stop reading until the end")
+    parser.add_argument("--changes", type=int, default=1000, help="mutations sent")
+    parser.add_argument("--rate", type=float, default=200, help="mutations per second")
+    parser.add_argument("--tables", type=int, default=1000, help="tables in the room")
+    parser.add_argument("--coalesce", type=float, default=0.05, help="seconds merged into one event")
+    parser.add_argument("--history", type=int, default=256, help="events kept for slow clients")
+    options = parser.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    room = Openspace.with_capacities([SEATS_PER_TABLE] * options.tables)
+    people = [f"Person{i}" for i in range(options.tables * SEATS_PER_TABLE * 3 // 4)]
+    room.organize(people, strategy="first_fit", seed=0)
+    webapp.room_state = LocalRoomState()
+    webapp.room_state.replace(room)
+    webapp.event_hub = hub = EventHub(webapp.room_state, webapp._changes_json,
+                                      coalesce=options.coalesce, history=options.history)
+
+    server = make_server("127.0.0.1", 0, webapp.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    clients = [StreamClient(server.server_port, slow=index < options.slow) for index in range(options.clients)]
+    fast = [client for client in clients if not client.slow]
+    selector = selectors.DefaultSelector()
+    for client in fast:
+        selector.register(client.socket, selectors.EVENT_READ, client)
+    deadline = time.monotonic() + 30
+    while hub.stats()["clients"] < options.clients and time.monotonic() < deadline:
+        time.sleep(0.05)
+    print(f"{hub.stats()['clients']} streams open ({options.slow} slow), {options.tables} tables")
+
+    api = webapp.app.test_client()
+    copy = snapshot(api)
+    done_at = {}
+    writer = threading.Thread(target=make_changes, args=(options, people, done_at))
+    start = time.perf_counter()
+    writer.start()
+    final_version = None
+    while True:
+        for key, _ in selector.select(timeout=0.1):
+            key.data.read()
+        if final_version is None and not writer.is_alive():
+            final_version = webapp.room_state.version
+            deadline = time.monotonic() + 10
+        if final_version is not None and (
+            time.monotonic() > deadline
+            or all(client.events and client.events[-1][1]["version"] >= final_version for client in fast)
+        ):
+            break
+    elapsed = time.perf_counter() - start
+
+    # The slow clients read again: they get their backlog or a reset
+    for client in clients[:options.slow]:
+        selector.register(client.socket, selectors.EVENT_READ, client)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and not all(
+        client.events and (client.events[-1][0] == "reset" or client.events[-1][1]["version"] >= final_version)
+        for client in clients[:options.slow]
+    ):
+        for key, _ in selector.select(timeout=0.1):
+            key.data.read()
+    outcomes = {"backlog": 0, "reset": 0, "nothing": 0}
+    for client in clients[:options.slow]:
+        events = [event for event, _, _ in client.events]
+        outcomes["reset" if "reset" in events else "backlog" if events else "nothing"] += 1
+
+    lags = sorted(
+        received - done_at[data["version"]]
+        for client in fast for event, data, received in client.events
+        if event == "change" and data["version"] in done_at
+    )
+    delivered = sum(len(client.events) for client in clients)
+    received_bytes = sum(client.bytes for client in clients)
+    for event, data, _ in fast[0].events:
+        if event == "reset":
+            copy = snapshot(api)
+        else:
+            apply(copy, data)
+    consistent = snapshot(api)[:2] == copy[:2]
+
+    stats = hub.stats()
+    print(f"{options.changes} changes in {elapsed:.2f} s, {stats['rendered']} events rendered "
+          f"({options.changes / max(stats['rendered'], 1):.1f} changes per event)")
+    print(f"{delivered} events delivered ({received_bytes / 1e6:.1f} MB), delay median "
+          f"{statistics.median(lags) * 1000:.0f} ms, p99 {lags[int(len(lags) * 0.99)] * 1000:.0f} ms")
+    print(f"slow clients: {outcomes['backlog']} caught up from the backlog, {outcomes['reset']} told to reset, "
+          f"{outcomes['nothing']} got nothing")
+    print("Room copy rebuilt from the events matches the server." if consistent
+          else "Room copy rebuilt from the events DIFFERS from the server.")
+    server.shutdown()
+    if not consistent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+load_room_state.py – Concurrent load test of the web app's room state backends
+
+Starts --processes worker processes (like the workers of a WSGI server),
+each running --threads threads that send requests to the Flask app through
+its test client: /add_person for new names, /remove_person_from_room for
+some of the names they added and for people of the initial roster, and
+the occasional /dashboard. With the "memory" backend, every process has a
+room of its own, so use a single process; with "sqlite", all processes
+share one database.
+
+Afterwards the final room is checked:
+
+- the occupied counters of every table and of the room match the seats
+- nobody holds two seats, and nobody is both seated and unassigned
+- the people in the room are exactly the initial roster, minus the people
+  removed, plus the people added and not removed
+
+Usage:
+------
+>>> python benchmarks/load_room_state.py --backend memory --threads 16
+>>> python benchmarks/load_room_state.py --backend sqlite --processes 4 --threads 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from model.openspace import Openspace
+from model.seat_store import FREE
+from utils.room_state import LocalRoomState, SQLiteRoomState
+
+SEATS_PER_TABLE = 4
+
+
+def run_worker(worker: int, options: argparse.Namespace, state=None):
+    """
+    Send this worker's requests from several threads.
+
+    :return: (names added, names removed, requests sent, seconds)
+    """
+    os.chdir(ROOT)
+    from user_interface import webapp
+
+    webapp.room_state = state if state is not None else SQLiteRoomState(options.database)
+    added, removed = set(), set()
+    lock = threading.Lock()
+    initial = options.people
+
+    def client_thread(thread: int) -> None:
+        rng = random.Random(worker * 1000 + thread)
+        client = webapp.app.test_client()
+        mine = []
+        for step in range(options.requests):
+            action = rng.random()
+            if action < 0.5 or not mine:
+                name = f"Worker{worker}Thread{thread}Person{step}"
+                response = client.post("/add_person", data={"name": name})
+                mine.append(name)
+                with lock:
+                    added.add(name)
+            elif action < 0.8:
+                name = mine.pop(rng.randrange(len(mine)))
+                response = client.get(f"/remove_person_from_room/{name}")
+                with lock:
+                    removed.add(name)
+            elif action < 0.95:
+                name = f"Person{rng.randrange(initial)}"
+                response = client.get(f"/remove_person_from_room/{name}")
+                with lock:
+                    removed.add(name)
+            else:
+                response = client.get("/dashboard")
+            assert response.status_code in (200, 302), response.status_code
+
+    threads = [threading.Thread(target=client_thread, args=(thread,)) for thread in range(options.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return added, removed, options.threads * options.requests, time.perf_counter() - start
+
+
+def check(room: Openspace, expected) -> list:
+    """
+    Return the invariants the room breaks (empty when consistent).
+    """
+    store = room.seat_store
+    problems = []
+    seated = []
+    for position in range(store.table_count):
+        start = store.offsets[position]
+        ids = store.occupants[start:start + store.capacities[position]]
+        taken = sum(1 for occupant_id in ids if occupant_id != FREE)
+        if taken != store.occupied[position]:
+            problems.append(f"table {position + 1}: {store.occupied[position]} counted, {taken} seated")
+        seated.extend(store.names[occupant_id] for occupant_id in ids if occupant_id != FREE)
+    if store.total_occupied != len(seated):
+        problems.append(f"room: {store.total_occupied} counted, {len(seated)} seated")
+    if len(set(seated)) != len(seated) or store.extra_seats:
+        problems.append("someone holds two seats")
+    if store.seated_people != len(set(seated)):
+        problems.append(f"{store.seated_people} people counted as seated, {len(set(seated))} seated")
+    both = set(seated).intersection(room.unassigned)
+    if both:
+        problems.append(f"seated and unassigned: {sorted(both)[:5]}")
+    present = set(seated).union(room.unassigned)
+    if present != expected:
+        problems.append(f"{len(present - expected)} unexpected and {len(expected - present)} missing people")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Room state load test")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="sqlite")
+    parser.add_argument("--processes", type=int, default=2, help="worker processes (sqlite backend)")
+    parser.add_argument("--threads", type=int, default=8, help="threads per process")
+    parser.add_argument("--requests", type=int, default=200, help="requests per thread")
+    parser.add_argument("--tables", type=int, default=200, help="tables in the room")
+    options = parser.parse_args()
+    if options.backend == "memory":
+        options.processes = 1
+
+    capacities = [SEATS_PER_TABLE] * options.tables
+    options.people = len(capacities) * SEATS_PER_TABLE // 2
+    names = [f"Person{i}" for i in range(options.people)]
+    room = Openspace.with_capacities(capacities)
+    room.organize(names, strategy="packing", seed=0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        options.database = os.path.join(directory, "room.db")
+        if options.backend == "memory":
+            state = LocalRoomState()
+            state.replace(room)
+            results = [run_worker(0, options, state)]
+        else:
+            state = SQLiteRoomState(options.database)
+            state.replace(room)
+            with multiprocessing.Pool(options.processes) as pool:
+                results = pool.starmap(run_worker, [(worker, options) for worker in range(options.processes)])
+            state = SQLiteRoomState(options.database)
+
+        added = set().union(*(result[0] for result in results))
+        removed = set().union(*(result[1] for result in results))
+        requests = sum(result[2] for result in results)
+        seconds = max(result[3] for result in results)
+        with state.read() as final:
+            problems = check(final, set(names).union(added) - removed)
+            lonely = len(final.seat_store.lonely_tables())
+            version = state.version
+
+    print(f"{options.backend}: {options.processes} process(es) x {options.threads} threads, "
+          f"{requests} requests in {seconds:.2f} s ({requests / seconds:.0f} req/s), version {version}")
+    print(f"{len(added)} added, {len(removed)} removed, {lonely} lonely table(s)")
+    if problems:
+        print("Invariants broken:\n - " + "\n - ".join(problems))
+        sys.exit(1)
+    print("All invariants hold.")
+
+
+if __name__ == "__main__":
+    main()
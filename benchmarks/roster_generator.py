@@ -0,0 +1,155 @@
+"""
+roster_generator.py – Synthetic rosters of any size for the benchmarks
+
+Builds reproducible rosters (same arguments and seed, same roster):
+
+- names made of letters only, as the web upload requires, unique until
+  `duplicates` asks for a share of repeated entries
+- seating wishes: a share of the people asks to sit with someone, another
+  share to avoid someone, as pairs between distinct people
+
+and writes them in the roster formats the app reads (.csv, .xlsx).
+
+Usage:
+------
+>>> python benchmarks/roster_generator.py 100000 data/roster.csv
+>>> python benchmarks/roster_generator.py 10000 data/roster.xlsx --together 0.1 --apart 0.05 --duplicates 0.01
+
+From Python:
+>>> from benchmarks.roster_generator import generate_names, generate_roster
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.file_utils import RosterRow, write_roster_to_excel
+
+FIRST_NAMES = (
+    "Anna", "Bruno", "Chloe", "David", "Emma", "Farid", "Giulia", "Hugo", "Ines", "Jonas",
+    "Karim", "Lea", "Marco", "Nina", "Oscar", "Paula", "Quentin", "Rosa", "Samir", "Tess",
+    "Ugo", "Vera", "Willem", "Xenia", "Yann", "Zoe",
+)
+LAST_NAMES = (
+    "Adams", "Bakker", "Costa", "Dubois", "Evans", "Fischer", "Garcia", "Hansen", "Ivanov", "Janssen",
+    "Kowalski", "Lambert", "Martin", "Novak", "Olsen", "Peeters", "Quinn", "Rossi", "Schmidt", "Tanaka",
+    "Umar", "Vos", "Weber", "Xu", "Yilmaz", "Zimmer",
+)
+
+
+def _letters(number: int) -> str:
+    """
+    Spell a number in lowercase letters (0 -> "", 1 -> "a", 27 -> "aa").
+    """
+    letters = ""
+    while number:
+        number, digit = divmod(number - 1, 26)
+        letters = chr(ord("a") + digit) + letters
+    return letters
+
+
+def generate_names(count: int, duplicates: float = 0.0, seed: int = 0) -> List[str]:
+    """
+    Generate `count` alphabetic names such as "EmmaRossi" or "EmmaRossiab".
+
+    :param count: Number of names
+    :param duplicates: Share of the entries repeating an earlier name (0 to 1)
+    :param seed: Seed of the random choices
+    :return: The names, in random order
+    """
+    rng = random.Random(seed)
+    repeated = int(count * duplicates)
+    combinations = len(FIRST_NAMES) * len(LAST_NAMES)
+    names = []
+    for index in rng.sample(range(max(count - repeated, 0) * 2 or 1), count - repeated):
+        suffix, combination = divmod(index, combinations)
+        first, last = divmod(combination, len(LAST_NAMES))
+        names.append(FIRST_NAMES[first] + LAST_NAMES[last] + _letters(suffix))
+    if names:
+        names.extend(rng.choice(names) for _ in range(repeated))
+        rng.shuffle(names)
+    return names
+
+
+def generate_pairs(names: List[str], share: float, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Pair a share of the people with another random person of the roster.
+
+    :param names: Roster
+    :param share: Share of the people with a wish (0 to 1)
+    :param seed: Seed of the random choices
+    :return: (person, other person) pairs, the two always different
+    """
+    rng = random.Random(seed)
+    people = list(dict.fromkeys(names))
+    if len(people) < 2:
+        return []
+    pairs = []
+    for person in rng.sample(people, int(len(people) * share)):
+        other = rng.choice(people)
+        while other == person:
+            other = rng.choice(people)
+        pairs.append((person, other))
+    return pairs
+
+
+def generate_roster(count: int, together: float = 0.0, apart: float = 0.0, duplicates: float = 0.0,
+                    seed: int = 0) -> List[RosterRow]:
+    """
+    Generate roster rows: each person with the people they want to sit
+    with and the people they want to avoid.
+
+    :param count: Number of rows
+    :param together: Share of the people asking to sit with someone
+    :param apart: Share of the people asking to avoid someone
+    :param duplicates: Share of the rows repeating an earlier name
+    :param seed: Seed of the random choices
+    :return: (name, names to sit with, names to avoid) rows
+    """
+    names = generate_names(count, duplicates, seed)
+    wishes = {name: ([], []) for name in names}
+    for person, other in generate_pairs(names, together, seed + 1):
+        wishes[person][0].append(other)
+    for person, other in generate_pairs(names, apart, seed + 2):
+        if other not in wishes[person][0]:
+            wishes[person][1].append(other)
+    return [(name, *wishes[name]) for name in names]
+
+
+def write_roster(rows: List[RosterRow], path: str) -> int:
+    """
+    Write roster rows as a CSV (name, sit with, avoid columns, no header)
+    or an Excel file, depending on the extension.
+
+    :return: Number of rows written
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if not path.lower().endswith(".csv"):
+        return write_roster_to_excel(rows, path)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        for name, sit_with, avoid in rows:
+            writer.writerow([name, "; ".join(sit_with), "; ".join(avoid)])
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic roster generator")
+    parser.add_argument("count", type=int, help="number of rows")
+    parser.add_argument("path", help="output file (.csv or .xlsx)")
+    parser.add_argument("--together", type=float, default=0.0, help="share of people asking to sit with someone")
+    parser.add_argument("--apart", type=float, default=0.0, help="share of people asking to avoid someone")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="share of repeated names")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+    rows = generate_roster(options.count, options.together, options.apart, options.duplicates, options.seed)
+    print(f"{write_roster(rows, options.path)} rows written to {options.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+suite.py – Benchmark suite of the seating core, with machine-readable results
+
+Times the core operations on synthetic rosters (see roster_generator.py)
+of 100 to 1M entries:
+
+- organize:                  Openspace.organize() of N names, 4 seats per table
+- organize_constraints:      the same with 5% sit-with and 5% avoid wishes (up to 100k)
+- assign_person:             1000 Openspace.assign_person() calls (N/2 below 2000) in a half-full room of N seats
+- eliminate_lonely_tables:   a room of N seats where one table in five has someone alone
+- get_unseated_people:       a room with N people waiting for a seat
+- store_csv / store_xlsx:    Openspace.store() of a full room of N seats
+- load_colleagues_from_excel: reading an .xlsx roster of N names
+
+Each case builds its input outside the measurement, then runs rounds (a
+fresh room each round, garbage collection paused) until it has
+--min-rounds rounds and --min-time seconds in total, stopping at
+--max-time or 1000 rounds. The statistics of every case and size are
+written as JSON along with the commit and the machine, by default to
+benchmarks/results/<commit>.json; compare two such files with compare.py
+to flag regressions.
+
+Usage:
+------
+>>> python benchmarks/suite.py                                   # everything, 100 to 1M
+>>> python benchmarks/suite.py --cases organize assign_person --sizes 1000 100000
+>>> python benchmarks/suite.py --output /tmp/before.json
+>>> python benchmarks/compare.py /tmp/before.json benchmarks/results/<commit>.json
+
+To measure an older revision, run the suite from a checkout of it
+(e.g. `git worktree add /tmp/old <rev>`) with the current suite.py,
+roster_generator.py and compare.py copied in.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model.constraints import PairConstraints
+from model.openspace import Openspace
+from roster_generator import generate_names, generate_roster, write_roster
+from utils.file_utils import load_colleagues_from_excel
+
+SEATS_PER_TABLE = 4
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+MAX_ROUNDS = 1000
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+WORK_DIR = tempfile.TemporaryDirectory(prefix="suite")  # generated files, removed on exit
+
+# A case takes the size and returns (setup, run): setup() builds the input
+# of one round outside the measurement, run(input) is the timed part
+Round = Tuple[Callable[[], Any], Callable[[Any], Any]]
+CASES: Dict[str, Callable[[int], Round]] = {}
+MAX_SIZES: Dict[str, int] = {}
+
+
+def case(name: str, max_size: Optional[int] = None) -> Callable:
+    """
+    Register a benchmark case, optionally limited to sizes up to `max_size`.
+    """
+    def register(function: Callable[[int], Round]) -> Callable[[int], Round]:
+        CASES[name] = function
+        if max_size is not None:
+            MAX_SIZES[name] = max_size
+        return function
+    return register
+
+
+def _tables(size: int) -> List[int]:
+    return [SEATS_PER_TABLE] * -(-size // SEATS_PER_TABLE)
+
+
+def _seated_room(size: int, fill: int) -> Openspace:
+    """
+    Room of `size` seats with `fill` people at each table, seated directly in the store.
+    """
+    room = Openspace.with_capacities(_tables(size))
+    store = room.seat_store
+    names = iter(generate_names(store.table_count * fill))
+    for position in range(store.table_count):
+        for seat in range(fill):
+            store.take(position, seat, next(names))
+    return Openspace.from_store(store)
+
+
+@case("organize")
+def bench_organize(size: int) -> Round:
+    names = generate_names(size)
+    return (lambda: Openspace.with_capacities(_tables(size)),
+            lambda room: room.organize(names, strategy="first_fit", seed=0))
+
+
+@case("organize_constraints", max_size=100_000)
+def bench_organize_constraints(size: int) -> Round:
+    rows = generate_roster(size, together=0.05, apart=0.05)
+    names = [name for name, _, _ in rows]
+    constraints = PairConstraints(
+        [(name, other) for name, sit_with, _ in rows for other in sit_with],
+        [(name, other) for name, _, avoid in rows for other in avoid],
+    )
+    return (lambda: Openspace.with_capacities(_tables(size)),
+            lambda room: room.organize(names, seed=0, constraints=constraints))
+
+
+@case("assign_person")
+def bench_assign_person(size: int) -> Round:
+    calls = min(1000, size // 2)
+    arrivals = [f"Arrival{i}" for i in range(calls)]
+
+    def run(room: Openspace) -> None:
+        for name in arrivals:
+            room.assign_person(name)
+    return lambda: _seated_room(size, SEATS_PER_TABLE // 2), run
+
+
+@case("eliminate_lonely_tables")
+def bench_eliminate_lonely_tables(size: int) -> Round:
+    def setup() -> Openspace:
+        room = Openspace.with_capacities(_tables(size))
+        store = room.seat_store
+        names = iter(generate_names(size))
+        for position in range(store.table_count):
+            for seat in range(1 if position % 5 == 0 else 2):
+                store.take(position, seat, next(names))
+        return Openspace.from_store(store)
+    return setup, lambda room: room.eliminate_lonely_tables()
+
+
+@case("get_unseated_people")
+def bench_get_unseated_people(size: int) -> Round:
+    room = Openspace.from_store(Openspace.with_capacities([]).seat_store, generate_names(size))
+    return lambda: room, lambda room: room.get_unseated_people()
+
+
+def _store_case(extension: str) -> Callable[[int], Round]:
+    def bench_store(size: int) -> Round:
+        room = _seated_room(size, SEATS_PER_TABLE)
+        path = os.path.join(WORK_DIR.name, f"plan{size}.{extension}")
+        return lambda: room, lambda room: room.store(path)
+    return bench_store
+
+
+case("store_csv")(_store_case("csv"))
+case("store_xlsx")(_store_case("xlsx"))
+
+
+@case("load_colleagues_from_excel")
+def bench_load_colleagues_from_excel(size: int) -> Round:
+    path = os.path.join(WORK_DIR.name, f"roster{size}.xlsx")
+    write_roster(generate_roster(size), path)
+    return lambda: path, load_colleagues_from_excel
+
+
+def measure(round_: Round, min_rounds: int, min_time: float, max_time: float) -> Dict[str, float]:
+    """
+    Time rounds of a case and return their statistics in seconds.
+    """
+    setup, run = round_
+    timings: List[float] = []
+    gc.collect()
+    while not timings or (
+        (len(timings) < min_rounds or sum(timings) < min_time) and sum(timings) < max_time
+        and len(timings) < MAX_ROUNDS
+    ):
+        value = setup()
+        # As timeit does, keep garbage collection pauses out of the rounds
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(value)
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return {
+        "min": min(timings),
+        "max": max(timings),
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": len(timings),
+    }
+
+
+def commit_info() -> Dict[str, Any]:
+    """
+    Current commit of the repository and whether the tree has local changes.
+    """
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+    return {"id": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seating core benchmark suite")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES), help="cases to run")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="entries per case")
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds of rounds wanted per case and size")
+    parser.add_argument("--max-time", type=float, default=5.0, help="seconds after which no new round starts")
+    parser.add_argument("--output", help="JSON results file (default: benchmarks/results/<commit>.json)")
+    options = parser.parse_args()
+
+    commit = commit_info()
+    results = []
+    print(f"{'case':<28}{'size':>10}{'median (s)':>12}{'min (s)':>10}{'rounds':>8}")
+    for name in options.cases:
+        for size in options.sizes:
+            if size > MAX_SIZES.get(name, size):
+                continue
+            stats = measure(CASES[name](size), options.min_rounds, options.min_time, options.max_time)
+            results.append({"name": name, "size": size, "stats": stats})
+            print(f"{name:<28}{size:>10}{stats['median']:>12.4f}{stats['min']:>10.4f}{stats['rounds']:>8}")
+
+    output = options.output or os.path.join(
+        RESULTS_DIR, f"{commit['id'][:12] or 'unknown'}{'-dirty' if commit['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump({
+            "commit": commit,
+            "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "machine": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "system": platform.platform(),
+                "processor": platform.processor() or platform.machine(),
+                "cpus": os.cpu_count(),
+            },
+            "benchmarks": results,
+        }, file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,19 @@
+import argparse
 import sys
 import os
+from typing import List, Optional
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from utils.file_utils import create_excel_from_csv, load_colleagues_from_excel, load_config
+# Only light modules here: openpyxl is imported by file_utils on first use
+from utils.file_utils import create_excel_from_csv, load_roster, load_config
+from utils.exporters import EXTENSIONS
+from model.constraints import PairConstraints
 from model.openspace import Openspace
+from model.report import SeatingReport
+from model.search import organize_best_of
+from utils.snapshot_store import SnapshotLockedError, SnapshotStore
+from utils import metrics
+from utils.profiling import Profiler, profile_path
 
 
 # === Define color codes ===
@@ -12,10 +22,69 @@ GREEN = "\033[92m"
 RED = "\033[91m"
 RESET = "\033[0m"
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the command line options.
+    """
+    parser = argparse.ArgumentParser(description="Organize colleagues into the openspace.")
+    parser.add_argument(
+        "--fast-start",
+        action="store_true",
+        help="read names straight from the CSV, skipping the intermediate Excel file",
+    )
+    parser.add_argument(
+        "--best-of",
+        type=int,
+        metavar="K",
+        help="organize K variants in parallel and keep the best (overrides search.restarts in config.json)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="reload the layout saved in the cli folder of the persistence directory of config.json instead of organizing a new one",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="report counts instead of listing every seat and person (much faster for large rosters)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="profile the seating run (until the menu) and record its metrics: cProfile statistics, or "
+             "flamegraph-ready collapsed stacks when PATH ends with .folded (default: data/profile-<time>.prof)",
+    )
+    return parser.parse_args(argv)
+
+
+def finish_profile(profiler: Optional[Profiler]) -> None:
+    """
+    Stop the profiler, if any, and write its output and the metrics recorded.
+    """
+    if profiler is None:
+        return
+    summary = profiler.stop()
+    metrics_path = f"{profiler.path}.prom"
+    with open(metrics_path, "w", encoding="utf-8") as file:
+        file.write(metrics.render())
+    print(f"\n{BLUE}>>> Profile written to: {profiler.path} (metrics: {metrics_path}){RESET}")
+    print(summary)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
     # Clear terminal screen
     os.system('cls' if os.name == 'nt' else 'clear')
 
+    profiler = None
+    if args.profile is not None:
+        metrics.enable()
+        profiler = Profiler(args.profile or profile_path())
+        profiler.start()
+
     # File paths and config
     input_file = "problem-statement/collegues.csv"
     excel_file = "data/colleagues.xlsx"
@@ -23,43 +92,104 @@ def main() -> None:
     config = load_config()
     tables = config["tables"]
     seats_per_table = config["seats_per_table"]
+    # The CLI keeps its layout in a folder of its own, apart from the web app's
+    snapshot_store = SnapshotStore.from_config(config, namespace="cli")
+
+    room = None
+    if args.resume and snapshot_store is not None:
+        try:
+            room = snapshot_store.load()
+        except SnapshotLockedError as error:
+            print(f"{BLUE}>>> Not reloading nor saving the layout: {error}{RESET}\n")
+            snapshot_store = None
+    if room is not None:
+        print(f"\n{BLUE}>>> Reloaded the saved layout from: {snapshot_store.directory}{RESET}\n")
+        if not args.quiet:
+            room.display()
+        sys.stdout.write(SeatingReport.of(room).render(details=not args.quiet))
+        finish_profile(profiler)
+        room.sink = print
+        handle_user_choice(room)
+        print(f"{GREEN}>>> Program completed successfully.{RESET}\n")
+        return
+    if args.resume:
+        print(f"\n{RED}>>> No saved layout to resume, organizing a new one.{RESET}\n")
+
+    if args.fast_start:
+        # Read the CSV directly: no Excel round-trip, no openpyxl import
+        names, together, apart = load_roster(input_file)
+        print(f"\n{BLUE}>>> Loaded {len(names)} names from: {input_file}{RESET}\n")
+    else:
+        # Create Excel file from CSV
+        create_excel_from_csv(input_file, excel_file)
+        print(f"\n{BLUE}>>> Excel file created at: {excel_file}{RESET}")
 
-    # Create Excel file from CSV
-    create_excel_from_csv(input_file, excel_file)
-    print(f"\n{BLUE}>>> Excel file created at: {excel_file}{RESET}")
-
-    # Load names from Excel file
-    names = load_colleagues_from_excel(excel_file)
-    print(f"{BLUE}>>> Loaded {len(names)} names from: {excel_file}{RESET}\n")
+        # Load names and seating wishes from Excel file
+        names, together, apart = load_roster(excel_file)
+        print(f"{BLUE}>>> Loaded {len(names)} names from: {excel_file}{RESET}\n")
 
     # Set up the room
-    room = Openspace(tables, seats_per_table)
+    search = config.get("search", {})
+    restarts = args.best_of if args.best_of is not None else search.get("restarts", 1)
     print(f"{BLUE}>>> Assigning colleagues to seats...{RESET}\n")
-    room.organize(names)
-
-    # Display the seating arrangement (with lonely persons highlighted)
-    room.display()
-
-    
-    # Manage and eliminate lonely persons at tables 
-    
-    if room.is_there_lonely_person():
-        print(">>> Lonely persons detected. Eliminating lonely tables...\n")
-        room.eliminate_lonely_tables()
-        print(">>> Re-displaying seating arrangement after elimination:\n")
-        room.display()
+    if restarts > 1:
+        # Best of K seeded variants, organized on a process pool
+        room, report = organize_best_of(
+            names,
+            [seats_per_table] * tables,
+            restarts=restarts,
+            workers=search.get("workers"),
+            time_budget=search.get("time_budget"),
+            strategy=config.get("strategy"),
+            constraints=PairConstraints(together, apart),
+            seed=config.get("seed"),
+        )
+        print(f"{BLUE}>>> Kept the best of {report['variants']} variant(s) "
+              f"({report['workers']} worker(s), {report['seconds']:.2f} s){RESET}\n")
+        report = SeatingReport.of(room)
     else:
-        print(">>> No lonely persons detected.\n")
-    
+        room = Openspace(tables, seats_per_table)
+        report = room.organize(
+            names,
+            strategy=config.get("strategy"),
+            seed=config.get("seed"),
+            constraints=PairConstraints(together, apart),
+        )
+
+    # The layouts and the report are assembled first and written at once:
+    # one line per seat or person adds up on large rosters
+    output = []
+    if not args.quiet:
+        # Display the seating arrangement (with lonely persons highlighted)
+        output.append(room.format_layout())
+
+    # Manage and eliminate lonely persons at tables
+    if room.is_there_lonely_person():
+        output.append(">>> Lonely persons detected. Eliminating lonely tables...\n\n")
+        report = room.eliminate_lonely_tables()
+        if not args.quiet:
+            output.append(">>> Re-displaying seating arrangement after elimination:\n\n")
+            output.append(room.format_layout())
 
-    
-    # Display number of remaining seats
-    print(f"{BLUE}>>> {room.seats_left()} seats left in the room.{RESET}\n")
+    # Moves, people alone or without a seat, remaining seats
+    output.append(BLUE + report.render(details=not args.quiet) + RESET)
+    sys.stdout.write("".join(output))
 
     print(f"\n{BLUE}>>> Saving seating plan to: {output_file}{RESET}\n")
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
     room.store(output_file)
 
-    #Launch user interaction menu
+    # Later changes from the menu are appended to the log of this snapshot
+    if snapshot_store is not None:
+        try:
+            snapshot_store.save(room)
+        except SnapshotLockedError as error:
+            print(f"{BLUE}>>> Not saving the layout: {error}{RESET}\n")
+
+    finish_profile(profiler)
+
+    #Launch user interaction menu, which reports what the room does
+    room.sink = print
     handle_user_choice(room)
 
     print(f"{GREEN}>>> Program completed successfully.{RESET}\n")
@@ -74,7 +204,7 @@ def display_menu() -> None:
     print("2. Show number of seats / people / free spots")
     print("3. Add a new colleague")
     print("4. Add a new table")
-    print("5. Save seating plan to Excel")
+    print("5. Save seating plan to Excel (or .csv, .jsonl, .parquet, .arrow)")
     print("6. Remove a table (must be empty)")
     print("7. Remove a person from the room")
     print("8. Remove a person from a specific table")
@@ -104,17 +234,22 @@ def handle_user_choice(openspace: Openspace) -> None:
 
         elif choice == "3":
             name = input("Enter the new colleague's name: ").strip()
-            success = openspace.assign_person(name)
-            if not success:
+            report = openspace.apply_delta(added=[name])
+            if not report["seated"]:
                 print(RED + "No available seat. Please add a new table first." + RESET)
             else:
                 print(GREEN + f"{name} added to a table." + RESET)
+                for moved, source, target in report["moved"]:
+                    print(f"{moved} moved from table {source} to table {target}.")
 
         elif choice == "4":
             try:
                 capacity = int(input("Enter number of seats for the new table: "))
-                openspace.add_table(capacity)
-                print(GREEN + "New table added." + RESET)
+                if capacity < 1:
+                    print(RED + "A table needs at least one seat." + RESET)
+                else:
+                    openspace.add_table(capacity)
+                    print(GREEN + "New table added." + RESET)
             except ValueError:
                 print(RED + "Please enter a valid number." + RESET)
 
@@ -130,11 +265,16 @@ def handle_user_choice(openspace: Openspace) -> None:
             # Ensure data/ directory exists
             os.makedirs("data", exist_ok=True)
 
-            # Construct full path with .xlsx extension
-            full_path = os.path.join("data", f"{filename_input}.xlsx")
+            # Construct full path, adding .xlsx unless another export format is named
+            if os.path.splitext(filename_input)[1].lower() not in EXTENSIONS:
+                filename_input += ".xlsx"
+            full_path = os.path.join("data", filename_input)
 
-            openspace.store(full_path)
-            print(GREEN + f"Seating plan saved to {os.path.abspath(full_path)}" + RESET)
+            try:
+                openspace.store(full_path)
+                print(GREEN + f"Seating plan saved to {os.path.abspath(full_path)}" + RESET)
+            except (ImportError, ValueError) as e:
+                print(RED + f"Could not save the seating plan: {e}" + RESET)
 
 
         elif choice == "6":
@@ -148,11 +288,13 @@ def handle_user_choice(openspace: Openspace) -> None:
 
         elif choice == "7":
             name = input("Enter the name of the person to remove from the room: ").strip()
-            success = openspace.remove_person_from_room(name)
+            success = openspace.is_person_seated(name) or name in openspace.unassigned
             if success:
-                print(f"{name} has been removed from their seat.")
+                report = openspace.apply_delta(removed=[name])
+                print(f"{name} has been removed from the room.")
+                for moved, source, target in report["moved"]:
+                    print(f"{moved} moved from table {source} to table {target}.")
                 openspace.display()
-                unseated = openspace.get_unseated_people()
 
             else:
                 print(RED + "Person not found in the room." + RESET)
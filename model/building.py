@@ -0,0 +1,188 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from model.openspace import Openspace
+from model.redistribution import Move, plan_lonely_moves
+from model.report import SeatingReport
+from model.strategies import SeatingStrategy, get_strategy
+from model.unassigned_pool import UnassignedPool
+
+
+def _post_pass(counts: Tuple[array, array]) -> Tuple[List[Move], List[int]]:
+    """
+    Plan the lonely-table moves of one room and list its lonely tables,
+    from its occupancy counters only (cheap to send to a worker process).
+    """
+    occupied, capacities = counts
+    lonely = [position for position, count in enumerate(occupied) if count == 1]
+    return plan_lonely_moves(occupied, capacities), lonely
+
+
+class Building:
+    """
+    A set of rooms (floors, wings) seated from one roster.
+
+    Each room is an Openspace with its own table sizes. organize() spreads
+    the whole roster in one batched pass: a single shuffle and a single
+    strategy allocation over the tables of every room, then each room's
+    seats are filled from its slice of the plan. Post-passes only need the
+    occupancy counters of a room, so they can run on a process pool.
+    """
+
+    def __init__(self, rooms: Optional[Dict[str, Openspace]] = None) -> None:
+        self.rooms: Dict[str, Openspace] = dict(rooms or {})
+        self.unassigned: UnassignedPool = UnassignedPool()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "Building":
+        """
+        Build empty rooms from the "building" section of config.json:
+        a list of rooms, each with a name and either a list of table
+        capacities or a number of tables and seats per table.
+
+        :param config: Full configuration
+        :return: The building
+        """
+        building = cls()
+        for index, room in enumerate(config["building"]["rooms"], start=1):
+            tables = room["tables"]
+            if isinstance(tables, int):
+                tables = [room["seats_per_table"]] * tables
+            building.add_room(room.get("name", f"Room {index}"), tables)
+        return building
+
+    def add_room(self, name: str, capacities: Iterable[int]) -> Openspace:
+        """
+        Add an empty room whose tables have the given numbers of seats.
+
+        :raises ValueError: If a room already has this name
+        """
+        if name in self.rooms:
+            raise ValueError(f"A room named '{name}' already exists.")
+        room = Openspace.with_capacities(capacities)
+        self.rooms[name] = room
+        return room
+
+    def organize(
+        self,
+        names: Iterable[str],
+        strategy: Union[str, SeatingStrategy, None] = None,
+        seed: Union[int, random.Random, None] = None,
+    ) -> SeatingReport:
+        """
+        Randomly seat the roster over every room, following the strategy
+        as if all tables stood in one room. People who got no seat are
+        stored in self.unassigned.
+
+        :param names: People to seat; any iterable, consumed once
+        :param strategy: Strategy name or instance, see model.strategies
+        :param seed: Integer seed or random.Random instance; None for a fresh random layout
+        :return: Who sits alone (in any room), who got no seat and the free seats of the building
+        """
+        strategy = get_strategy(strategy)
+        rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        names = list(names)
+        rng.shuffle(names)
+        self.unassigned = UnassignedPool()
+
+        occupied, capacities = array("i"), array("i")
+        for room in self.rooms.values():
+            occupied.extend(room.seat_store.occupied)
+            capacities.extend(room.seat_store.capacities)
+        plan = strategy.allocate(len(names), occupied, capacities)
+
+        i = 0
+        start = 0
+        for room in self.rooms.values():
+            room.unassigned = UnassignedPool()
+            for table, count in zip(room.tables, plan[start:start + len(room.tables)]):
+                for name in names[i:i + count]:
+                    table.assign_seat(name)
+                i += count
+            start += len(room.tables)
+            room.sat_alone = [room.tables[position].occupants()[0] for position in room.seat_store.lonely_tables()]
+
+        self.unassigned.extend(name for name in names[i:] if not self.is_person_seated(name))
+        return SeatingReport(
+            [name for room in self.rooms.values() for name in room.sat_alone],
+            self.unassigned,
+            self.seats_left(),
+            place="building",
+        )
+
+    def _post_passes(self, workers: Optional[int]) -> List[Tuple[List[Move], List[int]]]:
+        """
+        Run _post_pass() for every room, on a process pool when `workers`
+        asks for more than one process (None for one per CPU).
+        """
+        counts = [(room.seat_store.occupied, room.seat_store.capacities) for room in self.rooms.values()]
+        workers = min(workers or os.cpu_count() or 1, len(counts)) if workers != 0 else 1
+        if workers <= 1:
+            return [_post_pass(room_counts) for room_counts in counts]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_post_pass, counts, chunksize=max(1, len(counts) // (4 * workers))))
+
+    def eliminate_lonely_tables(self, workers: Optional[int] = 0) -> Dict[str, SeatingReport]:
+        """
+        Remove lonely tables room by room (people never change rooms).
+        The moves of every room are planned independently, in parallel when
+        `workers` is not 0, then applied to the rooms in this process.
+
+        :param workers: Worker processes; None for one per CPU, 0 or 1 to stay in-process
+        :return: The report of each room where people moved, by room name
+        """
+        reports = {}
+        for (name, room), (moves, _) in zip(self.rooms.items(), self._post_passes(workers)):
+            if moves:
+                reports[name] = room.eliminate_lonely_tables(moves)
+        return reports
+
+    def lonely_people(self, workers: Optional[int] = 0) -> Dict[str, List[str]]:
+        """
+        Return, per room, the people sitting alone at a table.
+
+        :param workers: Worker processes; None for one per CPU, 0 or 1 to stay in-process
+        """
+        result = {}
+        for (name, room), (_, lonely) in zip(self.rooms.items(), self._post_passes(workers)):
+            if lonely:
+                result[name] = [room.tables[position].occupants()[0] for position in lonely]
+        return result
+
+    def is_there_lonely_person(self) -> bool:
+        """
+        Check whether someone sits alone in any room.
+        """
+        return any(room.is_there_lonely_person() for room in self.rooms.values())
+
+    def locate(self, name: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Return where `name` sits as (room name, table index, seat index), 1-based,
+        or None if not seated.
+        """
+        for room_name, room in self.rooms.items():
+            location = room.seat_store.locate(name)
+            if location:
+                return room_name, location[0] + 1, location[1] + 1
+        return None
+
+    def is_person_seated(self, name: str) -> bool:
+        """
+        Check whether `name` holds a seat in any room.
+        """
+        return any(room.seat_store.is_seated(name) for room in self.rooms.values())
+
+    def seats_left(self) -> int:
+        """
+        Return the number of free seats in the building.
+        """
+        return sum(room.seats_left() for room in self.rooms.values())
+
+    def total_people(self) -> int:
+        """
+        Return the number of people in the building, seated or not.
+        """
+        return sum(room.seat_store.seated_people for room in self.rooms.values()) + len(self.unassigned)
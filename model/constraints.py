@@ -0,0 +1,257 @@
+import random
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# A pair of names: (person, other person)
+Pair = Tuple[str, str]
+
+
+class PairConstraints:
+    """
+    Whitelist and blacklist of the roster: pairs of people who want to sit
+    at the same table, and pairs who must not.
+    """
+
+    def __init__(self, together: Iterable[Pair] = (), apart: Iterable[Pair] = ()) -> None:
+        self.together: List[Pair] = list(together)
+        self.apart: List[Pair] = list(apart)
+        self._index: Optional[Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]] = None
+
+    def add_together(self, name: str, other: str) -> None:
+        """
+        Require `name` and `other` to share a table.
+        """
+        self.together.append((name, other))
+        self._index = None
+
+    def add_apart(self, name: str, other: str) -> None:
+        """
+        Forbid `name` and `other` from sharing a table.
+        """
+        self.apart.append((name, other))
+        self._index = None
+
+    def _pairs_of(self) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+        """
+        Index both lists by name, built on first use.
+        """
+        if self._index is None:
+            index: Tuple[Dict[str, Set[str]], Dict[str, Set[str]]] = ({}, {})
+            for pairs, by_name in zip((self.together, self.apart), index):
+                for name, other in pairs:
+                    by_name.setdefault(name, set()).add(other)
+                    by_name.setdefault(other, set()).add(name)
+            self._index = index
+        return self._index
+
+    def can_move(self, name: str, leaving: Iterable[str], joining: Iterable[str]) -> bool:
+        """
+        Check that moving `name` away from the people of `leaving` to the
+        table of `joining` parts no whitelisted pair and joins no blacklisted one.
+        """
+        partners, conflicts = self._pairs_of()
+        return partners.get(name, set()).isdisjoint(leaving) and conflicts.get(name, set()).isdisjoint(joining)
+
+    def __len__(self) -> int:
+        return len(self.together) + len(self.apart)
+
+    def __bool__(self) -> bool:
+        return bool(self.together or self.apart)
+
+    def __repr__(self) -> str:
+        return f"PairConstraints(together={len(self.together)}, apart={len(self.apart)})"
+
+
+class ConstraintSolver:
+    """
+    Seat people so that whitelisted pairs share a table and blacklisted
+    pairs never do.
+
+    Must-sit-together pairs are merged with a union-find into groups that
+    are placed as one block. Blacklisted pairs become edges between groups
+    in an adjacency index. Whenever a group is placed, its table is
+    recorded as blocked for each of its conflicting groups, so checking a
+    candidate table is a set lookup and nothing is rescanned.
+
+    Groups are placed largest and most constrained first (ties in random
+    order), each at the fullest table that still has room for it and is
+    not blocked, so that groups of people fill tables instead of opening
+    new ones. A group of one only opens an empty table when no table with
+    someone at it can take it, so people do not end up sitting alone where
+    they could join others. A group larger than any table is split, and reported.
+    """
+
+    def __init__(self, names: Iterable[str], constraints: PairConstraints) -> None:
+        # Roster names first, then names only known from the constraints.
+        # A name listed twice in the roster is one person.
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._parent: List[int] = []  # union-find forest over person ids
+        self._size: List[int] = []
+        for name in names:
+            self._intern(name)
+        self.roster_size: int = len(self.names)
+
+        for name, other in constraints.together:
+            self._union(self._intern(name), self._intern(other))
+
+        # Conflict index between group roots; self-conflicts cannot be met
+        self.violations: List[str] = []
+        self._conflicts: Dict[int, Set[int]] = {}
+        for name, other in constraints.apart:
+            root, other_root = self._find(self._intern(name)), self._find(self._intern(other))
+            if root == other_root:
+                self.violations.append(f"{name} and {other} should sit apart but are linked by sit-together wishes")
+                continue
+            self._conflicts.setdefault(root, set()).add(other_root)
+            self._conflicts.setdefault(other_root, set()).add(root)
+
+    def _intern(self, name: str) -> int:
+        person = self._ids.get(name)
+        if person is None:
+            person = len(self.names)
+            self._ids[name] = person
+            self.names.append(name)
+            self._parent.append(person)
+            self._size.append(1)
+        return person
+
+    def _find(self, person: int) -> int:
+        parent = self._parent
+        while parent[person] != person:
+            parent[person] = parent[parent[person]]  # path halving
+            person = parent[person]
+        return person
+
+    def _union(self, person: int, other: int) -> None:
+        root, other_root = self._find(person), self._find(other)
+        if root == other_root:
+            return
+        if self._size[root] < self._size[other_root]:
+            root, other_root = other_root, root
+        self._parent[other_root] = root
+        self._size[root] += self._size[other_root]
+
+    def plan(
+        self,
+        occupied: Sequence[int],
+        capacities: Sequence[int],
+        seated_at: Callable[[str], Optional[int]] = lambda name: None,
+        rng: Optional[random.Random] = None,
+    ) -> Tuple[List[Tuple[int, List[str]]], List[str]]:
+        """
+        Plan where every roster person sits.
+
+        People already seated (per `seated_at`) stay where they are: the rest
+        of their group tries to join them, and their table is blocked for the
+        groups they conflict with.
+
+        :param occupied: Occupied seats per table
+        :param capacities: Seats per table
+        :param seated_at: Table position of a name already seated, None otherwise
+        :param rng: Random generator ordering groups of equal size
+        :return: ([(table position, names to seat there)], names left without a seat)
+        """
+        rng = rng or random.Random()
+        free = [capacity - taken for capacity, taken in zip(capacities, occupied)]
+        largest = max(free, default=0)
+
+        # Tables bucketed by free seats (dicts as ordered sets), to find the
+        # fullest table with room for a group without scanning the room;
+        # tables with someone at them and empty tables are kept apart
+        by_free: List[Dict[int, None]] = [{} for _ in range(largest + 1)]
+        empty_by_free: List[Dict[int, None]] = [{} for _ in range(largest + 1)]
+        for position, seats in enumerate(free):
+            if seats:
+                (by_free if occupied[position] else empty_by_free)[seats][position] = None
+
+        # Group members still to seat, and the table of already seated people
+        members: Dict[int, List[str]] = {}
+        table_of: Dict[int, int] = {}
+        blocked: Dict[int, Set[int]] = {}
+        for person, name in enumerate(self.names):
+            root = self._find(person)
+            position = seated_at(name)
+            if position is not None:
+                table_of.setdefault(root, position)
+                for other_root in self._conflicts.get(root, ()):
+                    blocked.setdefault(other_root, set()).add(position)
+            elif person < self.roster_size:
+                members.setdefault(root, []).append(name)
+
+        roots = list(members)
+        rng.shuffle(roots)
+        roots.sort(key=lambda root: (len(members[root]), len(self._conflicts.get(root, ()))), reverse=True)
+
+        placements: List[Tuple[int, List[str]]] = []
+        unplaced: List[str] = []
+        singles = sum(1 for root in roots if len(members[root]) == 1)  # groups of one, placed last
+        spare = sum(free) - sum(len(group) for group in members.values())
+        for root in roots:
+            group = members[root]
+            if len(group) > largest:
+                self.violations.append(f"{', '.join(group)} cannot all sit together: no table has {len(group)} free seats")
+                chunks = [group[start:start + largest] for start in range(0, len(group), largest)] if largest else [group]
+            else:
+                chunks = [group]
+            for chunk in chunks:
+                position = self._pick_table(
+                    len(chunk), free, by_free, empty_by_free, table_of.get(root), blocked.get(root, ()), singles, spare
+                )
+                if len(group) == 1:
+                    singles -= 1
+                if position is None:
+                    unplaced.extend(chunk)
+                    continue
+                bucket = by_free if free[position] < capacities[position] else empty_by_free
+                bucket[free[position]].pop(position)
+                free[position] -= len(chunk)
+                if free[position]:
+                    by_free[free[position]][position] = None
+                placements.append((position, chunk))
+                table_of.setdefault(root, position)
+                for other_root in self._conflicts.get(root, ()):
+                    blocked.setdefault(other_root, set()).add(position)
+        return placements, unplaced
+
+    @staticmethod
+    def _pick_table(
+        size: int,
+        free: List[int],
+        by_free: List[Dict[int, None]],
+        empty_by_free: List[Dict[int, None]],
+        anchor: Optional[int],
+        blocked: Iterable[int],
+        singles: int = 1,
+        spare: int = 0,
+    ) -> Optional[int]:
+        """
+        Choose a table for a group: where part of it already sits if there is
+        room, otherwise the fullest unblocked table with `size` free seats,
+        a table with someone at it before an empty one with as many free
+        seats; while the room has `spare` seats and groups of one are still
+        to come, a larger group first looks for a table where it leaves a seat
+        free. A group of one takes an empty table only as a last resort,
+        and then one where the `singles` groups of one left can sit without
+        the last of them ending up alone, when there is such a table.
+        """
+        if anchor is not None and free[anchor] >= size and anchor not in blocked:
+            return anchor
+        # While the room has seats to spare, a group first looks for a table
+        # where it leaves a seat free for one of the groups of one still to come
+        for least in (size + 1, size) if size > 1 and singles and spare > 0 else (size,):
+            for seats in range(least, len(by_free)):
+                for bucket in (by_free, empty_by_free) if size > 1 else (by_free,):
+                    for position in bucket[seats]:
+                        if position not in blocked:
+                            return position
+        if size > 1:
+            return None
+        fallback = None
+        for seats in range(1, len(empty_by_free)):
+            for position in empty_by_free[seats]:
+                if position not in blocked:
+                    if seats >= singles or singles - seats >= 2:
+                        return position
+                    fallback = position if fallback is None else fallback
+                    break
+        return fallback
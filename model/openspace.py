@@ -1,122 +1,297 @@
 import random
-from typing import List
+import itertools
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from model.seat import Seat
+from model.constraints import ConstraintSolver, PairConstraints
+from model.seat_store import FREE, SeatStore
+from model.strategies import SeatingStrategy, get_strategy
+from model.redistribution import plan_lonely_moves
+from model.report import Event, EventSink, SeatingReport
 from model.table import Table
+from model.unassigned_pool import UnassignedPool
+from utils import metrics
 
 
 
+def layout_key(names: Iterable[str], config: Dict, seed: int) -> str:
+    """
+    Build a cache key for the layout organize() produces.
+
+    The same names (in the same order), room configuration and seed always
+    give the same layout, so the key can index finished layouts.
+
+    :param names: Roster passed to organize()
+    :param config: Room configuration (tables, seats_per_table, strategy, ...)
+    :param seed: Integer seed passed to organize()
+    :return: Hex digest identifying the layout
+    :raises ValueError: If no integer seed is given (the layout would be random)
+    """
+    if isinstance(seed, bool) or not isinstance(seed, int):
+        raise ValueError("A layout is only reproducible with an integer seed.")
+    import hashlib
+    import json
+    digest = hashlib.sha256()
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(f"\0{seed}\0".encode("utf-8"))
+    for name in names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
 class Openspace:
     def __init__(self, number_of_tables: int, table_capacity: int) -> None:
-        # Create tables based on the given configuration
+        # Create tables based on the given configuration. Seats of every table
+        # are stored in one SeatStore; Table and Seat objects are views over it.
         self.number_of_tables: int = number_of_tables
-        self.tables: List[Table] = [Table(table_capacity) for _ in range(number_of_tables)]
-        self.unassigned: List[str] = []
-        self.to_group: List[str] = []
+        self.seat_store: SeatStore = SeatStore()
+        self.tables: List[Table] = []
+        self.unassigned: UnassignedPool = UnassignedPool()
         self.sat_alone: List[str] = []
 
+        # Whitelist/blacklist of the last organize(), respected by later moves
+        self.constraints: Optional[PairConstraints] = None
+        self.constraint_violations: List[str] = []
+
+        # Receives an Event for each person moved and each table or person
+        # removed; None (the default) keeps the room silent
+        self.sink: Optional[EventSink] = None
+
+        # Occupancy index: tables bucketed by fill state, used as ordered sets
+        # so that assign_person() picks a table without scanning the room.
+        self._partial_tables: Dict[Table, None] = {}
+        self._empty_tables: Dict[Table, None] = {}
 
-    def organize(self, names: List[str]) -> None:
+        # The name -> seat index lives in the store (see SeatStore.locate)
+
+        for _ in range(number_of_tables):
+            self._attach_table(table_capacity)
+
+    def _attach_table(self, capacity: int) -> Table:
         """
-        Randomly assign each person using assign_person().
-        Unassigned people are stored in self.unassigned.
+        Append an empty table to the room and register it in the occupancy index.
         """
-        random.shuffle(names)
-        self.unassigned = []
-        self.sat_alone = []
+        return self._register_table(Table(capacity, self.seat_store))
 
-        for name in names:
-            if not self.assign_person(name):
-                self.unassigned.append(name)
+    def _register_table(self, table: Table) -> Table:
+        """
+        Add a view over a table of self.seat_store to the room and its index.
+        """
+        table.owner = self
+        self.tables.append(table)
+        self._bucket_of(table, table.occupied)[table] = None
+        return table
 
-        # If there are people in self.to_group, try to assign them to empty tables
-        if self.to_group:
-            tables_empty = [t for t in self.tables if all(seat.free for seat in t.seats)]
-            group_index = 0
-            i = 0
-
-            while i < len(self.to_group) and group_index < len(tables_empty):
-                table = tables_empty[group_index]
-                seats = table.seats
-                for seat in seats:
-                    if i >= len(self.to_group):
-                        break
-                    seat.set_occupant(self.to_group[i])
-                    i += 1
-                group_index += 1
-
-        if i < len(self.to_group):
-            for name in self.to_group[i:]:
-                if name not in self.unassigned:
-                    self.unassigned.append(name)
+    @classmethod
+    def from_store(cls, store: SeatStore, unassigned: Iterable[str] = ()) -> "Openspace":
+        """
+        Build a room over an existing seat store (a copy, a cached or a loaded layout).
 
-            self.to_group = []
+        :param store: Seats of the room; the room takes ownership of it
+        :param unassigned: People of the room without a seat
+        :return: The room
+        """
+        room = cls(0, 0)
+        room.seat_store = store
+        for position in range(store.table_count):
+            room._register_table(Table.view(store, position))
+        room.number_of_tables = store.table_count
+        room.unassigned.extend(name for name in unassigned if not store.is_seated(name))
+        room.sat_alone = [room.tables[position].occupants()[0] for position in store.lonely_tables()]
+        return room
+
+    @classmethod
+    def with_capacities(cls, capacities: Iterable[int]) -> "Openspace":
+        """
+        Build an empty room whose tables have the given numbers of seats.
 
-        # Analyse finale : personnes seules
+        :param capacities: Seats of each table
+        :return: The room
+        """
+        store = SeatStore()
+        for capacity in capacities:
+            store.add_table(capacity)
+        return cls.from_store(store)
+
+    def copy(self) -> "Openspace":
+        """
+        Return an independent copy of the room and its current seating.
+        """
+        room = Openspace.from_store(self.seat_store.copy(), self.unassigned)
+        room.constraints = self.constraints
+        room.constraint_violations = list(self.constraint_violations)
+        return room
+
+    def _bucket_of(self, table: Table, occupied: int) -> Dict[Table, None]:
+        """
+        Return the index bucket matching a table holding `occupied` people.
+        Full tables live in no bucket, so a throwaway dict is returned.
+        """
+        if occupied >= table.capacity:
+            return {}
+        return self._partial_tables if occupied else self._empty_tables
+
+    def _seat_changed(self, table: Table, seat_index: int, name: str, previous_occupied: int) -> None:
+        """
+        Update the occupancy index after a seat was taken or freed.
+        Called by Table whenever one of its seats changes.
+
+        :param table: Table whose occupancy changed
+        :param seat_index: Seat that was taken or freed
+        :param name: Person who sat down or left
+        :param previous_occupied: Number of occupied seats before the change
+        """
+        occupied = table.occupied
+        if occupied > previous_occupied:
+            # Seated people never stay in the unassigned pool
+            self.unassigned.discard(name)
+
+        # Only touch the buckets on a state change (empty, partial, full), so
+        # a partial table keeps its position and keeps being filled until full.
+        capacity = table.capacity
+        if 0 < occupied < capacity and 0 < previous_occupied < capacity:
+            return
+        old_bucket = self._bucket_of(table, previous_occupied)
+        new_bucket = self._bucket_of(table, occupied)
+        if new_bucket is not old_bucket:
+            old_bucket.pop(table, None)
+            new_bucket[table] = None
+
+
+    def organize(
+        self,
+        names: Iterable[str],
+        strategy: Union[str, SeatingStrategy, None] = None,
+        seed: Union[int, random.Random, None] = None,
+        constraints: Optional[PairConstraints] = None,
+    ) -> SeatingReport:
+        """
+        Randomly assign each person, following the chosen seating strategy.
+        Unassigned people are stored in self.unassigned.
+
+        With whitelist/blacklist constraints, the constraint solver places
+        people instead of the strategy (see model.constraints), then the
+        lonely pass moves people who sit alone where no wish forbids it;
+        wishes that cannot be met are listed in self.constraint_violations.
+
+        The names are shuffled on a copy with a private random generator,
+        so the caller's list is left untouched and the same names, room and
+        seed always give the same layout (see layout_key()).
+
+        :param names: People to seat; any iterable, consumed once (e.g. a
+                      streaming reader from utils.file_utils)
+        :param strategy: Strategy name ('first_fit', 'packing', 'balanced'),
+                         instance, or None for the default (see model.strategies)
+        :param seed: Integer seed or random.Random instance; None for a fresh random layout
+        :param constraints: Pairs who want to sit together or apart
+        :return: Who sits alone, who got no seat, the free seats and the broken wishes
+        """
+        strategy = get_strategy(strategy)
+        rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        with metrics.timer("openspace_organize_phase_seconds", phase="shuffle"):
+            names = list(names)
+            rng.shuffle(names)
+        metrics.inc("openspace_organized_people_total", len(names))
+        self.unassigned.clear()
         self.sat_alone = []
-        for table in self.tables:
-            occupants = [seat.occupant for seat in table.seats if not seat.free]
-            if len(occupants) == 1:
-                self.sat_alone.append(occupants[0])
-
-        # Affichage final propre
-        print("\n>>> Assigning colleagues to seats...")
-
-        if self.sat_alone:
-            print("\n>>> The following people had to sit alone (no other option):")
-            for name in self.sat_alone:
-                print(f" - {name}")
+        self.constraints = constraints or None
+        self.constraint_violations = []
+
+        if self.constraints:
+            with metrics.timer("openspace_organize_phase_seconds", phase="grouping"):
+                solver = ConstraintSolver(names, self.constraints)
+                placements, unplaced = solver.plan(
+                    self.seat_store.occupied, self.seat_store.capacities, self._table_position_of, rng
+                )
+            with metrics.timer("openspace_organize_phase_seconds", phase="assign"):
+                for position, group in placements:
+                    for name in group:
+                        self.tables[position].assign_seat(name)
+                self.unassigned.extend(unplaced)
+            self.constraint_violations = solver.violations
+            # The solver keeps groups of one off empty tables when it can,
+            # but the last of them or a blacklist may still leave someone
+            # alone: the wishes-aware lonely pass finishes the layout
+            if self.is_there_lonely_person():
+                with metrics.timer("openspace_organize_phase_seconds", phase="lonely_moves"):
+                    self._make_lonely_moves(None, None)
         else:
-            print("\n>>> No lonely persons detected.")
+            # The strategy decides how many people each table receives
+            with metrics.timer("openspace_organize_phase_seconds", phase="grouping"):
+                plan = strategy.allocate(len(names), self.seat_store.occupied, self.seat_store.capacities)
+            with metrics.timer("openspace_organize_phase_seconds", phase="assign"):
+                i = 0
+                for table, count in zip(self.tables, plan):
+                    for name in names[i:i + count]:
+                        table.assign_seat(name)
+                    i += count
+
+                if i < len(names):
+                    self.unassigned.extend(names[i:])
 
-        free_seats = self.seats_left()
-        print(f"\n>>> {free_seats} seat{'s' if free_seats != 1 else ''} left in the room.")
+        # Analyse finale : personnes seules
+        with metrics.timer("openspace_organize_phase_seconds", phase="lonely"):
+            self.sat_alone = [self.tables[position].occupants()[0] for position in self.seat_store.lonely_tables()]
 
         # Nettoyage des noms déjà assis
-        self.unassigned = [name for name in self.unassigned if not self.is_person_seated(name)]
+        for name in [name for name in self.unassigned if self.seat_store.is_seated(name)]:
+            self.unassigned.discard(name)
 
-        if self.unassigned:
-            print("\n>>> Could not assign the following people (no available seats):")
-            for name in self.unassigned:
-                print(f" - {name}")
+        return SeatingReport(self.sat_alone, self.unassigned, self.seats_left(), self.constraint_violations)
+
+    def _table_position_of(self, name: str) -> Optional[int]:
+        """
+        Return the position of the table where `name` sits, None if not seated.
+        """
+        location = self.seat_store.locate(name)
+        return location[0] if location else None
 
 
 
     def display(self) -> None:
         """
-        Print the seating arrangement.
+        Print the seating arrangement, in a single write.
         """
-        for index, table in enumerate(self.tables, start=1):
-            print(f"Table {index}:")
-            for seat_index, seat in enumerate(table.seats, start=1):
-                status = seat.occupant if not seat.free else "Free"
-                print(f"  Seat {seat_index}: {status}")
-            
-            occupants = [seat.occupant for seat in table.seats if not seat.free]
-            if len(occupants) == 1:
-                print(f"> Note: {occupants[0]} is sitting alone at this table.")
+        print(self.format_layout(), end="")
 
-            print("")
+    def format_layout(self) -> str:
+        """
+        Describe the seating arrangement, table by table, followed by the
+        people not seated.
+
+        :return: The text, one line per seat
+        """
+        store = self.seat_store
+        lines: List[str] = []
+        for position in range(store.table_count):
+            lines.append(f"Table {position + 1}:")
+            start = store.offsets[position]
+            seats = store.occupants[start:start + store.capacities[position]]
+            lines.extend(
+                f"  Seat {seat}: {store.names[occupant_id] if occupant_id != FREE else 'Free'}"
+                for seat, occupant_id in enumerate(seats, start=1)
+            )
+            if store.occupied[position] == 1:
+                lines.append(f"> Note: {store.table_occupants(position)[0]} is sitting alone at this table.")
+            lines.append("")
 
         # Ajoute ceci à la fin pour afficher les personnes non assises
-        unseated = self.get_unseated_people()
-        if unseated:
-            print(">>> The following person(s) are not currently seated:")
-            for name in unseated:
-                print(f" - {name}")
+        if self.unassigned:
+            lines.append(">>> The following person(s) are not currently seated:")
+            lines.extend(f" - {name}" for name in self.unassigned)
+        return "\n".join(lines) + "\n"
 
-    def store(self, filename: str) -> None:
+    def store(self, filename: str, fmt: Optional[str] = None) -> None:
         """
-        Save the current seating plan to a CSV file.
+        Save the current seating plan, one row per seat (free seats included).
+        The format follows the file extension (.csv, .xlsx, .jsonl, .parquet,
+        .arrow), CSV when it is not recognized; see utils.exporters.
 
         :param filename: Output file path
+        :param fmt: Export format, overriding the extension
         """
-        import csv
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Table', 'Seat', 'Occupant'])
-
-            for table_index, table in enumerate(self.tables, start=1):
-                for seat_index, seat in enumerate(table.seats, start=1):
-                    writer.writerow([table_index, seat_index, seat.occupant if not seat.free else "Free"])
+        from utils.exporters import export_seating
+        export_seating(self, filename, fmt)
 
     def seats_left(self) -> int:
         """
@@ -124,59 +299,85 @@ class Openspace:
 
         :return: Number of unoccupied seats
         """
-        return sum(table.left_capacity() for table in self.tables)
+        return self.seat_store.total_capacity - self.seat_store.total_occupied
 
     def is_there_lonely_person(self) -> bool:
         """
         Check if at least one table has exactly one person sitting alone.
         """
-        for table in self.tables:
-            occupied = [seat for seat in table.seats if not seat.free]
-            if len(occupied) == 1:
-                return True
-        return False
+        return 1 in self.seat_store.occupied
 
     # Remove lonely people from tables and redistribute them to other tables    
     # In the 'assign_person', new people are only added to tables that already 
     # have at least one occupant, if possible
-    def eliminate_lonely_tables(self) -> None:
+    def eliminate_lonely_tables(self, moves: Optional[List[Tuple[int, int]]] = None) -> SeatingReport:
         """
         Redistribute individuals sitting alone to other tables with free seats.
-        Ensures no one is left sitting alone.
+        Ensures no one is left sitting alone whenever the room allows it.
+        The moves are planned in one batch from the occupancy counters,
+        see model.redistribution.plan_lonely_moves(); a plan computed
+        elsewhere from the current counters can be passed in. When the room was
+        organized with constraints, a move that would part a whitelisted
+        pair or join a blacklisted one is skipped.
+
+        :return: The moves made and the state of the room after them
         """
-        lonely_tables = []
-        receiving_tables = []
-
-        for table in self.tables:
-            occupied = [seat for seat in table.seats if not seat.free]
-            free = [seat for seat in table.seats if seat.free]
+        with metrics.timer("openspace_lonely_pass_seconds"):
+            moved = self._make_lonely_moves(moves, self.sink)
+        return SeatingReport.of(self, moved)
 
-            if len(occupied) == 1:
-                lonely_tables.append((table, occupied[0]))  # table + lone seat
-            elif len(free) >= 1:
-                receiving_tables.append(table)
-
-        for _, lonely_seat in lonely_tables:
-            lonely_person = lonely_seat.occupant
-
-            for target_table in receiving_tables:
-                for seat in target_table.seats:
-                    if seat.free:
-                        # Reassign person
-                        seat.occupant = lonely_person
-                        seat.free = False
-
-                        # Free old seat
-                        lonely_seat.occupant = None
-                        lonely_seat.free = True
+    def _make_lonely_moves(self, moves: Optional[List[Tuple[int, int]]],
+                           sink: Optional[EventSink]) -> List[Tuple[str, int, int]]:
+        """
+        Carry out lonely-table moves (planned here when `moves` is None).
+        A move that would break a constraint is skipped, and whoever it left
+        alone gets company move by move instead.
 
-                        print(f"{lonely_person} was moved from a lonely table to a new table.")
-                        break
-                else:
-                    continue
-                break
+        :return: The moves made, as (name, table left, table joined) numbered from 1
+        """
+        moved: List[Tuple[str, int, int]] = []
+        store = self.seat_store
+        if moves is None:
+            moves = plan_lonely_moves(store.occupied, store.capacities)
+        skipped = False
+        for source, target in moves:
+            was_lonely = store.occupied[source] == 1
+            seats = store.occupied_seats(source)
+            seat = self._movable_seat(source, target, seats) if self.constraints else seats[-1]
+            if seat is None:
+                metrics.inc("openspace_lonely_moves_skipped_total")
+                skipped = True
+                continue
+            person = self.tables[source]._release(seat)
+            self.tables[target].assign_seat(person)
+            moved.append((person, source + 1, target + 1))
+
+            metrics.inc("openspace_lonely_moves_total", reason="lonely" if was_lonely else "join")
+            if sink is not None:
+                sink(Event("moved_from_lonely" if was_lonely else "moved_to_join", name=person))
+        if skipped:
+            # The plan only sees counts: for whom a wish kept alone, look
+            # for company that respects the wishes, table by table
+            planned = len(moved)
+            self._settle_lonely(store.lonely_tables()[::-1], {"moved": moved})
+            if sink is not None:
+                for person, source, _ in moved[planned:]:
+                    left_alone = store.occupied[source - 1] == 0
+                    sink(Event("moved_from_lonely" if left_alone else "moved_to_join", name=person))
+        return moved
+
+    def _movable_seat(self, source: int, target: int, seats: List[int]) -> Optional[int]:
+        """
+        Pick a seat of table `source` whose occupant may move to table
+        `target` without breaking a constraint, last seats first.
+        """
+        leaving = self.seat_store.table_occupants(source)
+        joining = self.seat_store.table_occupants(target)
+        for seat in reversed(seats):
+            if self.constraints.can_move(self.seat_store.occupant(source, seat), leaving, joining):
+                return seat
+        return None
 
-    
     def assign_person(self, name: str) -> bool:
         """
         Assign a person to a non-empty table with free seats if possible.
@@ -185,38 +386,232 @@ class Openspace:
         :param name: The name of the person to assign
         :return: True if assigned, False otherwise
         """
-        preferred_tables = []
-        fallback_tables = []
+        # Tables with occupants and free seats come straight from the index
+        table = next(iter(self._partial_tables), None)
+        if table is not None:
+            return table.assign_seat(name)
+        return False
 
-        for table in self.tables:
-            if table.has_free_spot():
-                occupied_count = sum(1 for seat in table.seats if not seat.free)
-                if occupied_count >= 1:
-                    preferred_tables.append(table)
-                else:
-                    fallback_tables.append(table)
+    def apply_delta(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> Dict[str, List]:
+        """
+        Update the seating for people who arrived or left, touching only the
+        tables the change affects instead of reorganizing the room.
+
+        1. People who left free their seats, which go first to people
+           waiting in the unassigned list (as many as seats were freed).
+        2. Newcomers first keep company to someone a departure left alone,
+           then join tables that already have people, then fill empty tables
+           (never leaving a single newcomer for the last one when avoidable).
+        3. Whoever is still alone at an affected table gets company from
+           the unassigned list if anyone there is waiting, or moves: to
+           another such table, else to a table with people and room; failing
+           that, someone sitting alone elsewhere or from a table of three or
+           more comes over, or else a pair joins them to make a group of
+           three, at their table or at an empty one with room for it.
+
+        Moves respect the seating wishes of the last organize(). The work
+        follows the size of the change; only the last resort of step 3 looks
+        through the tables for someone who can move.
+
+        :param added: Names of the people who arrived
+        :param removed: Names of the people who left
+        :return: {"seated": people given a seat, "unassigned": newcomers without one,
+                  "moved": [(name, from table, to table)], tables numbered from 1}
+        """
+        store = self.seat_store
+        report: Dict[str, List] = {"seated": [], "unassigned": [], "moved": []}
+
+        # 1. Departures; tables they leave with one person are affected
+        affected: Dict[int, None] = {}
+        freed = 0
+        for name in removed:
+            location = store.locate(name)
+            while location is not None:
+                self.tables[location[0]]._release(location[1])
+                affected[location[0]] = None
+                freed += 1
+                location = store.locate(name)
+            self.unassigned.discard(name)
+        lonely = [position for position in affected if store.occupied[position] == 1]
+
+        # 2. Arrivals, after the people who were waiting for a seat
+        arrivals = list(itertools.islice(self.unassigned, freed))
+        arrivals += [name for name in dict.fromkeys(added) if not store.is_seated(name) and name not in arrivals]
+        waiting = arrivals[::-1]
+        still_alone = []
+        for position in lonely:
+            if waiting and store.occupied[position] == 1 and store.capacities[position] >= 2:
+                self.tables[position].assign_seat(waiting.pop())
+            else:
+                still_alone.append(position)
+        lonely = still_alone
+        while waiting and self._partial_tables:
+            next(iter(self._partial_tables)).assign_seat(waiting.pop())
+        while waiting and self._empty_tables:
+            # Single-seat tables last: whoever sits there is alone. Three
+            # people go to a table of three or more rather than 2 + 1.
+            smallest = 3 if len(waiting) == 3 else 2
+            table = next((table for table in self._empty_tables if table.capacity >= smallest), None)
+            table = table or next((table for table in self._empty_tables if table.capacity >= 2), None)
+            table = table or next(iter(self._empty_tables))
+            count = min(len(waiting), table.capacity)
+            if len(waiting) - count == 1 and count > 2 and any(
+                    other is not table and other.capacity >= 2 for other in self._empty_tables):
+                count -= 1  # leave two people for the next table rather than one
+            for _ in range(count):
+                table.assign_seat(waiting.pop())
+            if count == 1:
+                lonely.append(table.position)
+        report["seated"] = [name for name in arrivals if store.is_seated(name)]
+        for name in reversed(waiting):
+            if name not in self.unassigned:
+                self.unassigned.append(name)
+                report["unassigned"].append(name)
 
-        for table in preferred_tables:
-            if table.assign_seat(name):
-                return True
+        # 3. Whoever is still alone at an affected table
+        self._settle_lonely(lonely, report)
+        report["unassigned"] = [name for name in report["unassigned"] if not store.is_seated(name)]
+        return report
 
-        for table in fallback_tables:
-            self.to_group.append(name)
-            return False
+    def _settle_lonely(self, lonely: List[int], report: Dict[str, List]) -> None:
+        """
+        Give company to the people alone at the `lonely` table positions,
+        one table at a time and within the seating wishes (step 3 of
+        apply_delta()); the moves, and the people seated from the unassigned
+        list, are recorded in `report`.
+        """
+        store = self.seat_store
+        while lonely:
+            position = lonely.pop()
+            if store.occupied[position] != 1:
+                continue
+            name = store.table_occupants(position)[0]
+            newcomer = self._waiting_for(position)
+            if newcomer is not None:
+                # Someone still waiting takes the seat before anyone seated moves
+                self.unassigned.discard(newcomer)
+                self.tables[position].assign_seat(newcomer)
+                report.setdefault("seated", []).append(newcomer)
+                continue
+            target = self._company_for(name, position, lonely)
+            if target is not None:
+                self._move(name, position, target, report)
+                continue
+            donor = self._donor_for(position)
+            if donor is not None:
+                self._move(donor[0], donor[1], position, report)
+                continue
+            pair = self._pair_for(position)
+            if pair is not None:
+                pair, target = pair
+                if target != position:
+                    self._move(name, position, target, report)
+                for other in store.table_occupants(pair):
+                    self._move(other, pair, target, report)
+
+    def _allowed(self, name: str, source: int, target: int) -> bool:
+        """
+        Check that moving `name` between two tables keeps the seating wishes.
+        """
+        if not self.constraints:
+            return True
+        store = self.seat_store
+        return self.constraints.can_move(name, store.table_occupants(source), store.table_occupants(target))
 
-        return False
+    def _company_for(self, name: str, position: int, lonely: List[int]) -> Optional[int]:
+        """
+        Find a table where the person alone at `position` can join someone:
+        another table of the delta left with one person, else any table with
+        people and a free seat.
+        """
+        store = self.seat_store
+        while lonely and store.occupied[lonely[-1]] != 1:
+            lonely.pop()
+        if lonely and store.capacities[lonely[-1]] >= 2 and self._allowed(name, position, lonely[-1]):
+            return lonely.pop()
+        for table in self._partial_tables:
+            if table.position != position and self._allowed(name, position, table.position):
+                return table.position
+        return None
+
+    def _waiting_for(self, position: int) -> Optional[str]:
+        """
+        Find someone of the unassigned list who can sit at the table at
+        `position`, first come first served.
+        """
+        store = self.seat_store
+        if store.occupied[position] >= store.capacities[position]:
+            return None
+        occupants = store.table_occupants(position)
+        for name in self.unassigned:
+            if not self.constraints or self.constraints.can_move(name, (), occupants):
+                return name
+        return None
+
+    def _donor_for(self, position: int) -> Optional[Tuple[str, int]]:
+        """
+        Find someone who can join the table at `position`: a person sitting
+        alone elsewhere (both stop being alone) or one from a table of three or more.
+
+        :return: (name, table position) or None
+        """
+        store = self.seat_store
+        if store.capacities[position] < 2:
+            return None
+        for donor, occupied in enumerate(store.occupied):
+            if (occupied >= 3 or occupied == 1) and donor != position:
+                for name in store.table_occupants(donor):
+                    if self._allowed(name, donor, position):
+                        return name, donor
+        return None
+
+    def _pair_for(self, position: int) -> Optional[Tuple[int, int]]:
+        """
+        Find a table of two people who can make a group of three with the
+        person alone at `position`: at that table when it has two free seats,
+        otherwise at an empty table of three seats or more.
+
+        :return: (table of the pair, table of the group) or None
+        """
+        store = self.seat_store
+        if store.capacities[position] - store.occupied[position] >= 2:
+            target = position
+        else:
+            target = next((table.position for table in self._empty_tables if table.capacity >= 3), None)
+            if target is None:
+                return None
+        alone = store.table_occupants(position)
+        for pair, occupied in enumerate(store.occupied):
+            if occupied == 2 and pair != position:
+                names = store.table_occupants(pair)
+                # The two move together, and meet the person alone wherever the group sits
+                if not self.constraints or all(self.constraints.can_move(name, (), alone) for name in names):
+                    return pair, target
+        return None
+
+    def _move(self, name: str, source: int, target: int, report: Dict[str, List]) -> None:
+        """
+        Move `name` from one table to another and record it in `report`.
+        """
+        self._seat_at_table(source, name).remove_occupant()
+        self.tables[target].assign_seat(name)
+        report["moved"].append((name, source + 1, target + 1))
+
+    def _emit(self, kind: str, **data: object) -> None:
+        """
+        Send an event to the sink of the room, if it has one.
+        """
+        if self.sink is not None:
+            self.sink(Event(kind, **data))
 
-    
     def add_table(self, capacity: int) -> None:
         """
         Add a new table with the specified capacity.
         Does not automatically assign any unseated people.
         """
-        from model.table import Table
-        new_table = Table(capacity)
-        self.tables.append(new_table)
+        self._attach_table(capacity)
         self.number_of_tables += 1
-        print(f"New table with {capacity} seats added. No one has been assigned automatically.")
+        self._emit("table_added", capacity=capacity)
 
 
     def remove_table(self, index: int) -> bool:
@@ -228,18 +623,32 @@ class Openspace:
         """
         if 1 <= index <= len(self.tables):
             table = self.tables[index - 1]
-            if all(seat.free for seat in table.seats):
+            if table.occupied == 0:
+                table._detach()
+                self.seat_store.remove_table(index - 1)
                 del self.tables[index - 1]
+                self._empty_tables.pop(table, None)
+                for position in range(index - 1, len(self.tables)):
+                    self.tables[position].position = position
                 self.number_of_tables -= 1
-                print(f"Table {index} has been removed.")
+                self._emit("table_removed", table=index)
                 return True
             else:
-                print(f"Table {index} is not empty and cannot be removed.")
+                self._emit("table_not_empty", table=index)
                 return False
         else:
-            print(f"Invalid table number: {index}")
+            self._emit("invalid_table", table=index)
             return False
 
+    def locate(self, name: str) -> Optional[Tuple[int, int]]:
+        """
+        Find where a person is seated.
+
+        :param name: Name of the person
+        :return: (table position, seat position), both 0-based, or None if not seated
+        """
+        return self.seat_store.locate(name)
+
     def remove_person_from_table(self, table_index: int, name: str) -> bool:
         """
         Remove a person from a specific table.
@@ -249,17 +658,17 @@ class Openspace:
         :return: True if removed successfully, False if not found or invalid table
         """
         if 1 <= table_index <= len(self.tables):
-            table = self.tables[table_index - 1]
-            for seat in table.seats:
-                if seat.occupant == name:
-                    seat.remove_occupant()
+            seat = self._seat_at_table(table_index - 1, name)
+            if seat is not None:
+                seat.remove_occupant()
+                if not self.seat_store.is_seated(name):
                     self.unassigned.append(name)
-                    print(f"{name} has been removed from Table {table_index}.")
-                    return True
-            print(f"{name} not found at Table {table_index}.")
+                self._emit("removed_from_table", name=name, table=table_index)
+                return True
+            self._emit("not_at_table", name=name, table=table_index)
             return False
         else:
-            print(f"Invalid table number: {table_index}")
+            self._emit("invalid_table", table=table_index)
             return False
         
     def remove_person_from_room(self, name: str) -> bool:
@@ -270,17 +679,17 @@ class Openspace:
         :return: True if the person was removed, False otherwise
         """        
         #1. Frtst check if they are seated at a table
-        for table in self.tables:
-            for seat in table.seats:
-                if seat.occupant == name:
-                    seat.remove_occupant()
-                    print(f"{name} has been removed from their seat.")
-                    return True
+        located = self.seat_store.locate(name)
+        if located is not None:
+            table_position, seat_position = located
+            self.tables[table_position].seats[seat_position].remove_occupant()
+            self._emit("removed_from_seat", name=name)
+            return True
 
         # 2. Then, check if they are in the unassigned list
         if name in self.unassigned:
             self.unassigned.remove(name)
-            print(f"{name} was not seated but has been removed from the room.")
+            self._emit("removed_unassigned", name=name)
             return True
 
         return False  # Not faund in either case
@@ -289,23 +698,31 @@ class Openspace:
         """
         Return a list of all people not seated at any table.
         """
-        seated = {seat.occupant for table in self.tables for seat in table.seats if seat.occupant}
-        all = set(seated).union(set(self.unassigned))  # inclut ceux encore en self.unassigned
-        return list(set(self.unassigned + [name for name in seated if not self.is_person_seated(name)]))
+        # The pool never holds seated people: taking a seat discards the name
+        return list(self.unassigned)
 
     def is_person_seated(self, name: str) -> bool:
         """
         Check if a person is currently seated at a table.
         """
-        for table in self.tables:
-            for seat in table.seats:
-                if seat.occupant == name:
-                    return True
-        return False
+        return self.seat_store.is_seated(name)
+
+    def _seat_at_table(self, table_position: int, name: str) -> Optional[Seat]:
+        """
+        Return the seat held by `name` at the given table, if any.
+        """
+        located = self.seat_store.locate(name)
+        if located is not None and located[0] == table_position:
+            return self.tables[table_position].seats[located[1]]
+        if self.seat_store.has_extra_seats(name):
+            for seat in self.tables[table_position].seats:
+                if not seat.free and seat.occupant == name:
+                    return seat
+        return None
 
     def total_people_in_room(self) -> int:
-        seated = {seat.occupant for table in self.tables for seat in table.seats if seat.occupant}
-        return len(seated.union(self.unassigned))
+        # Seated and unassigned people are disjoint, see _seat_changed()
+        return self.seat_store.seated_people + len(self.unassigned)
 
     def __str__(self) -> str:
         return f"Openspace with {self.number_of_tables} tables"
@@ -0,0 +1,148 @@
+from collections import deque
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from model.seat_store import VECTORIZE_MIN_TABLES, _numpy
+
+# A move takes one person from the first table position to the second one
+Move = Tuple[int, int]
+
+
+def _classify(occupied: Sequence[int], capacities: Sequence[int]) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Split tables in one pass into lonely tables (exactly one occupant),
+    receiving seats (one entry per free seat of a table seating two or more)
+    and empty tables able to seat two people. Lonely tables come smallest
+    first: people at single-seat tables cannot be joined where they sit, so
+    they get the receiving seats before anyone else.
+
+    :return: (lonely positions, receiving seat positions, empty positions)
+    """
+    np = _numpy() if len(occupied) >= VECTORIZE_MIN_TABLES else None
+    if np is not None:
+        counts = np.asarray(occupied, dtype=np.intc)
+        sizes = np.asarray(capacities, dtype=np.intc)
+        free = sizes - counts
+        receiving = np.flatnonzero((counts >= 2) & (free > 0))
+        # Prefix-sum expansion: each receiving table appears once per free seat
+        seats = np.repeat(receiving, free[receiving])
+        lonely = np.flatnonzero(counts == 1)
+        lonely = lonely[np.argsort(sizes[lonely], kind="stable")]
+        return (
+            lonely.tolist(),
+            seats.tolist(),
+            np.flatnonzero((counts == 0) & (sizes >= 2)).tolist(),
+        )
+
+    lonely: List[int] = []
+    seats: List[int] = []
+    empty: List[int] = []
+    for position, (count, capacity) in enumerate(zip(occupied, capacities)):
+        if count == 1:
+            lonely.append(position)
+        elif count >= 2:
+            seats.extend(repeat(position, capacity - count))
+        elif capacity >= 2:
+            empty.append(position)
+    lonely.sort(key=lambda position: capacities[position])
+    return lonely, seats, empty
+
+
+def plan_lonely_moves(occupied: Sequence[int], capacities: Sequence[int]) -> List[Move]:
+    """
+    Compute the moves that remove lonely tables, from occupancy counts only.
+
+    1. Lonely people take the free seats of tables already seating two or
+       more, matched in order against the expanded list of receiving seats.
+    2. People still alone are grouped: a lonely table with room receives
+       one (or two, for an odd count) of the others; without such a table,
+       they move together to an empty table.
+    3. Anyone still alone joins a group from step 2 that has room, gets
+       company from a table seating three or more, or takes over the move
+       of someone placed in step 1 (joining them where they sat, or both
+       moving to an empty table).
+
+    Lonely people the previous first-fit pass could place are placed here
+    too, so the result never has more lonely people than before.
+
+    :param occupied: Occupied seats per table
+    :param capacities: Seats per table
+    :return: Moves as (from table position, to table position)
+    """
+    lonely, seats, empty = _classify(occupied, capacities)
+    moves: List[Move] = list(zip(lonely, seats))
+    if len(lonely) <= len(seats):
+        return moves
+
+    # Step 2: group the people still alone, largest tables first as hosts
+    by_size = lambda position: capacities[position]
+    remaining = deque(sorted(lonely[len(seats):], key=by_size, reverse=True))
+    empty = deque(sorted(empty, key=by_size, reverse=True))
+    groups: List[List[int]] = []  # [table, people seated] for step 3
+    while len(remaining) >= 2:
+        group = 3 if len(remaining) % 2 else 2
+        if capacities[remaining[0]] >= group:
+            host = remaining.popleft()
+            for _ in range(group - 1):
+                moves.append((remaining.pop(), host))
+            groups.append([host, group])
+        elif empty and capacities[empty[0]] >= group:
+            table = empty.popleft()
+            for _ in range(group):
+                moves.append((remaining.pop(), table))
+            groups.append([table, group])
+        elif capacities[remaining[0]] >= 2:
+            # No table fits a trio: pair up and leave the odd one to step 3
+            host = remaining.popleft()
+            moves.append((remaining.pop(), host))
+            groups.append([host, 2])
+        elif group == 3 and empty:
+            table = empty.popleft()
+            for _ in range(2):
+                moves.append((remaining.pop(), table))
+            groups.append([table, 2])
+        else:
+            break
+
+    # Step 3: whoever is still alone
+    placed_in_step_one = min(len(lonely), len(seats))
+    for person in remaining:
+        group = next((group for group in groups if capacities[group[0]] > group[1]), None)
+        if group is not None:
+            moves.append((person, group[0]))
+            group[1] += 1
+            continue
+        donor = _find_donor(occupied, moves)
+        if donor is not None and capacities[person] >= 2:
+            moves.append((donor, person))
+        elif donor is not None and empty:
+            table = empty.popleft()
+            moves.extend([(person, table), (donor, table)])
+        elif placed_in_step_one:
+            # Undo a step-1 move: that person stays put and gets company,
+            # or both go to an empty table
+            placed_in_step_one -= 1
+            other, _ = moves[placed_in_step_one]
+            if capacities[other] >= 2:
+                moves[placed_in_step_one] = (person, other)
+            elif empty:
+                table = empty.popleft()
+                moves[placed_in_step_one] = (other, table)
+                moves.append((person, table))
+            else:
+                placed_in_step_one += 1
+    return moves
+
+
+def _find_donor(occupied: Sequence[int], moves: List[Move]) -> Optional[int]:
+    """
+    Find a table that still seats three or more people once `moves` are applied.
+    """
+    delta: Dict[int, int] = {}
+    for source, target in moves:
+        delta[source] = delta.get(source, 0) - 1
+        delta[target] = delta.get(target, 0) + 1
+    for position, count in enumerate(occupied):
+        if count + delta.get(position, 0) >= 3:
+            return position
+    return None
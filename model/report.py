@@ -0,0 +1,132 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Messages of the events a room emits, by kind. An event is only turned into
+# text when a sink formats it, so a room without a sink never builds them.
+MESSAGES: Dict[str, str] = {
+    "moved_from_lonely": "{name} was moved from a lonely table to a new table.",
+    "moved_to_join": "{name} was moved to join someone sitting alone.",
+    "table_added": "New table with {capacity} seats added. No one has been assigned automatically.",
+    "table_removed": "Table {table} has been removed.",
+    "table_not_empty": "Table {table} is not empty and cannot be removed.",
+    "invalid_table": "Invalid table number: {table}",
+    "removed_from_table": "{name} has been removed from Table {table}.",
+    "not_at_table": "{name} not found at Table {table}.",
+    "removed_from_seat": "{name} has been removed from their seat.",
+    "removed_unassigned": "{name} was not seated but has been removed from the room.",
+}
+
+
+class Event:
+    """
+    Something a room did, e.g. Event("table_removed", table=3). str(event)
+    gives the message of its kind (see MESSAGES).
+    """
+
+    __slots__ = ("kind", "data")
+
+    def __init__(self, kind: str, **data: object) -> None:
+        self.kind: str = kind
+        self.data: Dict[str, object] = data
+
+    def __str__(self) -> str:
+        return MESSAGES[self.kind].format(**self.data)
+
+    def __repr__(self) -> str:
+        return f"Event({self.kind!r}, {self.data!r})"
+
+
+# Receives the events of a room, see Openspace.sink
+EventSink = Callable[[Event], None]
+
+
+class SeatingReport:
+    """
+    Outcome of a seating run (Openspace.organize(), eliminate_lonely_tables()):
+    who sits alone, who got no seat, who was moved, the free seats and the
+    seating wishes that could not be met. Nothing is formatted until
+    lines() or render() is called.
+    """
+
+    def __init__(
+        self,
+        sat_alone: Iterable[str] = (),
+        unassigned: Iterable[str] = (),
+        free_seats: int = 0,
+        violations: Iterable[str] = (),
+        moves: Iterable[Tuple[str, int, int]] = (),
+        place: str = "room",
+    ) -> None:
+        self.sat_alone: List[str] = list(sat_alone)
+        self.unassigned: List[str] = list(unassigned)
+        self.free_seats: int = free_seats
+        self.violations: List[str] = list(violations)
+        # (name, table left, table joined), tables numbered from 1 as in Openspace.apply_delta()
+        self.moves: List[Tuple[str, int, int]] = list(moves)
+        self.place: str = place
+
+    @classmethod
+    def of(cls, room, moves: Iterable[Tuple[str, int, int]] = ()) -> "SeatingReport":
+        """
+        Report the current state of an Openspace, after the given moves.
+        """
+        store = room.seat_store
+        return cls(
+            sat_alone=[store.table_occupants(position)[0] for position in store.lonely_tables()],
+            unassigned=room.unassigned,
+            free_seats=room.seats_left(),
+            violations=room.constraint_violations,
+            moves=moves,
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "sat_alone": self.sat_alone,
+            "unassigned": self.unassigned,
+            "free_seats": self.free_seats,
+            "violations": self.violations,
+            "moves": self.moves,
+        }
+
+    def lines(self, details: bool = True) -> List[str]:
+        """
+        Describe the report, one line per person when `details` is True,
+        with counts only otherwise.
+        """
+        lines: List[str] = []
+        if self.moves:
+            if details:
+                lines.extend(f"{name} moved from table {source} to table {target}."
+                             for name, source, target in self.moves)
+            else:
+                lines.append(f">>> {len(self.moves)} people moved to another table.")
+        if not self.sat_alone:
+            lines.append(">>> No lonely persons detected.")
+        elif details:
+            lines.append(">>> The following people had to sit alone (no other option):")
+            lines.extend(f" - {name}" for name in self.sat_alone)
+        else:
+            lines.append(f">>> {len(self.sat_alone)} people had to sit alone (no other option).")
+        lines.append(f">>> {self.free_seats} seat{'s' if self.free_seats != 1 else ''} left in the {self.place}.")
+        if self.unassigned:
+            if details:
+                lines.append(">>> Could not assign the following people (no available seats):")
+                lines.extend(f" - {name}" for name in self.unassigned)
+            else:
+                lines.append(f">>> Could not assign {len(self.unassigned)} people (no available seats).")
+        if self.violations:
+            if details:
+                lines.append(">>> The following seating wishes could not be met:")
+                lines.extend(f" - {violation}" for violation in self.violations)
+            else:
+                lines.append(f">>> {len(self.violations)} seating wishes could not be met.")
+        return lines
+
+    def render(self, details: bool = True) -> str:
+        """
+        The report as one block of text, ready for a single write.
+        """
+        return "\n".join(self.lines(details)) + "\n"
+
+    def __str__(self) -> str:
+        return (f"{len(self.moves)} moved, {len(self.sat_alone)} alone, "
+                f"{len(self.unassigned)} unassigned, {self.free_seats} free seats")
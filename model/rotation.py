@@ -0,0 +1,246 @@
+import random
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from model.openspace import Openspace
+from model.seat_store import SeatStore, _numpy
+from model.strategies import get_strategy
+
+# Largest count a pair history entry holds (unsigned 16 bits)
+MAX_COUNT: int = 0xFFFF
+
+
+class PairHistory:
+    """
+    How many days each pair of people shared a table.
+
+    Counts live in one triangular array of unsigned 16-bit integers: the
+    pair (i, j) with i < j is stored at j * (j - 1) / 2 + i, so n people
+    take n * (n - 1) bytes (25 MB for 5k people), whatever the number of days.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.counts = array("H", bytes(2 * (size * (size - 1) // 2)))
+
+    @staticmethod
+    def _index(person: int, other: int) -> int:
+        if person > other:
+            person, other = other, person
+        return other * (other - 1) // 2 + person
+
+    def count(self, person: int, other: int) -> int:
+        """
+        Return how many days two people shared a table.
+        """
+        return self.counts[self._index(person, other)] if person != other else 0
+
+    def cost(self, person: int, members: Iterable[int]) -> int:
+        """
+        Return how many times `person` already sat with each of `members`, summed.
+        """
+        counts = self.counts
+        total = 0
+        for other in members:
+            if other != person:
+                low, high = (person, other) if person < other else (other, person)
+                total += counts[high * (high - 1) // 2 + low]
+        return total
+
+    def record_table(self, members: Sequence[int]) -> int:
+        """
+        Count one more day together for every pair of a table.
+
+        :param members: People seated at the table
+        :return: Number of those pairs who had already shared a table
+        """
+        counts = self.counts
+        repeats = 0
+        for index, person in enumerate(members):
+            for other in members[index + 1:]:
+                slot = self._index(person, other)
+                if counts[slot]:
+                    repeats += 1
+                if counts[slot] < MAX_COUNT:
+                    counts[slot] += 1
+        return repeats
+
+    def repeated_pairs(self) -> int:
+        """
+        Return the number of pairs who shared a table on more than one day.
+        """
+        np = _numpy()
+        if np is not None:
+            return int(np.count_nonzero(np.frombuffer(self.counts, dtype=np.uint16) > 1))
+        return sum(1 for count in self.counts if count > 1)
+
+    def nbytes(self) -> int:
+        """
+        Return the size of the count array in bytes.
+        """
+        return len(self.counts) * self.counts.itemsize
+
+
+class RotationPlanner:
+    """
+    Plan one seating per day so that colleagues keep meeting new people.
+
+    Each day starts from a random seating, with as many people per table as
+    the 'packing' strategy plans (nobody alone), then a repair pass looks at
+    everyone who already sat with someone at their table and tries a few
+    random swaps with people at other tables, keeping the first that lowers
+    the number of repeated pairs. Costs come from the pair history, which
+    is updated once the day is fixed, so planning day N + 1 only builds on
+    the history and never revisits days 1..N.
+
+    When there are more people than seats, those who rested the most days
+    are seated first.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        capacities: Sequence[int],
+        seed: Union[int, random.Random, None] = None,
+        attempts: int = 24,
+        passes: int = 2,
+    ) -> None:
+        """
+        :param names: People to seat every day (each name once)
+        :param capacities: Seats of each table
+        :param seed: Integer seed or random.Random instance; None for a fresh plan
+        :param attempts: Random swaps tried per person with a repeated pair
+        :param passes: Repair passes over the room per day
+        """
+        self.names: List[str] = list(names)
+        self.capacities: List[int] = list(capacities)
+        self.rng = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self.attempts: int = attempts
+        self.passes: int = passes
+        self.history = PairHistory(len(self.names))
+        self.rested = array("i", bytes(4 * len(self.names)))  # days spent without a seat
+
+        seated = min(len(self.names), sum(self.capacities))
+        self.per_table: List[int] = get_strategy("packing").allocate(
+            seated, [0] * len(self.capacities), self.capacities
+        )
+        # Person ids of each day, table after table, then the people resting
+        self.days: List[array] = []
+        # (pairs seated together, pairs who had already met) per day
+        self.stats: List[Tuple[int, int]] = []
+
+    def next_day(self) -> List[List[str]]:
+        """
+        Plan the next day and add it to the history.
+
+        :return: Names seated at each table
+        """
+        rng = self.rng
+        people = list(range(len(self.names)))
+        rng.shuffle(people)
+        seated_count = sum(self.per_table)
+        if seated_count < len(people):
+            people.sort(key=lambda person: self.rested[person], reverse=True)
+            for person in people[seated_count:]:
+                self.rested[person] += 1
+
+        tables: List[List[int]] = []
+        table_of = [-1] * len(people)
+        start = 0
+        for position, count in enumerate(self.per_table):
+            members = people[start:start + count]
+            for person in members:
+                table_of[person] = position
+            tables.append(members)
+            start += count
+
+        for _ in range(self.passes):
+            if not self._repair(tables, table_of, people[:seated_count]):
+                break
+
+        pairs = repeats = 0
+        for members in tables:
+            pairs += len(members) * (len(members) - 1) // 2
+            repeats += self.history.record_table(members)
+        self.stats.append((pairs, repeats))
+        self.days.append(array("i", [person for members in tables for person in members] + people[seated_count:]))
+        return [[self.names[person] for person in members] for members in tables]
+
+    def _repair(self, tables: List[List[int]], table_of: List[int], seated: List[int]) -> int:
+        """
+        Try swaps for everyone seated with someone they already met.
+
+        :return: Number of swaps made
+        """
+        if not seated:
+            return 0
+        history, rng = self.history, self.rng
+        swaps = 0
+        for position, members in enumerate(tables):
+            for index in range(len(members)):
+                person = members[index]
+                here = history.cost(person, members)
+                if not here:
+                    continue
+                for _ in range(self.attempts):
+                    other = seated[rng.randrange(len(seated))]
+                    other_position = table_of[other]
+                    if other_position == position:
+                        continue
+                    there = tables[other_position]
+                    met = history.count(person, other)
+                    before = here + history.cost(other, there)
+                    after = history.cost(person, there) - met + history.cost(other, members) - met
+                    if after < before:
+                        members[index] = other
+                        there[there.index(other)] = person
+                        table_of[person], table_of[other] = other_position, position
+                        swaps += 1
+                        break
+        return swaps
+
+    def plan(self, days: int) -> List[List[List[str]]]:
+        """
+        Plan `days` more days.
+
+        :return: For each new day, the names seated at each table
+        """
+        return [self.next_day() for _ in range(days)]
+
+    def layout(self, day: int) -> List[List[str]]:
+        """
+        Return the names seated at each table on a planned day (0 = first day).
+        """
+        ids = self.days[day]
+        layout = []
+        start = 0
+        for count in self.per_table:
+            layout.append([self.names[person] for person in ids[start:start + count]])
+            start += count
+        return layout
+
+    def resting(self, day: int) -> List[str]:
+        """
+        Return the people without a seat on a planned day.
+        """
+        return [self.names[person] for person in self.days[day][sum(self.per_table):]]
+
+    def to_room(self, day: int) -> Openspace:
+        """
+        Build an Openspace seated as on a planned day.
+        """
+        store = SeatStore()
+        for capacity, names in zip(self.capacities, self.layout(day)):
+            position = store.add_table(capacity)
+            for seat, name in enumerate(names):
+                store.take(position, seat, name)
+        return Openspace.from_store(store, self.resting(day))
+
+    def repeat_rate(self, day: Optional[int] = None) -> float:
+        """
+        Share of the pairs seated together who had already met, on one day
+        or over every planned day.
+        """
+        stats = self.stats if day is None else [self.stats[day]]
+        pairs = sum(pair_count for pair_count, _ in stats)
+        return sum(repeats for _, repeats in stats) / pairs if pairs else 0.0
@@ -0,0 +1,158 @@
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from model.constraints import PairConstraints
+from model.openspace import Openspace
+from model.seat_store import SeatStore
+from model.strategies import SeatingStrategy
+
+# (unseated people, broken wishes, lonely tables, imbalance): lower is better
+Score = Tuple[int, int, int, int]
+
+# Roster, table capacities, strategy and constraints shared by the variants
+# of one search; set once per worker process by _init_worker()
+_job: Optional[Tuple[List[str], List[int], Union[str, SeatingStrategy, None], Optional[PairConstraints]]] = None
+
+
+def score_layout(room: Openspace) -> Score:
+    """
+    Score a seated room, lower being better: people left without a seat,
+    then broken seating wishes, then lonely tables, then how far table
+    fill rates are from the room average (sum of squared deviations,
+    scaled to integers).
+
+    :param room: Room to score
+    :return: Score tuple, compared lexicographically
+    """
+    store = room.seat_store
+    total_capacity, total_occupied = store.total_capacity, store.total_occupied
+    imbalance = sum(
+        (occupied * total_capacity - capacity * total_occupied) ** 2
+        for occupied, capacity in zip(store.occupied, store.capacities)
+    )
+    broken = 0
+    if room.constraints:
+        table_of = {}
+        for pairs in (room.constraints.together, room.constraints.apart):
+            for pair in pairs:
+                for name in pair:
+                    if name not in table_of:
+                        location = store.locate(name)
+                        table_of[name] = location[0] if location else None
+        broken += sum(
+            1 for name, other in room.constraints.apart
+            if table_of[name] is not None and table_of[name] == table_of[other]
+        )
+        broken += sum(
+            1 for name, other in room.constraints.together
+            if table_of[name] is not None and table_of[other] is not None and table_of[name] != table_of[other]
+        )
+    return len(room.unassigned), broken, len(store.lonely_tables()), imbalance
+
+
+def _init_worker(names, capacities, strategy, constraints) -> None:
+    """
+    Receive the search inputs once per worker process instead of once per variant.
+    """
+    global _job
+    _job = (names, capacities, strategy, constraints)
+
+
+def _organize_variant(names, capacities, strategy, constraints, seed: int) -> Openspace:
+    """
+    Organize the room of one seeded variant.
+    """
+    store = SeatStore()
+    for capacity in capacities:
+        store.add_table(capacity)
+    room = Openspace.from_store(store)
+    room.organize(names, strategy=strategy, seed=seed, constraints=constraints)
+    return room
+
+
+def _run_variant(seed: int) -> Tuple[Score, int]:
+    """
+    Organize one seeded variant in a worker and return only its score and
+    seed: organize() gives the same layout for the same seed, so the parent
+    organizes the winner again rather than receiving every layout.
+    """
+    return score_layout(_organize_variant(*_job, seed)), seed
+
+
+def organize_best_of(
+    names: Sequence[str],
+    capacities: Sequence[int],
+    restarts: int = 8,
+    workers: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    strategy: Union[str, SeatingStrategy, None] = None,
+    constraints: Optional[PairConstraints] = None,
+    seed: Optional[int] = None,
+) -> Tuple[Openspace, Dict]:
+    """
+    Organize `restarts` seeded variants of the room, in parallel on a
+    process pool, and keep the best one according to score_layout().
+    Workers send back scores only; the winning seed is organized once more
+    in this process.
+
+    Without constraints, every seed gives the same table counts (strategies
+    only look at counts), so a single variant is organized.
+
+    :param names: People to seat
+    :param capacities: Seats of each table
+    :param restarts: Number of variants to try
+    :param workers: Worker processes; None for one per CPU, 0 or 1 to stay in-process
+    :param time_budget: Seconds after which unfinished variants are dropped
+                        (the first finished one is always waited for); None for no limit
+    :param strategy: Seating strategy of every variant
+    :param constraints: Pairs who want to sit together or apart
+    :param seed: Seed deriving the seeds of the variants; None for fresh ones
+    :return: (best room, report with its score, seed and the variants evaluated)
+    """
+    names, capacities = list(names), list(capacities)
+    rng = random.Random(seed)
+    restarts = max(1, restarts) if constraints else 1
+    seeds = [rng.getrandbits(63) for _ in range(restarts)]
+    workers = min(workers or os.cpu_count() or 1, restarts) if workers != 0 else 1
+
+    start = time.perf_counter()
+    results: List[Tuple[Score, int]] = []
+    rooms: Dict[int, Openspace] = {}  # best room so far, by seed, when organized here
+    if workers <= 1:
+        for variant_seed in seeds:
+            room = _organize_variant(names, capacities, strategy, constraints, variant_seed)
+            score = score_layout(room)
+            if not results or score < min(result[0] for result in results):
+                rooms = {variant_seed: room}
+            results.append((score, variant_seed))
+            if time_budget is not None and time.perf_counter() - start >= time_budget:
+                break
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(names, capacities, strategy, constraints)
+        )
+        try:
+            pending = {executor.submit(_run_variant, variant_seed) for variant_seed in seeds}
+            done, pending = wait(pending, timeout=time_budget)
+            if not done:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            results = [future.result() for future in done]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Ties go to the earliest seed, whatever order the workers finished in
+    order = {variant_seed: index for index, variant_seed in enumerate(seeds)}
+    score, best_seed = min(results, key=lambda result: (result[0], order[result[1]]))
+    room = rooms.get(best_seed) or _organize_variant(names, capacities, strategy, constraints, best_seed)
+    report = {
+        "score": score,
+        "seed": best_seed,
+        "variants": len(results),
+        "restarts": restarts,
+        "workers": workers,
+        "seconds": time.perf_counter() - start,
+    }
+    return room, report
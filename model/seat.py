@@ -1,13 +1,35 @@
-from typing import List
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from model.table import Table
 
 # Note: Both Seat and Table are defined here as per challenge instructions.
 # For better structure, each class should ideally be in its own file.
 
 class Seat:
-    def __init__(self) -> None:
-        # Seat is initially free and unoccupied
-        self.free: bool = True
-        self.occupant: str = ""
+    """
+    View over one seat of a table; the occupant lives in the table's SeatStore.
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: Optional["Table"] = None, index: int = 0) -> None:
+        # A seat created on its own gets a single-seat table to live in
+        if table is None:
+            from model.table import Table
+            table = Table(1)
+        # Table owning this seat (and position in it)
+        self.table = table
+        self.index: int = index
+
+    @property
+    def free(self) -> bool:
+        return self.table.store.occupant_id(self.table.position, self.index) < 0
+
+    @property
+    def occupant(self) -> str:
+        # Seat is free and unoccupied when nobody is stored
+        return self.table.store.occupant(self.table.position, self.index) or ""
 
     def set_occupant(self, name: str) -> bool:
         """
@@ -16,11 +38,7 @@ class Seat:
         :param name: Person to assign
         :return: True if successful, False otherwise
         """
-        if self.free:
-            self.occupant = name
-            self.free = False
-            return True
-        return False
+        return self.table._take(self.index, name)
 
     def remove_occupant(self) -> str:
         """
@@ -28,10 +46,7 @@ class Seat:
 
         :return: Name of the removed occupant
         """
-        name = self.occupant
-        self.occupant = ""
-        self.free = True
-        return name
+        return self.table._release(self.index)
 
     def __str__(self) -> str:
-        return self.occupant if not self.free else "Free"
\ No newline at end of file
+        return self.occupant if not self.free else "Free"
@@ -0,0 +1,306 @@
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+# Occupant id stored in a free seat
+FREE: int = -1
+
+# Below this many tables the pure Python paths beat the cost of going through NumPy
+VECTORIZE_MIN_TABLES: int = 2048
+
+_np = None
+
+
+def _numpy():
+    """
+    Import NumPy on first use so that loading the model stays cheap.
+
+    :return: The numpy module, or None if it is not installed
+    """
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+
+class SeatStore:
+    """
+    Compact storage for every seat of an Openspace.
+
+    Occupants are interned to integer ids and kept in one flat int32 array,
+    with FREE (-1) marking an empty seat. Each table is a slice of that array
+    described by its offset and capacity; a per-table occupied counter and
+    room-wide totals are maintained on every change. Table and Seat objects
+    are thin views over this store.
+
+    The store also indexes where each name sits: `seat_of` maps an occupant
+    id to the slot of a seat it holds (FREE when not seated). A name seated
+    more than once is indexed at one slot, its extra seats counted in
+    `extra_seats`, so lookups stay right after one of them is freed.
+
+    When `journal` is set (see utils.snapshot_store.SnapshotStore), every
+    take, release, add_table and remove_table is reported to it once done.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []          # id -> name
+        self._ids: Dict[str, int] = {}      # name -> id
+        self.occupants = array("i")         # one slot per seat
+        self.offsets = array("i")           # first slot of each table
+        self.capacities = array("i")        # seats per table
+        self.occupied = array("i")          # occupied seats per table
+        self.seat_of = array("i")           # id -> slot of a seat it holds
+        self.extra_seats: Dict[int, int] = {}
+        self.total_capacity: int = 0
+        self.total_occupied: int = 0
+        self.seated_people: int = 0         # distinct names holding a seat
+        self.journal: Any = None            # receives every seat mutation
+
+    def copy(self) -> "SeatStore":
+        """
+        Return an independent copy of the store (array copies, no per-seat work).
+        """
+        clone = SeatStore.__new__(SeatStore)
+        clone.__dict__.update(self.__dict__)
+        clone.names = list(self.names)
+        clone._ids = dict(self._ids)
+        for field in ("occupants", "offsets", "capacities", "occupied", "seat_of"):
+            setattr(clone, field, getattr(self, field)[:])
+        clone.extra_seats = dict(self.extra_seats)
+        clone.journal = None
+        return clone
+
+    def intern(self, name: str) -> int:
+        """
+        Return the id of a name, registering it if needed.
+
+        :param name: Person's name
+        :return: Integer id of the name
+        """
+        occupant_id = self._ids.get(name)
+        if occupant_id is None:
+            occupant_id = len(self.names)
+            self._ids[name] = occupant_id
+            self.names.append(name)
+            self.seat_of.append(FREE)
+        return occupant_id
+
+    @property
+    def table_count(self) -> int:
+        return len(self.capacities)
+
+    def add_table(self, capacity: int) -> int:
+        """
+        Append a table with `capacity` free seats.
+
+        :param capacity: Number of seats
+        :return: Position of the new table
+        :raises ValueError: If `capacity` is negative
+        """
+        if capacity < 0:
+            raise ValueError(f"A table cannot have {capacity} seats.")
+        self.offsets.append(len(self.occupants))
+        self.capacities.append(capacity)
+        self.occupied.append(0)
+        self.occupants.extend(array("i", [FREE]) * capacity)
+        self.total_capacity += capacity
+        if self.journal is not None:
+            self.journal.add_table(capacity)
+        return len(self.capacities) - 1
+
+    def remove_table(self, position: int) -> None:
+        """
+        Delete a table and its seats, shifting the tables after it.
+
+        :param position: Position of the table to remove
+        """
+        start = self.offsets[position]
+        capacity = self.capacities[position]
+        for seat in range(capacity):
+            self._release(position, seat)
+        del self.occupants[start:start + capacity]
+        self.total_capacity -= capacity
+        del self.offsets[position]
+        del self.capacities[position]
+        del self.occupied[position]
+        if capacity:
+            for later in range(position, len(self.offsets)):
+                self.offsets[later] -= capacity
+            self._shift_slots(start, capacity)
+        if self.journal is not None:
+            self.journal.remove_table(position)
+
+    def _shift_slots(self, start: int, removed: int) -> None:
+        """
+        Renumber indexed slots after `removed` seats were deleted at `start`.
+        """
+        np = _numpy() if len(self.seat_of) >= VECTORIZE_MIN_TABLES else None
+        if np is not None:
+            slots = np.frombuffer(self.seat_of, dtype=np.intc)
+            slots[slots >= start] -= removed
+            return
+        for occupant_id, slot in enumerate(self.seat_of):
+            if slot >= start:
+                self.seat_of[occupant_id] = slot - removed
+
+    def occupant_id(self, position: int, seat: int) -> int:
+        """
+        Return the occupant id of a seat, FREE if nobody sits there.
+        """
+        return self.occupants[self.offsets[position] + seat]
+
+    def occupant(self, position: int, seat: int) -> Optional[str]:
+        """
+        Return the name of whoever sits at a seat, None if it is free.
+        """
+        occupant_id = self.occupants[self.offsets[position] + seat]
+        return None if occupant_id == FREE else self.names[occupant_id]
+
+    def first_free_seat(self, position: int) -> Optional[int]:
+        """
+        Return the first free seat of a table, None if the table is full.
+        """
+        if self.occupied[position] >= self.capacities[position]:
+            return None
+        start = self.offsets[position]
+        return self.occupants.index(FREE, start, start + self.capacities[position]) - start
+
+    def take(self, position: int, seat: int, name: str) -> bool:
+        """
+        Seat `name` at a free seat.
+
+        :return: True if the seat was free, False otherwise
+        """
+        slot = self.offsets[position] + seat
+        if self.occupants[slot] != FREE:
+            return False
+        occupant_id = self.intern(name)
+        self.occupants[slot] = occupant_id
+        self.occupied[position] += 1
+        self.total_occupied += 1
+        if self.seat_of[occupant_id] == FREE:
+            self.seat_of[occupant_id] = slot
+            self.seated_people += 1
+        else:
+            self.extra_seats[occupant_id] = self.extra_seats.get(occupant_id, 0) + 1
+        if self.journal is not None:
+            self.journal.take(position, seat, name)
+        return True
+
+    def release(self, position: int, seat: int) -> Optional[str]:
+        """
+        Free a seat.
+
+        :return: Name of the person who left, None if the seat was already free
+        """
+        name = self._release(position, seat)
+        if name is not None and self.journal is not None:
+            self.journal.release(position, seat)
+        return name
+
+    def _release(self, position: int, seat: int) -> Optional[str]:
+        """
+        Free a seat without reporting it to the journal.
+        """
+        slot = self.offsets[position] + seat
+        occupant_id = self.occupants[slot]
+        if occupant_id == FREE:
+            return None
+        self.occupants[slot] = FREE
+        self.occupied[position] -= 1
+        self.total_occupied -= 1
+        self._unindex(occupant_id, slot)
+        return self.names[occupant_id]
+
+    def _unindex(self, occupant_id: int, slot: int) -> None:
+        """
+        Update the name index after `occupant_id` left the seat at `slot`.
+        """
+        extra = self.extra_seats.get(occupant_id, 0)
+        if extra > 1:
+            self.extra_seats[occupant_id] = extra - 1
+        elif extra:
+            del self.extra_seats[occupant_id]
+        if self.seat_of[occupant_id] != slot:
+            return
+        if extra:
+            # Re-index one of the other seats held under the same name
+            self.seat_of[occupant_id] = self._other_slot(occupant_id, slot)
+        else:
+            self.seat_of[occupant_id] = FREE
+            self.seated_people -= 1
+
+    def _other_slot(self, occupant_id: int, slot: int) -> int:
+        """
+        Find a slot held by `occupant_id` other than `slot`.
+        """
+        found = self.occupants.index(occupant_id)
+        if found == slot:
+            found = self.occupants.index(occupant_id, slot + 1)
+        return found
+
+    def is_seated(self, name: str) -> bool:
+        """
+        Check whether `name` holds at least one seat.
+        """
+        occupant_id = self._ids.get(name)
+        return occupant_id is not None and self.seat_of[occupant_id] != FREE
+
+    def has_extra_seats(self, name: str) -> bool:
+        """
+        Check whether `name` holds more than one seat.
+        """
+        return self._ids.get(name) in self.extra_seats
+
+    def locate(self, name: str) -> Optional[Tuple[int, int]]:
+        """
+        Return where `name` is seated, without scanning the seats.
+
+        :return: (table position, seat position) or None if not seated
+        """
+        occupant_id = self._ids.get(name)
+        if occupant_id is None or self.seat_of[occupant_id] == FREE:
+            return None
+        slot = self.seat_of[occupant_id]
+        position = bisect_right(self.offsets, slot) - 1
+        return position, slot - self.offsets[position]
+
+    def occupied_seats(self, position: int) -> List[int]:
+        """
+        Return the indexes of the occupied seats of a table.
+        """
+        start = self.offsets[position]
+        ids = self.occupants[start:start + self.capacities[position]]
+        return [seat for seat, occupant_id in enumerate(ids) if occupant_id != FREE]
+
+    def table_occupants(self, position: int) -> List[str]:
+        """
+        Return the names seated at a table, in seat order.
+        """
+        start = self.offsets[position]
+        ids = self.occupants[start:start + self.capacities[position]]
+        return [self.names[occupant_id] for occupant_id in ids if occupant_id != FREE]
+
+    def lonely_tables(self) -> List[int]:
+        """
+        Return the positions of the tables with exactly one occupant.
+        Uses a vectorized comparison on large rooms when NumPy is available.
+        """
+        np = _numpy() if len(self.occupied) >= VECTORIZE_MIN_TABLES else None
+        if np is not None:
+            counts = np.frombuffer(self.occupied, dtype=np.intc)
+            return np.flatnonzero(counts == 1).tolist()
+        return [position for position, count in enumerate(self.occupied) if count == 1]
+
+    def nbytes(self) -> int:
+        """
+        Return the size of the seat arrays in bytes (names not included).
+        """
+        return sum(
+            len(values) * values.itemsize
+            for values in (self.occupants, self.offsets, self.capacities, self.occupied)
+        )
@@ -0,0 +1,200 @@
+from typing import Dict, List, Sequence, Union
+
+
+class SeatingStrategy:
+    """
+    Decide how many newcomers each table receives.
+
+    Strategies only work on counts: given the number of people to seat and
+    the occupied seats and capacity of every table, allocate() returns how
+    many people go to each table. Openspace.organize() then seats the
+    shuffled names table by table following that plan.
+    """
+
+    name: str = ""
+
+    def allocate(self, count: int, occupied: Sequence[int], capacities: Sequence[int]) -> List[int]:
+        """
+        Plan how many people each table receives.
+
+        :param count: Number of people to seat
+        :param occupied: Occupied seats per table
+        :param capacities: Seats per table
+        :return: Number of newcomers per table (never more than its free seats)
+        """
+        raise NotImplementedError
+
+
+class FirstFitStrategy(SeatingStrategy):
+    """
+    The original heuristic: top up tables that already have someone, then
+    fill empty tables one after the other. Can leave one person alone at
+    the last table.
+    """
+
+    name = "first_fit"
+
+    def allocate(self, count: int, occupied: Sequence[int], capacities: Sequence[int]) -> List[int]:
+        plan = [0] * len(capacities)
+        for wanted_empty in (False, True):
+            for position, capacity in enumerate(capacities):
+                if count == 0:
+                    return plan
+                if (occupied[position] == 0) == wanted_empty:
+                    plan[position] = min(count, capacity - occupied[position])
+                    count -= plan[position]
+        return plan
+
+
+class PackingStrategy(SeatingStrategy):
+    """
+    Linear-time arithmetic packing that plans the table counts up front so
+    that nobody ends up alone (use 'balanced' for a guaranteed minimum on
+    the rare layouts this cannot resolve).
+
+    Tables with exactly one occupant get company first, then the other
+    occupied tables are topped up, then empty tables are filled one after
+    the other. If the last table would get a single person, one person is
+    taken back from a table seating three or more, or the last pair seated
+    at an empty table moves over to make a group of three, at this table or
+    at a later empty one with three seats or more. Single-seat
+    tables are used last, only for people who would otherwise have no seat.
+    """
+
+    name = "packing"
+
+    def allocate(self, count: int, occupied: Sequence[int], capacities: Sequence[int]) -> List[int]:
+        plan = [0] * len(capacities)
+        free = [capacity - taken for capacity, taken in zip(capacities, occupied)]
+        donor = -1  # a table that can give one person back and keep two
+        pair = -1   # an empty table that received exactly two people
+
+        def give(position: int, people: int) -> None:
+            nonlocal count, donor, pair
+            plan[position] += people
+            count -= people
+            if occupied[position] + plan[position] >= 3 and plan[position] >= 1:
+                donor = position
+            elif occupied[position] == 0 and plan[position] == 2:
+                pair = position
+
+        lonely = [position for position, taken in enumerate(occupied) if taken == 1 and free[position]]
+        partial = [position for position, taken in enumerate(occupied) if taken >= 1 and free[position]]
+        empty = [position for position, taken in enumerate(occupied) if taken == 0 and capacities[position] >= 2]
+        singles = [position for position, taken in enumerate(occupied) if taken == 0 and capacities[position] == 1]
+
+        for position in lonely:
+            if count == 0:
+                break
+            give(position, 1)
+        for position in partial:
+            if count == 0:
+                break
+            give(position, min(count, free[position] - plan[position]))
+        for index, position in enumerate(empty):
+            if count == 0:
+                break
+            people = min(count, free[position])
+            if people == 1 and donor < 0 and pair >= 0 and capacities[position] < 3:
+                # Too small for the pair and the last person: use a later table that fits the three
+                position = next((later for later in empty[index + 1:] if capacities[later] >= 3), position)
+            if people == 1 and donor >= 0:
+                # Take one person back so this table seats two
+                plan[donor] -= 1
+                count += 1
+                people = 2
+                donor = -1
+            elif people == 1 and pair >= 0 and capacities[position] >= 3:
+                # Move the last pair here so this table seats three
+                plan[pair] = 0
+                count += 2
+                people = 3
+                pair = -1
+            give(position, people)
+        for position in singles:
+            if count == 0:
+                break
+            give(position, 1)
+        return plan
+
+
+class BalancedStrategy(SeatingStrategy):
+    """
+    Exact solver for small rooms.
+
+    Seats as many people as possible, then minimizes the number of lonely
+    tables, then spreads people so that every table is filled in proportion
+    to its capacity. Dynamic programming over (table, people placed), so the
+    cost grows with tables x people x seats per table.
+    """
+
+    name = "balanced"
+
+    # Largest tables x people x seats product solved before refusing
+    max_work: int = 5_000_000
+
+    def allocate(self, count: int, occupied: Sequence[int], capacities: Sequence[int]) -> List[int]:
+        tables = len(capacities)
+        free = [capacity - taken for capacity, taken in zip(capacities, occupied)]
+        count = min(count, sum(free))
+        work = tables * (count + 1) * (max(free, default=0) + 1)
+        if work > self.max_work:
+            raise ValueError(
+                f"Room too large for the '{self.name}' strategy ({tables} tables, {count} people); "
+                f"use 'packing' instead."
+            )
+
+        total_capacity = sum(capacities)
+        total_people = sum(occupied) + count
+        infinity = (tables + 1, 0)
+
+        # best[k]: (lonely tables, squared deviation) with k people placed so far
+        best = [(0, 0)] + [infinity] * count
+        choices: List[List[int]] = []
+        for position in range(tables):
+            capacity, taken = capacities[position], occupied[position]
+            step = [infinity] * (count + 1)
+            choice = [0] * (count + 1)
+            for placed, cost in enumerate(best):
+                if cost == infinity:
+                    continue
+                for people in range(min(free[position], count - placed) + 1):
+                    seated = taken + people
+                    deviation = seated * total_capacity - capacity * total_people
+                    candidate = (cost[0] + (seated == 1), cost[1] + deviation * deviation)
+                    if candidate < step[placed + people]:
+                        step[placed + people] = candidate
+                        choice[placed + people] = people
+            best = step
+            choices.append(choice)
+
+        plan = [0] * tables
+        placed = count
+        for position in range(tables - 1, -1, -1):
+            plan[position] = choices[position][placed]
+            placed -= plan[position]
+        return plan
+
+
+STRATEGIES: Dict[str, SeatingStrategy] = {
+    strategy.name: strategy for strategy in (FirstFitStrategy(), PackingStrategy(), BalancedStrategy())
+}
+
+DEFAULT_STRATEGY = FirstFitStrategy.name
+
+
+def get_strategy(strategy: Union[str, SeatingStrategy, None]) -> SeatingStrategy:
+    """
+    Resolve a strategy given by name (as in config.json) or as an instance.
+
+    :param strategy: Strategy name, instance, or None for the default
+    :return: The strategy to use
+    :raises ValueError: If the name is unknown
+    """
+    if isinstance(strategy, SeatingStrategy):
+        return strategy
+    name = strategy or DEFAULT_STRATEGY
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown seating strategy '{name}'. Choose from: {', '.join(STRATEGIES)}") from None
@@ -1,11 +1,90 @@
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 from model.seat import Seat
+from model.seat_store import SeatStore
+
+if TYPE_CHECKING:
+    from model.openspace import Openspace
 
 class Table:
-    def __init__(self, capacity: int) -> None:
-        # Table with a fixed number of seats
-        self.capacity: int = capacity
-        self.seats: List[Seat] = [Seat() for _ in range(capacity)]
+    """
+    View over one table of a SeatStore.
+    """
+
+    __slots__ = ("store", "position", "owner")
+
+    def __init__(self, capacity: int, store: Optional[SeatStore] = None) -> None:
+        # Table with a fixed number of seats, stored in the room's SeatStore
+        # (or in a store of its own when created outside a room)
+        self.store: SeatStore = store if store is not None else SeatStore()
+        self.position: int = self.store.add_table(capacity)
+        # Openspace indexing this table (set when the table joins a room)
+        self.owner: Optional["Openspace"] = None
+
+    @classmethod
+    def view(cls, store: SeatStore, position: int) -> "Table":
+        """
+        Create a view over a table that already exists in `store`.
+
+        :param store: Store holding the table
+        :param position: Position of the table in the store
+        """
+        table = cls.__new__(cls)
+        table.store = store
+        table.position = position
+        table.owner = None
+        return table
+
+    def _detach(self) -> None:
+        """
+        Move this table into a store of its own once it has left its room,
+        so that the object stays usable after remove_table().
+        """
+        capacity = self.capacity
+        self.owner = None
+        self.store = SeatStore()
+        self.position = self.store.add_table(capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self.store.capacities[self.position]
+
+    @property
+    def occupied(self) -> int:
+        # Number of occupied seats, kept up to date by the store
+        return self.store.occupied[self.position]
+
+    @property
+    def seats(self) -> List[Seat]:
+        return [Seat(self, index) for index in range(self.capacity)]
+
+    def occupants(self) -> List[str]:
+        """
+        List the people seated at this table.
+
+        :return: Names in seat order
+        """
+        return self.store.table_occupants(self.position)
+
+    def _take(self, index: int, name: str) -> bool:
+        """
+        Seat someone at seat `index` and notify the owning room.
+        """
+        if not self.store.take(self.position, index, name):
+            return False
+        if self.owner is not None:
+            self.owner._seat_changed(self, index, name, self.occupied - 1)
+        return True
+
+    def _release(self, index: int) -> str:
+        """
+        Free seat `index` and notify the owning room.
+        """
+        name = self.store.release(self.position, index)
+        if name is None:
+            return ""
+        if self.owner is not None:
+            self.owner._seat_changed(self, index, name, self.occupied + 1)
+        return name
 
     def has_free_spot(self) -> bool:
         """
@@ -13,7 +92,7 @@ class Table:
 
         :return: True if a seat is free
         """
-        return any(seat.free for seat in self.seats)
+        return self.occupied < self.capacity
 
     def assign_seat(self, name: str) -> bool:
         """
@@ -22,10 +101,10 @@ class Table:
         :param name: Person to assign
         :return: True if assigned, False if full
         """
-        for seat in self.seats:
-            if seat.set_occupant(name):
-                return True
-        return False
+        index = self.store.first_free_seat(self.position)
+        if index is None:
+            return False
+        return self._take(index, name)
 
     def left_capacity(self) -> int:
         """
@@ -33,7 +112,7 @@ class Table:
 
         :return: Number of free seats
         """
-        return sum(1 for seat in self.seats if seat.free)
+        return self.capacity - self.occupied
 
     def __str__(self) -> str:
         seat_list = ", ".join(str(seat) for seat in self.seats)
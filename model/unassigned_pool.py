@@ -0,0 +1,85 @@
+from typing import Any, Dict, Iterable, Iterator
+
+
+class UnassignedPool:
+    """
+    Set-backed pool of people waiting for a seat.
+
+    Keeps the list-like methods used across the project (append, remove,
+    extend, `in`) while membership tests and removals run in constant time.
+    Insertion order is preserved so people are listed as they arrived.
+    Changes are reported to `journal` when one is set, like SeatStore.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._names: Dict[str, None] = dict.fromkeys(names)
+        self.journal: Any = None
+
+    def append(self, name: str) -> None:
+        """
+        Add a person to the pool (no-op if already waiting).
+
+        :param name: Person to add
+        """
+        if self.journal is not None and name not in self._names:
+            self.journal.wait(name)
+        self._names[name] = None
+
+    def extend(self, names: Iterable[str]) -> None:
+        """
+        Add several people to the pool.
+
+        :param names: People to add
+        """
+        if self.journal is not None:
+            for name in names:
+                self.append(name)
+            return
+        self._names.update(dict.fromkeys(names))
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a person from the pool.
+
+        :param name: Person to remove
+        :raises ValueError: If the person is not in the pool
+        """
+        if self._names.pop(name, _MISSING) is _MISSING:
+            raise ValueError(f"{name} is not in the unassigned pool")
+        if self.journal is not None:
+            self.journal.unwait(name)
+
+    def discard(self, name: str) -> None:
+        """
+        Remove a person from the pool if present.
+
+        :param name: Person to remove
+        """
+        if self._names.pop(name, _MISSING) is not _MISSING and self.journal is not None:
+            self.journal.unwait(name)
+
+    def clear(self) -> None:
+        """
+        Empty the pool.
+        """
+        self._names.clear()
+        if self.journal is not None:
+            self.journal.clear_waiting()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __bool__(self) -> bool:
+        return bool(self._names)
+
+    def __repr__(self) -> str:
+        return f"UnassignedPool({list(self._names)!r})"
+
+
+_MISSING = object()
@@ -47,6 +47,6 @@ fi
 
 # === Launch the main script ===
 print_info "Launching Openspace Organizer..."
-python main.py || print_error "Execution failed."
+python main.py "$@" || print_error "Execution failed."
 
 print_success "Program executed successfully."
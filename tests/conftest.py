@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the packages of the repository root, as the scripts do
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
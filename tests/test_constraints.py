@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from model.constraints import ConstraintSolver, PairConstraints
+from model.openspace import Openspace
+
+
+def test_solver_seats_single_people_with_others():
+    solver = ConstraintSolver(["Ann", "Bob", "Cid", "Dee"], PairConstraints(together=[("Ann", "Bob")]))
+    placements, unplaced = solver.plan([0, 0, 0], [2, 2, 4], rng=random.Random(0))
+    tables = {}
+    for position, group in placements:
+        tables.setdefault(position, []).extend(group)
+    assert unplaced == []
+    assert all(len(group) > 1 for group in tables.values())
+
+
+@pytest.mark.parametrize("capacities, people, together, apart", [
+    ([6, 6, 5, 4, 4, 2, 6, 3], 3, [("P0", "P1")], []),
+    ([2, 3, 4, 2, 6], 5, [("P0", "P4"), ("P1", "P4"), ("P4", "P3")], []),
+    ([3, 5, 6, 6, 2], 6, [("P4", "P5"), ("P1", "P3"), ("P2", "P5")], []),
+    ([4, 3, 4], 6, [], [("P2", "P3"), ("P1", "P2"), ("P1", "P3")]),
+])
+def test_organize_with_wishes_leaves_no_one_alone(capacities, people, together, apart):
+    names = [f"P{index}" for index in range(people)]
+    for seed in range(20):
+        room = Openspace.with_capacities(capacities)
+        report = room.organize(names, seed=seed, constraints=PairConstraints(together, apart))
+        assert report.sat_alone == [] and room.sat_alone == []
+        assert report.unassigned == [] and report.violations == []
+
+
+def test_lonely_moves_keep_wishes():
+    rng = random.Random(1)
+    for _ in range(300):
+        capacities = [rng.randint(2, 6) for _ in range(rng.randint(1, 8))]
+        names = [f"P{index}" for index in range(rng.randint(2, sum(capacities)))]
+        together = [tuple(rng.sample(names, 2)) for _ in range(rng.randint(0, 3))]
+        apart = [tuple(rng.sample(names, 2)) for _ in range(rng.randint(0, 3))]
+        room = Openspace.with_capacities(capacities)
+        room.organize(names, seed=rng.getrandbits(32), constraints=PairConstraints(together, apart))
+        table_of = {name: room.locate(name)[0] for name in names if room.locate(name)}
+        if not room.constraint_violations:
+            assert all(table_of.get(name) == table_of.get(other) for name, other in together)
+            assert all(table_of.get(name, -1) != table_of.get(other, -2) for name, other in apart)
+        assert room.seat_store.total_occupied + len(room.unassigned) == len(names)
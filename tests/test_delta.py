@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from model.openspace import Openspace
+
+
+def layout(room):
+    return [room.seat_store.table_occupants(position) for position in range(room.seat_store.table_count)]
+
+
+def test_waiting_people_are_seated_before_anyone_moves():
+    room = Openspace.with_capacities([3])
+    room.organize(["a", "b", "c", "waiting"], seed=0)
+    room.add_table(3)
+    report = room.apply_delta(added=["newcomer"])
+    assert report["moved"] == [] and report["unassigned"] == []
+    assert sorted(layout(room)[1]) == ["newcomer", "waiting"]
+    assert list(room.unassigned) == []
+
+
+def test_pair_and_newcomer_meet_at_a_larger_empty_table():
+    room = Openspace.with_capacities([2, 3, 2, 5, 4])
+    for name, position in [("p3", 0), ("p2", 0), ("p1", 1), ("p0", 1)]:
+        room.tables[position].assign_seat(name)
+    room.apply_delta(added=["n0", "n1"], removed=["p1", "p0", "p2"])
+    assert room.seat_store.lonely_tables() == []
+    assert sorted(name for table in layout(room) for name in table) == ["n0", "n1", "p3"]
+
+
+def test_last_arrivals_are_not_held_back_without_another_table():
+    room = Openspace.with_capacities([3])
+    report = room.apply_delta(added=["p0", "p1", "p2", "p3"])
+    assert len(report["seated"]) == 3 and len(report["unassigned"]) == 1
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_delta_matches_organize(seed):
+    """
+    After random arrivals and departures, a room updated with apply_delta()
+    has no more lonely tables and no more people without a seat than the
+    same roster organized from scratch.
+    """
+    rng = random.Random(seed)
+    for _ in range(300):
+        capacities = [rng.randint(2, 6) for _ in range(rng.randint(1, 7))]
+        room = Openspace.with_capacities(capacities)
+        people = [f"p{index}" for index in range(rng.randint(0, sum(capacities) + 3))]
+        room.organize(people, strategy="packing", seed=rng.getrandbits(32))
+        room.eliminate_lonely_tables()
+        arrived = len(people)
+        for _ in range(rng.randint(1, 4)):
+            removed = rng.sample(people, rng.randint(0, min(4, len(people))))
+            added = [f"p{arrived + index}" for index in range(rng.randint(0, 4))]
+            arrived += len(added)
+            room.apply_delta(added, removed)
+            people = [name for name in people if name not in removed] + added
+
+            reference = Openspace.with_capacities(capacities)
+            reference.organize(people, strategy="packing", seed=0)
+            reference.eliminate_lonely_tables()
+            assert room.seat_store.total_occupied + len(room.unassigned) == len(people)
+            assert len(room.unassigned) <= len(reference.unassigned)
+            assert len(room.seat_store.lonely_tables()) <= len(reference.seat_store.lonely_tables())
@@ -0,0 +1,36 @@
+import io
+import os
+
+import pytest
+
+from utils import exporters
+from utils.exporters import write_xlsx
+
+pytest.importorskip("xlsxwriter")
+
+ROWS = [(1, 1, "Ada"), (1, 2, "Grace"), (2, 1, "Free")]
+
+
+def test_xlsx_overflow_leaves_no_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters, "XLSX_MAX_ROWS", 2)
+    target = tmp_path / "seating.xlsx"
+    with pytest.raises(ValueError):
+        write_xlsx(iter(ROWS), target)
+    assert os.listdir(tmp_path) == []
+
+
+def test_xlsx_overflow_keeps_the_previous_export(tmp_path, monkeypatch):
+    target = tmp_path / "seating.xlsx"
+    assert write_xlsx(iter(ROWS), target) == 3
+    before = target.read_bytes()
+    monkeypatch.setattr(exporters, "XLSX_MAX_ROWS", 2)
+    with pytest.raises(ValueError):
+        write_xlsx(iter(ROWS), target)
+    assert target.read_bytes() == before
+    assert os.listdir(tmp_path) == ["seating.xlsx"]
+
+
+def test_xlsx_to_a_file_object():
+    buffer = io.BytesIO()
+    assert write_xlsx(iter(ROWS), buffer) == 3
+    assert buffer.getvalue()[:2] == b"PK"
@@ -0,0 +1,40 @@
+import logging
+import threading
+
+import pytest
+
+from utils.jobs import DONE, FAILED, JobQueue, QueueFullError
+
+
+def finished(queue, job):
+    while job.finished is None:
+        queue.wait(job.id, job.revision, timeout=5)
+    return job
+
+
+def test_submissions_are_refused_while_max_jobs_are_pending():
+    queue = JobQueue(workers=1, max_jobs=2, retry_after=3)
+    release = threading.Event()
+    jobs = [queue.submit("wait", lambda job: release.wait(5)) for _ in range(2)]
+    with pytest.raises(QueueFullError) as refused:
+        queue.submit("wait", lambda job: None)
+    assert refused.value.retry_after == 3
+    release.set()
+    for job in jobs:
+        assert finished(queue, job).status == DONE
+    job = queue.submit("again", lambda job: "ok")
+    assert finished(queue, job).result == "ok"
+    queue.shutdown()
+
+
+def test_failures_are_logged(caplog):
+    queue = JobQueue(workers=1)
+
+    def fail(job):
+        raise ValueError("bad roster")
+
+    with caplog.at_level(logging.ERROR, logger="utils.jobs"):
+        job = queue.submit("upload", fail)
+        queue.shutdown()
+    assert job.status == FAILED and job.error == "bad roster"
+    assert any(record.exc_info and job.id in record.getMessage() for record in caplog.records)
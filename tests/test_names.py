@@ -0,0 +1,27 @@
+import unicodedata
+
+import pytest
+
+from utils.file_utils import NameRules, NameValidationError, validate_names
+
+
+@pytest.mark.parametrize("normalization", ["NFC", "NFD", "NFKC", "NFKD", None])
+@pytest.mark.parametrize("name", ["Zoë", "Jean-Luc Noël", "O'Brien", "प्रीति", "Nguyễn Thị", "Françoise"])
+def test_names_with_combining_marks_are_valid(name, normalization):
+    sent = unicodedata.normalize("NFD", name)
+    names, renamed = validate_names([sent], NameRules(normalization=normalization))
+    assert names == [unicodedata.normalize(normalization, sent) if normalization else sent]
+    assert renamed == []
+
+
+@pytest.mark.parametrize("name", ["̈Zoe", "Zoe -́Ann", "Zoe2", "Zoe_", "", "Zo--e"])
+def test_invalid_names_are_reported(name):
+    with pytest.raises(NameValidationError) as caught:
+        validate_names(["Anna", name], NameRules(normalization="NFD"))
+    assert [position for position, _, _ in caught.value.errors] == [2]
+
+
+def test_repeats_are_renamed_in_roster_order():
+    names, renamed = validate_names(["Zoë", "zoë", unicodedata.normalize("NFD", "Zoë")])
+    assert names == ["Zoë", "zoë (2)", "Zoë (3)"]
+    assert renamed == [(2, "zoë (2)"), (3, "Zoë (3)")]
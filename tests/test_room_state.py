@@ -0,0 +1,48 @@
+from model.constraints import PairConstraints
+from model.openspace import Openspace
+from utils.room_state import LocalRoomState, SQLiteRoomState
+from utils.snapshot_store import SnapshotStore
+
+
+def saved_room(directory):
+    room = Openspace.with_capacities([4, 4])
+    room.organize([f"p{index}" for index in range(6)], seed=0)
+    store = SnapshotStore(directory)
+    store.save(room)
+    store.close()
+    return room
+
+
+def test_memory_backend_loads_on_first_use(tmp_path):
+    room = saved_room(str(tmp_path))
+    persistence = SnapshotStore(str(tmp_path))
+    state = LocalRoomState(persistence)
+    # Building the backend (as importing the web app does) leaves the log unlocked
+    other = SnapshotStore(str(tmp_path))
+    assert other.load() is not None
+    other.close()
+
+    with state.read() as loaded:
+        assert loaded.format_layout() == room.format_layout()
+    persistence.close()
+
+
+def test_replace_does_not_load_the_saved_room(tmp_path):
+    saved_room(str(tmp_path))
+    state = LocalRoomState(SnapshotStore(str(tmp_path)))
+    state.replace(Openspace.with_capacities([2]))
+    with state.read() as room:
+        assert room.seat_store.table_count == 1
+    state.snapshot_store.close()
+
+
+def test_sqlite_backend_shares_seating_wishes(tmp_path):
+    path = str(tmp_path / "room.db")
+    room = Openspace.with_capacities([3, 3])
+    wishes = PairConstraints([("p0", "p1")], [("p0", "p2")])
+    room.organize([f"p{index}" for index in range(4)], seed=0, constraints=wishes)
+    SQLiteRoomState(path).replace(room)
+
+    with SQLiteRoomState(path).read() as shared:
+        assert shared.constraints.together == wishes.together
+        assert shared.constraints.apart == wishes.apart
@@ -0,0 +1,23 @@
+import random
+
+from model.constraints import PairConstraints
+from model.search import organize_best_of, score_layout
+
+
+def wishes(names, count, seed=0):
+    rng = random.Random(seed)
+    return PairConstraints([tuple(rng.sample(names, 2)) for _ in range(count)],
+                           [tuple(rng.sample(names, 2)) for _ in range(count)])
+
+
+def test_winner_is_organized_again_from_its_seed():
+    names = [f"P{index}" for index in range(200)]
+    constraints = wishes(names, 30)
+    rooms = {}
+    for workers in (0, 2):
+        room, report = organize_best_of(names, [4] * 55, restarts=4, workers=workers,
+                                        constraints=constraints, seed=5)
+        assert score_layout(room) == report["score"]
+        rooms[workers] = room
+    assert rooms[0].format_layout() == rooms[2].format_layout()
+    assert rooms[0].constraint_violations == rooms[2].constraint_violations
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from model.openspace import Openspace
+from model.seat_store import FREE
+
+
+def check_index(room):
+    """
+    Check the name index, the counters and the table buckets of a room
+    against its seats.
+    """
+    store = room.seat_store
+    held = {}
+    for position in range(store.table_count):
+        start = store.offsets[position]
+        slots = range(start, start + store.capacities[position])
+        assert store.occupied[position] == sum(store.occupants[slot] != FREE for slot in slots)
+        for slot in slots:
+            if store.occupants[slot] != FREE:
+                held.setdefault(store.occupants[slot], []).append(slot)
+    assert store.total_occupied == sum(store.occupied) == sum(map(len, held.values()))
+    assert store.total_capacity == sum(store.capacities)
+    assert store.seated_people == len(held)
+    for occupant_id, slot in enumerate(store.seat_of):
+        if occupant_id in held:
+            assert slot in held[occupant_id]
+            assert store.extra_seats.get(occupant_id, 0) == len(held[occupant_id]) - 1
+        else:
+            assert slot == FREE and occupant_id not in store.extra_seats
+
+    for position, table in enumerate(room.tables):
+        assert table.position == position
+        occupied, capacity = store.occupied[position], store.capacities[position]
+        assert (table in room._partial_tables) == (0 < occupied < capacity)
+        assert (table in room._empty_tables) == (occupied == 0 < capacity)
+    assert len(room._partial_tables) + len(room._empty_tables) <= store.table_count
+    assert not any(store.is_seated(name) for name in room.unassigned)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_index_follows_random_changes(seed):
+    rng = random.Random(seed)
+    room = Openspace.with_capacities([rng.randint(0, 5) for _ in range(6)])
+    names = [f"p{index}" for index in range(40)]
+    room.organize(names[:12], seed=seed)
+    check_index(room)
+    for _ in range(600):
+        store = room.seat_store
+        seated = [name for position in range(store.table_count) for name in store.table_occupants(position)]
+        action = rng.randrange(9)
+        if action == 0:
+            room.assign_person(rng.choice(names))
+        elif action == 1 and seated:
+            name = rng.choice(seated)
+            room.remove_person_from_table(store.locate(name)[0] + 1, name)
+        elif action == 2:
+            room.remove_person_from_room(rng.choice(names))
+        elif action == 3 and seated and room.tables:
+            # Move someone to a free seat of another table
+            name = rng.choice(seated)
+            source = store.locate(name)[0]
+            target = rng.randrange(len(room.tables))
+            if target != source and room.tables[target].has_free_spot():
+                room._seat_at_table(source, name).remove_occupant()
+                room.tables[target].assign_seat(name)
+        elif action == 4 and room.tables:
+            # The same name at a second seat, as a roster listing someone twice
+            if seated:
+                room.tables[rng.randrange(len(room.tables))].assign_seat(rng.choice(seated))
+        elif action == 5:
+            room.add_table(rng.randint(0, 5))
+        elif action == 6 and room.tables:
+            room.remove_table(rng.randint(1, len(room.tables)))
+        elif action == 7:
+            room.apply_delta(rng.sample(names, rng.randint(0, 3)), rng.sample(names, rng.randint(0, 3)))
+        elif action == 8:
+            room.eliminate_lonely_tables()
+        check_index(room)
+
+
+def test_negative_table_is_refused():
+    room = Openspace(2, 3)
+    with pytest.raises(ValueError):
+        room.add_table(-2)
+    assert room.seats_left() == 6 and len(room.tables) == 2
+    check_index(room)
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from model.constraints import PairConstraints
+from model.openspace import Openspace
+from utils import snapshot_store
+from utils.snapshot_store import SnapshotLockedError, SnapshotStore
+
+
+def organized_room():
+    room = Openspace.with_capacities([4, 4, 2])
+    room.organize([f"p{index}" for index in range(12)], seed=0)
+    return room
+
+
+def test_changes_are_replayed_after_a_reload(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    room = organized_room()
+    store.save(room)
+    room.remove_person_from_room("p0")
+    room.assign_person("p0")
+    room.add_table(3)
+    store.close()
+
+    reloaded = SnapshotStore(str(tmp_path)).load()
+    assert reloaded.format_layout() == room.format_layout()
+    assert list(reloaded.unassigned) == list(room.unassigned)
+
+
+def test_cli_and_web_app_keep_separate_folders(tmp_path):
+    config = {"persistence": {"directory": str(tmp_path)}}
+    web, cli = SnapshotStore.from_config(config), SnapshotStore.from_config(config, namespace="cli")
+    assert cli.directory == os.path.join(str(tmp_path), "cli")
+    web.save(organized_room())
+    cli.save(Openspace.with_capacities([2]))
+    assert web.snapshot_path != cli.snapshot_path
+    assert SnapshotStore.from_config({}) is None
+
+
+@pytest.mark.skipif(snapshot_store.fcntl is None, reason="no advisory locks on this platform")
+def test_one_writer_at_a_time(tmp_path):
+    first = SnapshotStore(str(tmp_path))
+    first.save(organized_room())
+    with pytest.raises(SnapshotLockedError):
+        SnapshotStore(str(tmp_path)).load()
+    with pytest.raises(SnapshotLockedError):
+        SnapshotStore(str(tmp_path)).save(organized_room())
+    first.close()
+    second = SnapshotStore(str(tmp_path))
+    assert second.load() is not None
+    second.close()
+
+
+def test_log_of_an_older_snapshot_is_not_replayed(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    room = organized_room()
+    store.save(room)
+    room.remove_person_from_room("p0")
+    room.add_table(3)
+    assert store.records
+    # A crash between writing the next snapshot and emptying the log
+    other = Openspace.with_capacities([2, 2])
+    other.organize(["a", "b", "c"], seed=0)
+    snapshot_store.write_snapshot(other.seat_store, other.unassigned, store.snapshot_path, generation=7)
+    store.close()
+
+    reloaded = SnapshotStore(str(tmp_path))
+    assert reloaded.load().format_layout() == other.format_layout()
+    assert reloaded.records == 0
+    reloaded.close()
+    assert SnapshotStore(str(tmp_path)).load().format_layout() == other.format_layout()
+
+
+def test_seating_wishes_survive_a_reload(tmp_path):
+    room = Openspace.with_capacities([3, 3, 3])
+    wishes = PairConstraints([("p0", "p1")], [("p0", "p2"), ("p3", "p4")])
+    room.organize([f"p{index}" for index in range(6)], seed=0, constraints=wishes)
+    store = SnapshotStore(str(tmp_path))
+    store.save(room)
+    store.close()
+
+    reloaded = SnapshotStore(str(tmp_path)).load()
+    assert reloaded.constraints.together == wishes.together
+    assert reloaded.constraints.apart == wishes.apart
+    assert reloaded.format_layout() == room.format_layout()
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from model.strategies import BalancedStrategy, PackingStrategy
+
+
+def lonely_tables(plan, occupied):
+    return sum(1 for people, taken in zip(plan, occupied) if people + taken == 1)
+
+
+@pytest.mark.parametrize("capacities, count, expected", [
+    ([2, 2, 3], 3, [0, 0, 3]),
+    ([2, 2, 5, 5], 3, [0, 0, 3, 0]),
+])
+def test_packing_avoids_lonely_table_with_mixed_capacities(capacities, count, expected):
+    assert PackingStrategy().allocate(count, [0] * len(capacities), capacities) == expected
+
+
+def test_packing_as_good_as_balanced():
+    rng = random.Random(0)
+    packing, balanced = PackingStrategy(), BalancedStrategy()
+    for _ in range(5000):
+        capacities = [rng.randint(1, 6) for _ in range(rng.randint(1, 7))]
+        occupied = [rng.choice([0, 0, 0, rng.randint(0, capacity)]) for capacity in capacities]
+        count = rng.randint(0, sum(capacities) + 2)
+        plan = packing.allocate(count, occupied, capacities)
+        best = balanced.allocate(count, occupied, capacities)
+        assert all(0 <= people <= capacity - taken for people, capacity, taken in zip(plan, capacities, occupied))
+        assert sum(plan) == sum(best)
+        assert lonely_tables(plan, occupied) <= lonely_tables(best, occupied), (capacities, occupied, count)
@@ -28,11 +28,13 @@ Key Features Used from Backend Classes:
 - Detection of unseated individuals: Openspace.get_unseated_people()
 - Configuration-driven setup: JSON file loaded via utils.file_utils.load_config()
 - Storage support for exporting the result: Openspace.store()
+- Shared room state and persistence: utils.room_state (in-process or SQLite backends)
 
 Flask Routes:
 -------------
 - '/'         → Renders the HTML upload form (templates/upload.html)
-- '/upload'   → Handles Excel upload, runs seat assignment, and renders the result page (templates/result.html)
+- '/upload'   → Accepts an Excel upload and queues its seat assignment as a background job
+- '/jobs/<id>' → Progress of a background job as JSON (long polling with ?since=&wait=)
 - '/download' → (Optional) Serves a generated CSV file (data/output.csv)
 
 Execution Flow:
@@ -41,12 +43,12 @@ Execution Flow:
 2. The Flask app (`webapp.py`) is launched in development mode.
 3. The user accesses `http://127.0.0.1:5000` in a browser.
 4. The user uploads a `.xlsx` file containing names.
-5. Flask:
-   - Saves the file in the 'uploads/' directory
+5. Flask queues the upload and shows its progress while a worker:
+   - Parses the file straight from memory (a copy goes to 'uploads/' only on request)
    - Loads configuration from 'config.json'
    - Initializes an Openspace object and organizes seating
    - Eliminates lonely seating where possible
-   - Displays the final layout in the browser
+   The browser then moves on to the final layout (/dashboard)
 6. The user can optionally download the seating plan as a CSV file
 
 Usage:
@@ -59,28 +61,132 @@ Make sure dependencies are installed using:
 """
 
 
+import contextlib
+import hashlib
+import itertools
+import logging
+import math
 import os
 import sys
+import time
 
 
-from utils.file_utils import load_colleagues_from_excel
-from model.openspace import Openspace
-from flask import Flask, request, render_template, redirect, url_for, send_file
+from utils.file_utils import NameRules, load_roster, normalize_pairs, validate_names
+from utils.layout_cache import LayoutCache
+from model.constraints import PairConstraints
+from model.openspace import Openspace, layout_key
+from model.report import SeatingReport
+from model.search import organize_best_of
+from flask import Flask, request, render_template, redirect, url_for, send_file, jsonify, g, make_response
 from utils.file_utils import load_config
 
 from flask import send_file
 from io import BytesIO
-import pandas as pd
-
-room = None  # Global variable to hold the Openspace instance
+from utils.exporters import export_seating
+from utils.room_state import open_room_state, track_changes
+from utils.jobs import JobQueue, QueueFullError
+from utils.upload_store import UploadStore
+from utils.events import EventHub
+from utils import metrics
+from model.seat_store import FREE
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 app = Flask(__name__)
 
-# Folder where uploaded files will be stored
-UPLOAD_FOLDER = 'uploads'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Uploads are parsed from memory; copies are only kept when the sender asks
+# for it (or "keep" is set), under content-addressed names pruned to the
+# limits of the "uploads" section of config.json
+upload_store = UploadStore.from_config(load_config())
+
+# Normalization and checks of uploaded names, from the "names" section of config.json
+name_rules = NameRules.from_config(load_config())
+
+# LRU caches for repeated uploads, sized from the "cache" section of config.json:
+# file content hash -> parsed names, and layout key -> finished room
+_cache_config = load_config().get("cache", {})
+roster_cache = LayoutCache(**_cache_config)
+layout_cache = LayoutCache(**_cache_config)
+
+# Current room, shared by every request (and every worker process with the
+# "sqlite" backend); see the "state" and "persistence" sections of config.json
+room_state = open_room_state(load_config())
+
+# Background workers parsing and organizing uploads, sized from the "jobs"
+# section of config.json; long polls of a job wait at most JOB_MAX_WAIT seconds
+job_queue = JobQueue(**load_config().get("jobs", {}))
+JOB_MAX_WAIT = 30.0
+
+# Seating reports and room events (people moved, tables removed...) go to the
+# application log at the "report_level" of the "logging" section of
+# config.json. When the log does not take that level, rooms get no event sink
+# and no report is formatted.
+_logging_config = load_config().get("logging", {})
+app.logger.setLevel(_logging_config.get("level", "INFO"))
+REPORT_LEVEL = logging.getLevelName(_logging_config.get("report_level", "INFO"))
+
+
+def log_event(event):
+    """
+    Event sink of the rooms changed by requests (see Openspace.sink).
+    """
+    app.logger.log(REPORT_LEVEL, "%s", event)
+
+
+@contextlib.contextmanager
+def write_room():
+    """
+    room_state.write(), with the events of the room sent to the log.
+    """
+    with room_state.write() as room:
+        if room is not None:
+            room.sink = log_event if app.logger.isEnabledFor(REPORT_LEVEL) else None
+        yield room
+
+
+def organize_cached(names, together, apart, content_hash):
+    """
+    Return an organized room for `names` and their seating wishes, reusing a
+    cached layout when the same roster was already organized with the same
+    configuration and seed.
+    Without a seed in config.json, the seed is derived from the file content
+    so that re-uploading a file gives back the same layout.
+    """
+    config = load_config()
+    seed = config.get("seed")
+    if seed is None:
+        seed = int(content_hash[:16], 16)
+    room_config = {key: config.get(key) for key in ("tables", "seats_per_table", "strategy", "search")}
+    room_config["constraints"] = [together, apart]
+    key = layout_key(names, room_config, seed)
+
+    cached = layout_cache.get(key)
+    if cached is not None:
+        return cached.copy()
+
+    search = config.get("search", {})
+    if search.get("restarts", 1) > 1:
+        # Best of K seeded variants, organized on a process pool
+        new_room, _ = organize_best_of(
+            names,
+            [config["seats_per_table"]] * config["tables"],
+            restarts=search["restarts"],
+            workers=search.get("workers"),
+            time_budget=search.get("time_budget"),
+            strategy=config.get("strategy"),
+            constraints=PairConstraints(together, apart),
+            seed=seed,
+        )
+    else:
+        new_room = Openspace(config["tables"], config["seats_per_table"])
+        new_room.organize(
+            names,
+            strategy=config.get("strategy"),
+            seed=seed,
+            constraints=PairConstraints(together, apart),
+        )
+    layout_cache.put(key, new_room.copy(), weight=new_room.seat_store.total_capacity + len(names))
+    return new_room
 
 #
 @app.route('/', methods=['GET'])
@@ -90,10 +196,55 @@ def index():
     """
     return render_template('upload.html')
 
+
+def process_upload(job, content, filename, content_hash, keep=False):
+    """
+    Background part of an upload, run by the job queue: keep a copy of the
+    file if asked, parse the roster, validate the names, organize the room
+    and publish it.
+    """
+    stored = None
+    if keep and upload_store is not None:
+        stored = upload_store.save(content, content_hash, os.path.splitext(filename)[1])
+
+    # Repeat uploads of the same file skip the Excel parsing; others are
+    # parsed from the bytes received, without going through the disk
+    job.report("parsing", 0.1)
+    roster = roster_cache.get(content_hash)
+    if roster is None:
+        roster = tuple(tuple(part) for part in load_roster(BytesIO(content), "excel"))
+        roster_cache.put(content_hash, roster, weight=sum(len(part) for part in roster))
+    names, together, apart = roster
+
+    # Normalize and check the whole column at once; every problem is
+    # reported in the job error, and repeated names get distinct ids
+    job.report("validating", 0.4)
+    names, renamed = validate_names(names, name_rules)
+    together = normalize_pairs(together, name_rules.normalization)
+    apart = normalize_pairs(apart, name_rules.normalization)
+    if renamed:
+        app.logger.log(REPORT_LEVEL, "%s: %d repeated names renamed", filename, len(renamed))
+
+    job.report("organizing", 0.5)
+    new_room = organize_cached(names, together, apart, content_hash)
+    if app.logger.isEnabledFor(REPORT_LEVEL):
+        app.logger.log(REPORT_LEVEL, "Organized %s: %s", filename, SeatingReport.of(new_room))
+    job.report("publishing", 0.9)
+    room_state.replace(new_room)
+    return {"people": len(names), "renamed": len(renamed), "version": room_state.version, "stored": stored}
+
+
 @app.route('/upload', methods=['POST'])
 def upload():
-    global room
-
+    """
+    Accept an Excel roster and hand it to the job queue. Browsers get a page
+    following the job until the dashboard is ready; API clients (Accept:
+    application/json or ?format=json) get 202 and the job, to poll at
+    /jobs/<id>. A copy of the file is kept when the form or query string
+    has keep=1, or when "uploads.keep" is set in config.json. While the
+    queue holds "jobs.max_jobs" unfinished jobs, the answer is 503 with a
+    Retry-After header.
+    """
     if 'file' not in request.files:
         return render_template('upload.html', error="No file part detected.")
 
@@ -104,30 +255,46 @@ def upload():
     if not file.filename.endswith('.xlsx'):
         return render_template('upload.html', error="Invalid file format. Please upload a .xlsx file.")
 
+    # The job outlives the request and its spooled upload, so the bytes are
+    # read once here, then hashed and parsed in place
+    content = file.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    keep = request.values.get('keep') in ('1', 'on', 'true') or (upload_store is not None and upload_store.keep)
+    wants_json = request.args.get('format') == 'json' or request.accept_mimetypes.best == 'application/json'
     try:
-        filepath = os.path.join(UPLOAD_FOLDER, file.filename)
-        file.save(filepath)
-
-        names = load_colleagues_from_excel(filepath)
-
-        # Validate names (only alphabetic)
-        invalid_names = [name for name in names if not str(name).strip().isalpha()]
-        if invalid_names:
-            invalid_str = ', '.join([str(n) for n in invalid_names])
-            return render_template('upload.html', error=f"Invalid names found: {invalid_str}")
-
-        config = load_config()
-        room = Openspace(config["tables"], config["seats_per_table"])
-        room.organize(names)
-
-        return redirect(url_for('dashboard'))
-
-    except Exception as e:
-        return render_template('upload.html', error=f"Unexpected error: {str(e)}")
-
-
+        job = job_queue.submit("upload", process_upload, content, os.path.basename(file.filename), content_hash, keep)
+    except QueueFullError as error:
+        # Too many uploads in progress: refuse now rather than queue without bound
+        if wants_json:
+            response = jsonify(error=str(error))
+        else:
+            response = make_response(render_template('upload.html', error="The server is busy, please try again shortly."))
+        response.status_code = 503
+        response.headers['Retry-After'] = str(math.ceil(error.retry_after))
+        return response
+
+    if wants_json:
+        response = jsonify(job.to_dict())
+        response.status_code = 202
+        response.headers['Location'] = url_for('job_status', job_id=job.id)
+        return response
+    return render_template('uploading.html', job_id=job.id, filename=file.filename)
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """
+    Report a background job as JSON. With ?since=<revision>&wait=<seconds>,
+    the answer waits (up to JOB_MAX_WAIT seconds) until the job moves past
+    that revision or finishes.
+    """
+    since = request.args.get('since', -1, type=int)
+    wait = min(max(0.0, request.args.get('wait', 0.0, type=float)), JOB_MAX_WAIT)
+    job = job_queue.wait(job_id, since, wait)
+    if job is None:
+        return jsonify(error=f"Unknown job {job_id}."), 404
+    return jsonify(job.to_dict())
 
-    
 
 @app.route('/dashboard')
 def dashboard():
@@ -135,22 +302,27 @@ def dashboard():
     Render the dashboard page showing all tables and current seating status.
     Also displays unassigned people and controls for adding/removing.
     """
-    global room
-    if not room:
-        return redirect(url_for('index'))
-
-    tables_data = []
-    for i, table in enumerate(room.tables, start=1):
-        seats = [(idx + 1, seat.occupant if not seat.free else "Free") for idx, seat in enumerate(table.seats)]
-        tables_data.append({"table_num": i, "seats": seats})
-
-    unseated = room.get_unseated_people()
-    
-    
-    # Creaet a liste of table with free seats only 
-    tables_with_free_seats = [
-        i + 1 for i, table in enumerate(room.tables) if table.has_free_spot()
-    ]
+    with room_state.read() as room:
+        if not room:
+            return redirect(url_for('index'))
+
+        # Read the seat arrays directly rather than through Table and Seat views
+        store = room.seat_store
+        tables_data = []
+        for position in range(store.table_count):
+            seats = [
+                (idx + 1, store.names[occupant_id] if occupant_id != FREE else "Free")
+                for idx, occupant_id in enumerate(store.occupants[store.offsets[position]:
+                                                                  store.offsets[position] + store.capacities[position]])
+            ]
+            tables_data.append({"table_num": position + 1, "seats": seats})
+
+        unseated = room.get_unseated_people()
+
+        # Creaet a liste of table with free seats only
+        tables_with_free_seats = [
+            i + 1 for i, (occupied, capacity) in enumerate(zip(store.occupied, store.capacities)) if occupied < capacity
+        ]
 
     return render_template(
         'dashboard.html',
@@ -163,14 +335,17 @@ def dashboard():
 @app.route('/add_person', methods=['POST'])
 def add_person():
     """
-    Add a person to the unassigned list without assigning them to a table.
+    Seat a late arrival with an incremental repair of the affected tables
+    (see Openspace.apply_delta). Without a free seat, they join the unassigned list.
     """
-    global room
     name = request.form.get('name')
-    if room and name:
-        if not room.is_person_seated(name) and name not in room.unassigned:
-            room.unassigned.append(name)
-            print(f"{name} has been added to the unassigned list.")
+    with write_room() as room:
+        if room and name:
+            report = room.apply_delta(added=[name])
+            if report["seated"]:
+                app.logger.log(REPORT_LEVEL, "%s has been seated (%d people moved).", name, len(report["moved"]))
+            elif report["unassigned"]:
+                app.logger.log(REPORT_LEVEL, "%s has been added to the unassigned list.", name)
     return redirect(url_for('dashboard'))
 
 
@@ -180,23 +355,26 @@ def remove_person_from_table(table_id, name):
     """
     Remove a person from a table and add them to the unassigned list.
     """
-    global room
-    if room:
-        room.remove_person_from_table(table_id, name)
-        if name not in room.unassigned:
-            room.unassigned.append(name)  # Re-add to unassigned
-            print(f"{name} was removed from table {table_id} and added to the unassigned list.")
+    with write_room() as room:
+        if room:
+            room.remove_person_from_table(table_id, name)
+            if not room.is_person_seated(name) and name not in room.unassigned:
+                room.unassigned.append(name)  # Re-add to unassigned
+                app.logger.log(REPORT_LEVEL, "%s was added to the unassigned list.", name)
     return redirect(url_for('dashboard'))
 
 @app.route('/remove_person_from_room/<name>')
 def remove_person_from_room(name):
     """
     Completely remove a person from the room, whether seated or unassigned.
-    The person is removed from any table and also from the unassigned list.
+    The person is removed from any table and also from the unassigned list,
+    and whoever they leave alone is repaired incrementally (see Openspace.apply_delta).
     """
-    global room
-    if room:
-        room.remove_person_from_room(name)
+    with write_room() as room:
+        if room:
+            report = room.apply_delta(removed=[name])
+            for moved, source, target in report["moved"]:
+                app.logger.log(REPORT_LEVEL, "%s moved from table %d to table %d.", moved, source, target)
     return redirect(url_for('dashboard'))
 
 @app.route('/add_table', methods=['POST'])
@@ -205,10 +383,15 @@ def add_table():
     Add a new table to the openspace with specified capacity.
     Capacity is taken from the form; default is 4 if not specified.
     """
-    global room
-    capacity = int(request.form.get('capacity', 4))
-    if room:
-        room.add_table(capacity)
+    try:
+        capacity = int(request.form.get('capacity', 4))
+    except ValueError:
+        return "A whole number of seats is required.", 400
+    if capacity < 1:
+        return "A table needs at least one seat.", 400
+    with write_room() as room:
+        if room:
+            room.add_table(capacity)
     return redirect(url_for('dashboard'))
 
 
@@ -218,9 +401,9 @@ def remove_table(index):
     Remove a table from the openspace if it is empty.
     Index is 1-based, as shown to the user.
     """
-    global room
-    if room:
-        room.remove_table(index)
+    with write_room() as room:
+        if room:
+            room.remove_table(index)
     return redirect(url_for('dashboard'))
 
 
@@ -241,29 +424,12 @@ def store_csv():
     """
     Export the current seating plan to an Excel file (XLSX) and send it as a download.
     """
-    global room
-    if not room:
-        return "No seating data to export.", 400
-
-    rows = []
-
-    # Collect seating information from all tables
-    for table_index, table in enumerate(room.tables, start=1):
-        for seat_number, seat in enumerate(table.seats, start=1):
-            if seat.occupant and seat.occupant != "Free":
-                rows.append({
-                    "Table": table_index,
-                    "Seat": seat_number,
-                    "Name": seat.occupant
-                })
-
-    # Create a DataFrame with the seating data
-    df = pd.DataFrame(rows)
-
-    # Export to Excel in-memory
+    # Stream the occupied seats straight from the seat storage into the workbook
     output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Seating')
+    with room_state.read() as room:
+        if not room:
+            return "No seating data to export.", 400
+        export_seating(room, output, "xlsx", include_free=False, header=("Table", "Seat", "Name"))
     output.seek(0)
 
     # Send file as a downloadable Excel attachment
@@ -275,57 +441,339 @@ def store_csv():
     )
 
 
-@app.route('/assign_to_table', methods=['POST'])
-def assign_to_table():
+# === Instrumentation ===
+# With "metrics": {"enabled": true} in config.json, every route records its
+# latency and /metrics serves all counters in the Prometheus text format.
+# Disabled (the default), no hook is installed and /metrics answers 404.
+
+if load_config().get("metrics", {}).get("enabled", False):
+    metrics.enable()
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        start = g.pop('request_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            metrics.observe('openspace_http_request_seconds', time.perf_counter() - start,
+                            route=route, method=request.method, status=response.status_code)
+        return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
     """
-    Assign a specific person to a specific table manually.
+    Expose the counters and timings in the Prometheus text format.
     """
-    global room
-    name = request.form.get('name')
-    table_index = int(request.form.get('table_index'))
+    if not metrics.ENABLED:
+        return "Metrics are disabled; set \"metrics\": {\"enabled\": true} in config.json.\n", 404
+    metrics.set_gauge('openspace_room_version', room_state.version)
+    metrics.set_gauge('openspace_event_clients', event_hub.stats()['clients'])
+    for status, count in job_queue.stats().items():
+        metrics.set_gauge('openspace_jobs', count, status=status)
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
 
-    if room and name and 1 <= table_index <= len(room.tables):
-        table = room.tables[table_index - 1]
-        success = table.assign_seat(name)
-        if success:
-            if name in room.unassigned:
-                room.unassigned.remove(name)
-            print(f"{name} has been manually assigned to table {table_index}.")
-    return redirect(url_for('dashboard'))
 
-@app.route('/uploading', methods=['POST'])
-def uploading():
+@app.route('/cache_stats')
+def cache_stats():
+    """
+    Report hit/miss/eviction counters and sizes of the upload caches as JSON.
+    """
+    return jsonify(rosters=roster_cache.stats(), layouts=layout_cache.stats())
+
+
+# === JSON API ===
+# Pages of tables and unseated people, and mutations answering with only the
+# tables they changed. Every response carries the room version as its ETag:
+# GET requests with a matching If-None-Match get a 304, and mutations sent
+# with an If-Match that is no longer current get a 412.
+
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
+
+def _page():
     """
-    Intermediate page to show spinner, then redirect to actual /upload
+    Read the offset and limit query parameters of a paginated request.
     """
-    # Save the file temporarily in session or filesystem
-    uploaded_file = request.files['file']
-    filename = uploaded_file.filename
-    temp_path = os.path.join('uploads', filename)
-    uploaded_file.save(temp_path)
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', API_PAGE_SIZE, type=int)), API_MAX_PAGE_SIZE)
+    return offset, limit
+
 
-    # Store the path in a cookie or session if needed
-    response = render_template('uploading.html', filename=filename)
+def _table_json(store, position):
+    """
+    Describe one table, numbered from 1, from the seat arrays.
+    """
+    start, capacity = store.offsets[position], store.capacities[position]
+    return {
+        "table": position + 1,
+        "capacity": capacity,
+        "occupied": store.occupied[position],
+        "seats": [None if occupant_id == FREE else store.names[occupant_id]
+                  for occupant_id in store.occupants[start:start + capacity]],
+    }
+
+
+def _api_response(payload, version, status=200):
+    response = jsonify(version=version, **payload)
+    response.status_code = status
+    response.set_etag(str(version))
     return response
 
-@app.route('/upload')
-def process_upload():
-    filename = request.args.get('filename')
-    filepath = os.path.join('uploads', filename)
-    
-    if not os.path.exists(filepath):
-        return "Upload failed", 400
 
-    # Process as usual
-    names = load_colleagues_from_excel(filepath)
-    config = load_config()
-    room = Openspace(config["tables"], config["seats_per_table"])
-    room.organize(names)
+def _api_error(message, status):
+    return jsonify(error=message), status
 
-    return redirect(url_for('dashboard'))
 
+def _api_read(build):
+    """
+    Answer a GET with build(room) and the room version, or a 304 when the
+    client already has this version.
+    """
+    with room_state.read() as room:
+        if room is None:
+            return _api_error("No seating plan uploaded.", 404)
+        version = room_state.version
+        if request.if_none_match.contains(str(version)):
+            response = app.response_class(status=304)
+            response.set_etag(str(version))
+            return response
+        payload = build(room)
+    if isinstance(payload, tuple):
+        return payload
+    return _api_response(payload, version)
+
+
+def _api_change(change):
+    """
+    Apply change(room) atomically and answer with the tables and unassigned
+    people it touched, plus whatever change() returned.
+    """
+    with write_room() as room:
+        if room is None:
+            return _api_error("No seating plan uploaded.", 404)
+        if request.if_match and not request.if_match.contains(str(room_state.version)):
+            return _api_error("The seating plan changed since it was read.", 412)
+        with track_changes(room) as changes:
+            result = change(room)
+        if isinstance(result, tuple):
+            return result
+        payload = {**_changes_json(room, changes), **result}
+    return _api_response(payload, room_state.version)
+
+
+def _changes_json(room, changes):
+    """
+    Describe what a change touched: the tables as they are now, the tables
+    removed and the changes to the unassigned list.
+    """
+    store = room.seat_store
+    return {
+        "tables": [_table_json(store, position) for position in sorted(changes.tables)],
+        "removed_tables": [position + 1 for position in changes.removed_tables],
+        "table_count": store.table_count,
+        "unassigned": {
+            "added": [name for name, waiting in changes.waiting.items() if waiting and name in room.unassigned],
+            "removed": [name for name, waiting in changes.waiting.items() if not waiting],
+            "cleared": changes.cleared,
+        },
+    }
+
+
+def _api_input(key):
+    data = request.get_json(silent=True) or request.form
+    return data.get(key)
+
+
+@app.route('/api/room')
+def api_room():
+    """
+    Summary of the room: tables, seats, occupied seats, unassigned people, lonely tables.
+    """
+    def build(room):
+        store = room.seat_store
+        return {
+            "tables": store.table_count,
+            "seats": store.total_capacity,
+            "occupied": store.total_occupied,
+            "unassigned": len(room.unassigned),
+            "lonely_tables": len(store.lonely_tables()),
+        }
+    return _api_read(build)
+
+
+@app.route('/api/tables')
+def api_tables():
+    """
+    One page of tables: ?offset= (from 0) and ?limit= (at most API_MAX_PAGE_SIZE).
+    """
+    offset, limit = _page()
+
+    def build(room):
+        store = room.seat_store
+        positions = range(offset, min(offset + limit, store.table_count))
+        return {"offset": offset, "limit": limit, "total": store.table_count,
+                "tables": [_table_json(store, position) for position in positions]}
+    return _api_read(build)
+
+
+@app.route('/api/tables/<int:number>')
+def api_table(number):
+    """
+    One table, numbered from 1.
+    """
+    def build(room):
+        if not 1 <= number <= room.seat_store.table_count:
+            return _api_error(f"No table {number}.", 404)
+        return {"table": _table_json(room.seat_store, number - 1)}
+    return _api_read(build)
 
 
+@app.route('/api/unseated')
+def api_unseated():
+    """
+    One page of the people without a seat, in arrival order.
+    """
+    offset, limit = _page()
+
+    def build(room):
+        names = list(itertools.islice(room.unassigned, offset, offset + limit))
+        return {"offset": offset, "limit": limit, "total": len(room.unassigned), "names": names}
+    return _api_read(build)
+
+
+@app.route('/api/people', methods=['POST'])
+def api_add_person():
+    """
+    Seat a late arrival (see /add_person); {"name": ...} as JSON or form data.
+    """
+    name = _api_input('name')
+    if not name:
+        return _api_error("A name is required.", 400)
+
+    def change(room):
+        report = room.apply_delta(added=[name])
+        return {"seated": bool(report["seated"]), "moved": report["moved"]}
+    return _api_change(change)
+
+
+@app.route('/api/people/<name>', methods=['DELETE'])
+def api_remove_person(name):
+    """
+    Remove a person from the room (see /remove_person_from_room).
+    """
+    def change(room):
+        present = room.is_person_seated(name) or name in room.unassigned
+        report = room.apply_delta(removed=[name])
+        return {"removed": present, "moved": report["moved"]}
+    return _api_change(change)
+
+
+@app.route('/api/tables', methods=['POST'])
+def api_add_table():
+    """
+    Add a table; {"capacity": ...} as JSON or form data.
+    """
+    try:
+        capacity = int(_api_input('capacity'))
+    except (TypeError, ValueError):
+        return _api_error("A whole number of seats is required.", 400)
+    if capacity < 1:
+        return _api_error("A table needs at least one seat.", 400)
+    return _api_change(lambda room: room.add_table(capacity) or {})
+
+
+@app.route('/api/tables/<int:number>', methods=['DELETE'])
+def api_remove_table(number):
+    """
+    Remove an empty table, numbered from 1; later tables move up by one.
+    """
+    def change(room):
+        if not room.remove_table(number):
+            return _api_error(f"Table {number} does not exist or is not empty.", 409)
+        return {}
+    return _api_change(change)
+
+
+@app.route('/api/tables/<int:number>/people', methods=['POST'])
+def api_assign_to_table(number):
+    """
+    Seat a person at a given table (see /assign_to_table); {"name": ...}.
+    """
+    name = _api_input('name')
+    if not name:
+        return _api_error("A name is required.", 400)
+
+    def change(room):
+        if not 1 <= number <= len(room.tables):
+            return _api_error(f"No table {number}.", 404)
+        if not room.tables[number - 1].assign_seat(name):
+            return _api_error(f"Table {number} is full.", 409)
+        room.unassigned.discard(name)
+        return {}
+    return _api_change(change)
+
+
+@app.route('/api/tables/<int:number>/people/<name>', methods=['DELETE'])
+def api_remove_from_table(number, name):
+    """
+    Take a person off a table and put them on the unassigned list
+    (see /remove_person_from_table).
+    """
+    def change(room):
+        if not room.remove_person_from_table(number, name):
+            return _api_error(f"{name} is not seated at table {number}.", 404)
+        if not room.is_person_seated(name):
+            room.unassigned.append(name)
+        return {}
+    return _api_change(change)
+
+
+# === Live updates ===
+# Dashboards follow the changes made by everyone through server-sent events,
+# each change being rendered once by the event hub whatever the number of
+# connected dashboards (see utils/events.py and the "events" section of config.json).
+
+event_hub = EventHub(room_state, _changes_json, **load_config().get("events", {}))
+
+
+@app.route('/events')
+def events():
+    """
+    Stream the changes of the room: a "change" event with the same payload
+    as the API mutations (plus the room version) for every burst of changes,
+    and a "reset" event when the client should reload the whole room.
+    """
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return app.response_class(
+        event_hub.stream(last_event_id),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/assign_to_table', methods=['POST'])
+def assign_to_table():
+    """
+    Assign a specific person to a specific table manually.
+    """
+    name = request.form.get('name')
+    table_index = int(request.form.get('table_index'))
+
+    with write_room() as room:
+        if room and name and 1 <= table_index <= len(room.tables):
+            table = room.tables[table_index - 1]
+            success = table.assign_seat(name)
+            if success:
+                if name in room.unassigned:
+                    room.unassigned.remove(name)
+                app.logger.log(REPORT_LEVEL, "%s has been manually assigned to table %d.", name, table_index)
+    return redirect(url_for('dashboard'))
+
 if __name__ == '__main__':
     # Run Flask app in debug mode for development
     app.run(debug=True)
@@ -0,0 +1,169 @@
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from model.openspace import Openspace
+from utils.room_state import ChangeTracker, RoomState
+
+KEEPALIVE: bytes = b": keepalive\n\n"
+
+
+class EventHub:
+    """
+    Server-sent events describing the changes of a room, shared by every
+    connected client.
+
+    The hub subscribes to the room state: each write() reports the tables
+    and unassigned people it touched, and these reports are merged until a
+    single flusher thread picks them up, waits `coalesce` seconds for more,
+    then renders the touched tables once from the current room. The frame
+    is encoded once and kept in a ring of the last `history` frames, which
+    every client stream reads from. A burst of changes thus costs one
+    render, whatever the number of clients.
+
+    A client that reads slowly is never queued for: its stream only keeps
+    its position in the ring, and the frames it missed are sent back to
+    back on its next write. A client that fell behind the whole ring gets
+    a "reset" event instead, telling it to reload the room.
+    """
+
+    def __init__(
+        self,
+        room_state: RoomState,
+        render: Callable[[Openspace, ChangeTracker], Dict[str, Any]],
+        coalesce: float = 0.05,
+        history: int = 256,
+        heartbeat: float = 15.0,
+        poll: float = 1.0,
+    ) -> None:
+        """
+        :param room_state: Room to follow
+        :param render: Builds the JSON payload of a change from the room and its ChangeTracker
+        :param coalesce: Seconds during which changes are gathered into one event
+        :param history: Events kept for clients that are behind
+        :param heartbeat: Seconds after which an idle stream sends a keepalive comment
+        :param poll: Seconds between checks for changes made by other processes (shared backends)
+        """
+        self.room_state: RoomState = room_state
+        self.render = render
+        self.coalesce: float = coalesce
+        self.heartbeat: float = heartbeat
+        self.poll: float = poll
+        self.sequence: int = 0  # id of the last event
+        self.version: int = room_state.version
+        self.rendered: int = 0  # events rendered, for monitoring
+        self.clients: int = 0
+        self._frames: Deque[Tuple[int, bytes]] = deque(maxlen=history)
+        self._pending: Optional[ChangeTracker] = None
+        self._reset: bool = False
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)  # pending changes for the flusher
+        self._new_frame = threading.Condition(self._lock)  # new events for the streams
+        self._flusher: Optional[threading.Thread] = None
+        room_state.subscribe(self._publish)
+
+    def _publish(self, changes: Optional[ChangeTracker], version: int) -> None:
+        """
+        Room state listener: merge a change into the pending one.
+        """
+        with self._changed:
+            if changes is None:
+                self._pending, self._reset = None, True
+            elif not self._reset and changes.changed:
+                if self._pending is None:
+                    self._pending = ChangeTracker(changes.store)
+                self._pending.merge(changes)
+            else:
+                return
+            self._changed.notify_all()
+
+    def _frame(self, event: str, payload: Dict[str, Any]) -> None:
+        """
+        Append an event to the ring; to be called holding the lock.
+        """
+        self.sequence += 1
+        data = json.dumps(payload, separators=(",", ":"))
+        self._frames.append((self.sequence, f"id: {self.sequence}\nevent: {event}\ndata: {data}\n\n".encode()))
+        self._new_frame.notify_all()
+
+    def _reset_frame(self) -> bytes:
+        return f"id: {self.sequence}\nevent: reset\ndata: {json.dumps({'version': self.version})}\n\n".encode()
+
+    def _flush(self) -> None:
+        """
+        Flusher thread: turn pending changes into events, at most one per
+        `coalesce` seconds.
+        """
+        while True:
+            with self._changed:
+                while self._pending is None and not self._reset:
+                    if not self._changed.wait(self.poll) and self.clients:
+                        break
+            # Gather the changes that follow closely, then catch up with the
+            # room (and, on shared backends, with other processes)
+            time.sleep(self.coalesce)
+            with self.room_state.read() as room:
+                with self._lock:
+                    changes, reset = self._pending, self._reset
+                    self._pending, self._reset = None, False
+                    self.version = self.room_state.version
+                if reset or changes is None or not self.clients:
+                    payload = None
+                else:
+                    payload = self.render(room, changes)
+            with self._lock:
+                if payload is not None:
+                    self.rendered += 1
+                    self._frame("change", {"version": self.version, **payload})
+                elif reset or changes is not None:
+                    # Replaced room, or changes nobody was listening to
+                    self._frame("reset", {"version": self.version})
+
+    def stream(self, last_event_id: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Event stream of one client, for a text/event-stream response.
+
+        :param last_event_id: Id of the last event the client received, when reconnecting
+        :return: Generator of SSE chunks
+        """
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush, name="events", daemon=True)
+                self._flusher.start()
+            self.clients += 1
+            cursor = self.sequence if last_event_id is None else last_event_id
+        try:
+            yield b"retry: 2000\n\n"
+            while True:
+                with self._lock:
+                    self._new_frame.wait_for(lambda: self.sequence != cursor, self.heartbeat)
+                    chunk = self._since(cursor)
+                    cursor = self.sequence
+                yield chunk
+        finally:
+            with self._lock:
+                self.clients -= 1
+
+    def _since(self, cursor: int) -> bytes:
+        """
+        Events after `cursor`, back to back, or a reset when the client is
+        too far behind (or ahead, after a server restart); to be called
+        holding the lock.
+        """
+        missed = self.sequence - cursor
+        if not missed:
+            return KEEPALIVE
+        if missed < 0 or missed > len(self._frames):
+            return self._reset_frame()
+        start = len(self._frames) - missed
+        return b"".join(frame for _, frame in itertools.islice(self._frames, start, None))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Connected clients, last event id and events rendered so far.
+        """
+        with self._lock:
+            return {"clients": self.clients, "sequence": self.sequence, "rendered": self.rendered}
@@ -0,0 +1,290 @@
+import csv
+import json
+import os
+import uuid
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from model.seat_store import FREE, SeatStore
+
+# One exported row: (table number, seat number, occupant or free label)
+Row = Tuple[int, int, str]
+Target = Union[str, os.PathLike, IO]
+
+HEADER: Tuple[str, str, str] = ("Table", "Seat", "Occupant")
+FREE_LABEL: str = "Free"
+
+# Rows gathered per record batch for the columnar formats
+BATCH_ROWS: int = 65_536
+
+# Last row index of an Excel worksheet (the header takes row 0)
+XLSX_MAX_ROWS: int = 1_048_575
+
+_BUFFER_SIZE: int = 1 << 20
+
+
+def iter_seat_rows(store: SeatStore, include_free: bool = True, free_label: str = FREE_LABEL) -> Iterator[Row]:
+    """
+    Generate one row per seat in a single pass over the flat seat arrays,
+    tables and seats numbered from 1, without building Table or Seat views.
+
+    :param store: Seat storage of the room
+    :param include_free: Also yield free seats, labelled with `free_label`
+    :param free_label: Occupant value written for a free seat
+    :return: Iterator over (table, seat, occupant) rows
+    """
+    names = store.names
+    occupants = store.occupants
+    for position, (start, capacity) in enumerate(zip(store.offsets, store.capacities), start=1):
+        for seat, occupant_id in enumerate(occupants[start:start + capacity], start=1):
+            if occupant_id != FREE:
+                yield position, seat, names[occupant_id]
+            elif include_free:
+                yield position, seat, free_label
+
+
+class _Counter:
+    """
+    Pass rows through while counting them.
+    """
+
+    def __init__(self, rows: Iterable[Row]) -> None:
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Row]:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def _open(target: Target, binary: bool):
+    """
+    Return (file object, whether we opened it) for a path or an open file.
+    """
+    if hasattr(target, "write"):
+        return target, False
+    if binary:
+        return open(target, "wb", buffering=_BUFFER_SIZE), True
+    return open(target, "w", newline="", encoding="utf-8", buffering=_BUFFER_SIZE), True
+
+
+def write_csv(rows: Iterable[Row], target: Target, header: Sequence[str] = HEADER) -> int:
+    """
+    Write rows to a CSV file through a large write buffer.
+
+    :param rows: Rows to write, consumed once
+    :param target: Path or text file object
+    :param header: Column names
+    :return: Number of rows written
+    """
+    file, owned = _open(target, binary=False)
+    try:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        counted = _Counter(rows)
+        writer.writerows(counted)
+        return counted.count
+    finally:
+        if owned:
+            file.close()
+
+
+def write_jsonl(rows: Iterable[Row], target: Target, header: Sequence[str] = HEADER) -> int:
+    """
+    Write rows as JSON Lines, one object per seat.
+
+    :param rows: Rows to write, consumed once
+    :param target: Path or text file object
+    :param header: Keys of each object
+    :return: Number of rows written
+    """
+    table_key, seat_key, name_key = (json.dumps(key) for key in header)
+    file, owned = _open(target, binary=False)
+    try:
+        counted = _Counter(rows)
+        file.writelines(
+            f"{{{table_key}: {table}, {seat_key}: {seat}, {name_key}: {json.dumps(name, ensure_ascii=False)}}}\n"
+            for table, seat, name in counted
+        )
+        return counted.count
+    finally:
+        if owned:
+            file.close()
+
+
+def write_xlsx(rows: Iterable[Row], target: Target, header: Sequence[str] = HEADER) -> int:
+    """
+    Write rows to an Excel file with xlsxwriter in constant_memory mode:
+    each row is flushed to disk as soon as the next one starts. A path is
+    only replaced once the whole workbook is written.
+
+    :param rows: Rows to write, consumed once
+    :param target: Path or binary file object
+    :param header: Column names
+    :return: Number of rows written
+    :raises ValueError: If the rows do not fit in one worksheet
+    """
+    import xlsxwriter
+
+    if hasattr(target, "write"):
+        path = temporary = None
+        output = target
+    else:
+        # Written aside and renamed, so a failed export leaves no truncated
+        # file behind; xlsxwriter creates it, with the usual permissions
+        path = os.fspath(target)
+        directory, name = os.path.split(path)
+        temporary = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+        output = temporary
+    try:
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        try:
+            sheet = workbook.add_worksheet("Seating")
+            sheet.write_row(0, 0, header)
+            count = 0
+            for count, row in enumerate(rows, start=1):
+                if count > XLSX_MAX_ROWS:
+                    raise ValueError(f"An Excel worksheet holds at most {XLSX_MAX_ROWS} rows; use csv or parquet.")
+                sheet.write_row(count, 0, row)
+        finally:
+            workbook.close()
+        if temporary is not None:
+            os.replace(temporary, path)
+    except BaseException:
+        if temporary is not None and os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+    return count
+
+
+def _pyarrow():
+    """
+    Import pyarrow, which only the columnar formats need.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet and Arrow exports need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _iter_batches(pa, rows: Iterable[Row], header: Sequence[str], counted: _Counter):
+    """
+    Group rows into Arrow record batches of BATCH_ROWS rows.
+    """
+    schema = pa.schema([(header[0], pa.int32()), (header[1], pa.int32()), (header[2], pa.string())])
+    columns: Tuple[List[int], List[int], List[str]] = ([], [], [])
+    for row in counted:
+        for column, value in zip(columns, row):
+            column.append(value)
+        if len(columns[0]) == BATCH_ROWS:
+            yield pa.record_batch(list(columns), schema=schema)
+            columns = ([], [], [])
+    if columns[0] or not counted.count:
+        yield pa.record_batch(list(columns), schema=schema)
+
+
+def write_parquet(rows: Iterable[Row], target: Target, header: Sequence[str] = HEADER) -> int:
+    """
+    Write rows to a Parquet file, one row group per record batch.
+
+    :param rows: Rows to write, consumed once
+    :param target: Path or binary file object
+    :param header: Column names
+    :return: Number of rows written
+    """
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+
+    counted = _Counter(rows)
+    writer = None
+    try:
+        for batch in _iter_batches(pa, rows, header, counted):
+            if writer is None:
+                writer = pq.ParquetWriter(target, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return counted.count
+
+
+def write_arrow(rows: Iterable[Row], target: Target, header: Sequence[str] = HEADER) -> int:
+    """
+    Write rows to an Arrow IPC (Feather v2) file, batch by batch.
+
+    :param rows: Rows to write, consumed once
+    :param target: Path or binary file object
+    :param header: Column names
+    :return: Number of rows written
+    """
+    pa = _pyarrow()
+
+    counted = _Counter(rows)
+    writer = None
+    try:
+        for batch in _iter_batches(pa, rows, header, counted):
+            if writer is None:
+                writer = pa.ipc.new_file(target if hasattr(target, "write") else os.fspath(target), batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return counted.count
+
+
+EXPORT_FORMATS: Dict[str, Callable[[Iterable[Row], Target, Sequence[str]], int]] = {
+    "csv": write_csv,
+    "xlsx": write_xlsx,
+    "jsonl": write_jsonl,
+    "parquet": write_parquet,
+    "arrow": write_arrow,
+}
+
+EXTENSIONS: Dict[str, str] = {
+    ".csv": "csv",
+    ".xlsx": "xlsx",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+DEFAULT_FORMAT = "csv"
+
+
+def format_for_path(path: Target) -> str:
+    """
+    Pick the export format from a file extension, csv when it is not recognized.
+    """
+    if hasattr(path, "write"):
+        return DEFAULT_FORMAT
+    return EXTENSIONS.get(os.path.splitext(os.fspath(path))[1].lower(), DEFAULT_FORMAT)
+
+
+def export_seating(
+    room,
+    target: Target,
+    fmt: Optional[str] = None,
+    include_free: bool = True,
+    header: Sequence[str] = HEADER,
+) -> int:
+    """
+    Export the seating plan of an Openspace, streaming rows from its seat
+    storage straight into the writer of the chosen format.
+
+    :param room: Openspace to export
+    :param target: Path, or file object (text for csv/jsonl, binary otherwise)
+    :param fmt: 'csv', 'xlsx', 'jsonl', 'parquet' or 'arrow'; None to use the extension of `target`
+    :param include_free: Also export free seats (labelled "Free")
+    :param header: Column names
+    :return: Number of rows written
+    :raises ValueError: If the format is unknown
+    """
+    fmt = fmt or format_for_path(target)
+    try:
+        writer = EXPORT_FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}") from None
+    return writer(iter_seat_rows(room.seat_store, include_free=include_free), target, header)
@@ -1,34 +1,248 @@
 import csv
+import io
 import os
 import json
-import pandas as pd
-from typing import List, Dict
+import re
+import unicodedata
+from itertools import compress, count, repeat
+from operator import not_
+from typing import BinaryIO, Iterable, Iterator, List, Dict, Optional, Sequence, Tuple, Union
 
+from utils import metrics
 
-def create_excel_from_csv(csv_path: str, excel_path: str = "data/colleagues.xlsx") -> None:
+# Headers of the optional whitelist / blacklist columns of a roster (lowercase)
+SIT_WITH_HEADERS = ("sit with", "whitelist", "together")
+AVOID_HEADERS = ("avoid", "blacklist", "apart")
+
+# One roster row: (name, names to sit with, names to avoid)
+RosterRow = Tuple[str, List[str], List[str]]
+
+# A roster is read from a file path or from a binary stream already in memory
+# (an upload's BytesIO or spooled temporary file), which is parsed in place
+RosterSource = Union[str, BinaryIO]
+
+
+def iter_names_from_csv(csv_path: str) -> Iterator[str]:
     """
-    Convert a CSV file into an Excel file and save it.
+    Stream names from a CSV file, one per row (first column), without
+    loading the file in memory. Empty rows and blank names are skipped.
 
-    :param csv_path: Path to the input CSV file.
-    :param excel_path: Path where the output Excel file will be saved.
+    :param csv_path: Path to the CSV file.
+    :return: Iterator over the cleaned names.
+    """
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+        for row in csv.reader(file):
+            if row:
+                name = row[0].strip()
+                if name:
+                    yield name
+
+
+def iter_names_from_excel(excel_path: str) -> Iterator[str]:
+    """
+    Stream names from the first column of an Excel file, skipping the header
+    row. The workbook is opened in openpyxl's read-only mode, so rows are
+    parsed as they are read and memory stays constant whatever the size.
+
+    :param excel_path: Path to the Excel (.xlsx) file.
+    :return: Iterator over the cleaned names, as strings.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        for (value,) in sheet.iter_rows(min_row=2, max_col=1, values_only=True):
+            if value is not None:
+                name = str(value).strip()
+                if name:
+                    yield name
+    finally:
+        workbook.close()
+
+
+def iter_colleagues(path: str) -> Iterator[str]:
+    """
+    Stream names from a roster file, picking the reader from its extension
+    (.csv, otherwise Excel).
+
+    :param path: Path to the roster file.
+    :return: Iterator over the cleaned names.
+    """
+    if path.lower().endswith(".csv"):
+        return iter_names_from_csv(path)
+    return iter_names_from_excel(path)
+
+
+def _split_names(cell) -> List[str]:
+    """
+    Split a cell listing names separated by commas or semicolons.
+    """
+    if cell is None:
+        return []
+    return [name for name in (part.strip() for part in re.split(r"[;,]", str(cell))) if name]
+
+
+def _find_column(header: Sequence, candidates: Sequence[str]) -> Optional[int]:
+    """
+    Return the index of the first header cell matching one of `candidates`.
+    """
+    for index, cell in enumerate(header):
+        if cell is not None and str(cell).strip().lower() in candidates:
+            return index
+    return None
+
+
+def roster_format(source: RosterSource, fmt: Optional[str] = None) -> str:
+    """
+    Return the format of a roster: `fmt` if given, else "csv" for a path
+    ending in .csv and "excel" for anything else.
+    """
+    if fmt is not None:
+        return fmt
+    if isinstance(source, str) and source.lower().endswith(".csv"):
+        return "csv"
+    return "excel"
+
+
+def iter_roster_rows(source: RosterSource, fmt: Optional[str] = None) -> Iterator[RosterRow]:
+    """
+    Stream a roster with seating wishes, one row per person.
+
+    Names come from the first column. In an Excel file, the names to sit
+    with and to avoid come from the columns headed "Sit with" and "Avoid"
+    (or "Whitelist"/"Blacklist"); in a CSV file, which has no header, from
+    the second and third columns. Several names in a cell are separated by
+    commas or semicolons.
+
+    :param source: Path to the roster file (.csv or Excel), or a binary stream
+                   holding one; the stream is read from its current position
+                   and left open.
+    :param fmt: "csv" or "excel"; by default taken from the extension of a
+                path, Excel for a stream (see roster_format()).
+    :return: Iterator over (name, names to sit with, names to avoid).
+    """
+    if roster_format(source, fmt) == "csv":
+        if isinstance(source, str):
+            file = open(source, mode='r', encoding='utf-8', newline='')
+        else:
+            file = _StreamText(source)
+        rows = csv.reader(file)
+        with_column, avoid_column = 1, 2
+    else:
+        from openpyxl import load_workbook
+
+        file = load_workbook(source, read_only=True, data_only=True)
+        rows = file.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        with_column, avoid_column = _find_column(header, SIT_WITH_HEADERS), _find_column(header, AVOID_HEADERS)
+    try:
+        for row in rows:
+            if not row or row[0] is None:
+                continue
+            name = str(row[0]).strip()
+            if not name:
+                continue
+            sit_with = _split_names(row[with_column]) if with_column is not None and with_column < len(row) else []
+            avoid = _split_names(row[avoid_column]) if avoid_column is not None and avoid_column < len(row) else []
+            yield name, sit_with, avoid
+    finally:
+        file.close()
+
+
+class _StreamText(io.TextIOWrapper):
+    """
+    UTF-8 text view of a binary stream that leaves the stream open when closed.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__(stream, encoding='utf-8', newline='')
+
+    def close(self) -> None:
+        self.detach()
+
+
+def load_roster(
+    source: RosterSource, fmt: Optional[str] = None
+) -> Tuple[List[str], List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Load the names of a roster along with its seating wishes as pairs.
+
+    :param source: Path to the roster file (.csv or Excel), or a binary stream
+                   holding one (see iter_roster_rows()).
+    :param fmt: "csv" or "excel", see roster_format().
+    :return: (names, pairs to seat together, pairs to keep apart)
     """
     names: List[str] = []
+    together: List[Tuple[str, str]] = []
+    apart: List[Tuple[str, str]] = []
+    file_format = roster_format(source, fmt)
+    with metrics.timer("openspace_roster_parse_seconds", format=file_format):
+        for name, sit_with, avoid in iter_roster_rows(source, file_format):
+            names.append(name)
+            together.extend((name, other) for other in sit_with)
+            apart.extend((name, other) for other in avoid)
+    metrics.inc("openspace_roster_rows_total", len(names), format=file_format)
+    return names, together, apart
 
-    # Read names from the CSV file (assumes one name per row)
-    with open(csv_path, mode='r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        for row in reader:
-            if row:
-                names.append(row[0].strip())
 
-    # Create the output directory if it doesn't exist
-    os.makedirs(os.path.dirname(excel_path), exist_ok=True)
+def write_names_to_excel(names: Iterable[str], excel_path: str) -> int:
+    """
+    Write names to an Excel file under a "Name" header, row by row
+    (openpyxl write-only mode, constant memory).
 
-    # Save names to Excel
-    df = pd.DataFrame(names, columns=["Name"])
-    df.to_excel(excel_path, index=False)
+    :param names: Names to write, consumed once.
+    :param excel_path: Path where the Excel file will be saved.
+    :return: Number of names written.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(["Name"])
+    count = 0
+    for name in names:
+        sheet.append([name])
+        count += 1
+    workbook.save(excel_path)
+    return count
+
+
+def write_roster_to_excel(rows: Iterable[RosterRow], excel_path: str) -> int:
+    """
+    Write roster rows to an Excel file under "Name", "Sit with" and "Avoid"
+    headers, row by row (openpyxl write-only mode, constant memory).
+
+    :param rows: (name, names to sit with, names to avoid), consumed once.
+    :param excel_path: Path where the Excel file will be saved.
+    :return: Number of rows written.
+    """
+    from openpyxl import Workbook
 
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(["Name", "Sit with", "Avoid"])
+    count = 0
+    for name, sit_with, avoid in rows:
+        sheet.append([name, "; ".join(sit_with) or None, "; ".join(avoid) or None])
+        count += 1
+    workbook.save(excel_path)
+    return count
+
+
+def create_excel_from_csv(csv_path: str, excel_path: str = "data/colleagues.xlsx") -> None:
+    """
+    Convert a CSV file into an Excel file and save it.
+    Rows are streamed from the CSV straight into the workbook; seating
+    wishes in the second and third columns are kept (see iter_roster_rows).
+
+    :param csv_path: Path to the input CSV file.
+    :param excel_path: Path where the output Excel file will be saved.
+    """
+    # Create the output directory if it doesn't exist
+    os.makedirs(os.path.dirname(excel_path) or ".", exist_ok=True)
 
+    write_roster_to_excel(iter_roster_rows(csv_path), excel_path)
 
 
 def load_colleagues_from_excel(excel_path: str) -> List[str]:
@@ -44,14 +258,12 @@ def load_colleagues_from_excel(excel_path: str) -> List[str]:
     -------
     List[str]
         A list of colleague names, cleaned and as strings
+        (use iter_names_from_excel() to stream them instead)
     """
     try:
-        # Load only the first 1 column, up to 500 rows
-        df = pd.read_excel(excel_path, usecols="A", nrows=500)
-
-        # Automatically use the first column, whatever its name
-        col = df.columns[0]
-        names = df[col].dropna().astype(str).str.strip().tolist()
+        with metrics.timer("openspace_roster_parse_seconds", format="excel"):
+            names = list(iter_names_from_excel(excel_path))
+        metrics.inc("openspace_roster_rows_total", len(names), format="excel")
         return names
 
     except Exception as e:
@@ -59,6 +271,173 @@ def load_colleagues_from_excel(excel_path: str) -> List[str]:
         return []
 
 
+# Names are checked in batches: each step maps a C function (normalization,
+# whitespace folding, str.isalpha, the compiled pattern, casefold) over the
+# whole column, and only the names it flags are looked at one by one. The
+# duplicate scan is the one Python loop over every name.
+#
+# Default rule: words of letters, in any script, joined by single spaces,
+# hyphens or apostrophes ("Zoë", "Jean-Luc", "O'Brien", "Mary Ann"). A
+# letter may carry combining marks (accents left apart by NFD, vowel signs
+# of Indic scripts as in "प्रीति"); the re module has no class for them, so
+# they are dropped before the match, see NameRules.matches()
+NAME_PATTERN = r"[^\W\d_]+(?:[ '’-][^\W\d_]+)*"
+NORMAL_FORMS = ("NFC", "NFD", "NFKC", "NFKD")
+
+# A problem with one roster entry: (entry number from 1, name, reason)
+NameProblem = Tuple[int, str, str]
+
+
+class NameValidationError(ValueError):
+    """
+    Raised with every problem found in a roster at once, in roster order.
+    """
+
+    def __init__(self, errors: List[NameProblem], shown: int = 20) -> None:
+        self.errors: List[NameProblem] = errors
+        listed = ", ".join(f"#{position} {name!r} ({reason})" for position, name, reason in errors[:shown])
+        more = f" and {len(errors) - shown} more" if len(errors) > shown else ""
+        super().__init__(f"Invalid names found: {listed}{more}")
+
+
+class NameRules:
+    """
+    How roster names are normalized and checked, see the "names" section of
+    config.json.
+
+    :param normalization: Unicode normal form applied to names ("NFC", "NFKC", ...), None to keep them as sent
+    :param pattern: Regular expression a whole name must match, see NAME_PATTERN
+    :param max_length: Longest name accepted, in characters; None for no limit
+    :param duplicates: "rename" to give repeated names a " (2)", " (3)"... suffix in
+                       roster order, "error" to report them
+    """
+
+    def __init__(self, normalization: Optional[str] = "NFC", pattern: str = NAME_PATTERN,
+                 max_length: Optional[int] = 100, duplicates: str = "rename") -> None:
+        if normalization is not None and normalization not in NORMAL_FORMS:
+            raise ValueError(f"Unknown Unicode normal form '{normalization}'. Available: {', '.join(NORMAL_FORMS)}")
+        if duplicates not in ("rename", "error"):
+            raise ValueError(f"Unknown duplicate handling '{duplicates}'. Available: rename, error")
+        self.normalization: Optional[str] = normalization
+        self.pattern: "re.Pattern[str]" = re.compile(pattern)
+        self.max_length: Optional[int] = max_length
+        self.duplicates: str = duplicates
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "NameRules":
+        """
+        Build the rules of the "names" section of config.json; defaults for what it leaves out.
+        """
+        section = config.get("names") or {}
+        return cls(**{key: section[key] for key in ("normalization", "pattern", "max_length", "duplicates")
+                      if key in section})
+
+    def matches(self, name: str) -> bool:
+        """
+        Check a normalized name against the pattern. With the default
+        pattern, combining marks that follow a letter count as part of it.
+        """
+        if self.pattern.pattern == NAME_PATTERN:
+            name = _strip_marks(name)
+        return self.pattern.fullmatch(name) is not None
+
+
+def _strip_marks(name: str) -> str:
+    """
+    Drop the combining marks (Unicode categories Mn, Mc, Me) that follow a
+    letter, so that "Zoë" in NFD or "प्रीति" reads as letters only.
+    """
+    kept: List[str] = []
+    for char in name:
+        if not (kept and kept[-1].isalpha() and unicodedata.category(char)[0] == "M"):
+            kept.append(char)
+    return "".join(kept)
+
+
+def normalize_names(names: Sequence[str], normalization: Optional[str] = "NFC") -> List[str]:
+    """
+    Apply a Unicode normal form to names, collapse the runs of whitespace
+    inside them and strip their ends.
+
+    :param names: Names, in roster order
+    :param normalization: Unicode normal form, None to skip it
+    :return: The cleaned names, in the same order
+    """
+    if normalization is not None:
+        names = map(unicodedata.normalize, repeat(normalization), names)
+    return list(map(" ".join, map(str.split, names)))
+
+
+def normalize_pairs(pairs: Sequence[Tuple[str, str]], normalization: Optional[str] = "NFC") -> List[Tuple[str, str]]:
+    """
+    Clean the names of seating wish pairs as normalize_names() does, so
+    that they match the names of the roster.
+    """
+    flat = normalize_names([name for pair in pairs for name in pair], normalization)
+    return list(zip(flat[0::2], flat[1::2]))
+
+
+def validate_names(names: Sequence[str], rules: Optional[NameRules] = None) -> Tuple[List[str], List[Tuple[int, str]]]:
+    """
+    Normalize a roster column and check it against the rules, reporting
+    every problem at once: empty names, names too long, names breaking the
+    pattern and, with duplicates="error", repeated names. Names equal but
+    for case are repeats. With duplicates="rename", each repeat gets the
+    first free " (n)" suffix, so the ids only depend on the roster order.
+
+    :param names: Names, in roster order
+    :param rules: Rules to apply, the defaults of NameRules when None
+    :return: (names to seat, [(entry number from 1, new name)] for the renamed repeats)
+    :raises NameValidationError: If any name breaks the rules
+    """
+    rules = rules or NameRules()
+    names = normalize_names(names, rules.normalization)
+    errors: List[NameProblem] = []
+
+    if rules.pattern.pattern == NAME_PATTERN:
+        # Plain words of letters always match the default pattern: only the
+        # other names go through the regex
+        suspects = compress(count(1), map(not_, map(str.isalpha, names)))
+        invalid = [position for position in suspects if not rules.matches(names[position - 1])]
+    else:
+        invalid = compress(count(1), map(not_, map(rules.pattern.fullmatch, names)))
+    for position in invalid:
+        name = names[position - 1]
+        errors.append((position, name, "empty" if not name else "characters not allowed"))
+    if rules.max_length is not None and names and max(map(len, names)) > rules.max_length:
+        errors.extend((position, name, f"longer than {rules.max_length} characters")
+                      for position, name in enumerate(names, start=1) if len(name) > rules.max_length)
+
+    renamed: List[Tuple[int, str]] = []
+    keys = list(map(str.casefold, names))
+    taken: set = set()
+    add = taken.add
+    repeats = [position for position, key in enumerate(keys, start=1) if key in taken or add(key)]
+    if repeats and rules.duplicates == "error":
+        repeated = {keys[position - 1] for position in repeats}
+        first: Dict[str, int] = {}
+        for position, key in enumerate(keys, start=1):
+            if key in repeated and key not in first:
+                first[key] = position
+        errors.extend((position, names[position - 1], f"duplicate of #{first[keys[position - 1]]}")
+                      for position in repeats)
+    elif repeats:
+        # `taken` holds every name of the roster, so an id never takes a name in use
+        for position in repeats:
+            key = keys[position - 1]
+            suffix = 2
+            while f"{key} ({suffix})" in taken:
+                suffix += 1
+            taken.add(f"{key} ({suffix})")
+            names[position - 1] = f"{names[position - 1]} ({suffix})"
+            renamed.append((position, names[position - 1]))
+
+    if errors:
+        errors.sort()
+        raise NameValidationError(errors)
+    return names, renamed
+
+
 def load_config(filepath: str = "config.json") -> Dict:
     """
     Load configuration values from a JSON file.
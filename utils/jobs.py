@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """
+    Raised by JobQueue.submit() when `max_jobs` jobs are already queued or
+    running; the caller may try again after `retry_after` seconds.
+    """
+
+    def __init__(self, pending: int, retry_after: float) -> None:
+        self.pending: int = pending
+        self.retry_after: float = retry_after
+        super().__init__(f"{pending} jobs are already waiting or running; try again in {retry_after:g} s")
+
+
+class Job:
+    """
+    One background task and its progress, as reported by the task itself.
+
+    `revision` grows with every change, so a client can ask to be woken
+    up only when something happened since the revision it last saw.
+    """
+
+    def __init__(self, queue: "JobQueue", kind: str) -> None:
+        self.id: str = uuid.uuid4().hex
+        self.kind: str = kind
+        self.status: str = QUEUED
+        self.stage: str = ""
+        self.progress: float = 0.0
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.created: float = time.time()
+        self.finished: Optional[float] = None
+        self.revision: int = 0
+        self._queue = queue
+
+    def report(self, stage: str, progress: float) -> None:
+        """
+        Publish the current stage of the task and its progress (0 to 1).
+        """
+        with self._queue._changed:
+            self.stage = stage
+            self.progress = progress
+            self.revision += 1
+            self._queue._changed.notify_all()
+
+    def _finish(self, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._queue._changed:
+            self._queue._pending -= 1
+            self.status = status
+            self.result = result
+            self.error = error
+            self.progress = 1.0 if status == DONE else self.progress
+            self.finished = time.time()
+            self.revision += 1
+            self._queue._changed.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "error": self.error,
+            "result": self.result,
+            "revision": self.revision,
+            "seconds": round((self.finished or time.time()) - self.created, 3),
+        }
+
+
+class JobQueue:
+    """
+    In-process background job queue: a pool of worker threads runs the
+    tasks while the request that submitted them returns at once with a job id.
+
+    Tasks receive their Job as first argument to report progress. Their
+    return value becomes the job result; an exception marks the job as
+    failed with its message, and is logged with its traceback. Only the
+    last `max_jobs` jobs are kept, the oldest finished ones being forgotten
+    first, and no new job is accepted while `max_jobs` are queued or running.
+
+    Jobs live in the memory of the process that accepted them: behind a
+    server with several worker processes, /jobs/<id> must reach that same
+    process (sticky sessions), or the web app must run a single worker.
+    """
+
+    def __init__(self, workers: int = 2, max_jobs: int = 100, retry_after: float = 5.0) -> None:
+        self.max_jobs: int = max_jobs
+        # Seconds a refused client is asked to wait, see QueueFullError
+        self.retry_after: float = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: int = 0  # jobs queued or running
+        self._changed = threading.Condition()
+
+    def submit(self, kind: str, task: Callable[..., Any], *args: Any) -> Job:
+        """
+        Queue task(job, *args) and return its job right away.
+
+        :param kind: Short label of the task, e.g. 'upload'
+        :param task: Callable run by a worker thread
+        :return: The queued job
+        :raises QueueFullError: If `max_jobs` jobs are already queued or running
+        """
+        job = Job(self, kind)
+        with self._changed:
+            if self._pending >= self.max_jobs:
+                raise QueueFullError(self._pending, self.retry_after)
+            self._pending += 1
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        self._executor.submit(self._run, job, task, args)
+        return job
+
+    def _run(self, job: Job, task: Callable[..., Any], args) -> None:
+        with self._changed:
+            job.status = RUNNING
+            job.revision += 1
+            self._changed.notify_all()
+        try:
+            result = task(job, *args)
+        except Exception as error:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job._finish(FAILED, error=str(error) or type(error).__name__)
+        else:
+            job._finish(DONE, result=result)
+
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished is not None]
+        while len(self._jobs) > self.max_jobs and finished:
+            del self._jobs[finished.pop(0)]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Return a job by id, None if unknown or forgotten.
+        """
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, since: int = -1, timeout: float = 0.0) -> Optional[Job]:
+        """
+        Wait until a job has a revision newer than `since`, or is finished,
+        for at most `timeout` seconds (long polling).
+
+        :return: The job, None if unknown
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            job = self._jobs.get(job_id)
+            while job is not None and job.revision <= since and job.finished is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._changed.wait(remaining):
+                    break
+            return job
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count the jobs kept, by status.
+        """
+        with self._changed:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and, with `wait`, let the running ones finish.
+        """
+        self._executor.shutdown(wait=wait)
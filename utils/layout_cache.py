@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class LayoutCache:
+    """
+    Bounded, thread-safe LRU cache for parsed rosters and finished layouts.
+
+    Each entry has a weight (names in a roster, seats in a layout). The
+    least recently used entries are evicted as soon as the cache holds more
+    than `max_entries` entries or more than `max_weight` in total. An entry
+    heavier than `max_weight` on its own is never stored.
+    """
+
+    def __init__(self, max_entries: int = 32, max_weight: int = 1_000_000) -> None:
+        self.max_entries: int = max_entries
+        self.max_weight: int = max_weight
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._weight: int = 0
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry and mark it as recently used.
+
+        :param key: Cache key
+        :return: The cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, weight: int = 1) -> None:
+        """
+        Store an entry, evicting least recently used ones to stay within limits.
+
+        :param key: Cache key
+        :param value: Value to cache
+        :param weight: Size of the value counted against max_weight
+        """
+        if self.max_entries <= 0 or weight > self.max_weight:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[1]
+            self._entries[key] = (value, weight)
+            self._weight += weight
+            while len(self._entries) > self.max_entries or self._weight > self.max_weight:
+                _, (_, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "weight": self._weight,
+                "max_entries": self.max_entries,
+                "max_weight": self.max_weight,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
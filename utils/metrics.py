@@ -0,0 +1,165 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Tuple
+
+# Opt-in instrumentation: counters, gauges and timing histograms kept in
+# process and rendered in the Prometheus text format. Everything is off until
+# enable() is called (the "metrics" section of config.json, or main.py
+# --profile). While off, inc() and observe() return at once and timer() hands
+# out one shared no-op context manager, so instrumented code pays a function
+# call and a flag check.
+ENABLED: bool = False
+
+# Upper bounds of the timing histogram buckets, in seconds
+BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, math.inf)
+
+HELP: Dict[str, str] = {
+    "openspace_organize_phase_seconds": "Time spent in each phase of Openspace.organize()",
+    "openspace_organized_people_total": "People handed to Openspace.organize()",
+    "openspace_lonely_moves_total": "People moved by eliminate_lonely_tables()",
+    "openspace_lonely_moves_skipped_total": "Moves of eliminate_lonely_tables() skipped for a seating wish",
+    "openspace_lonely_pass_seconds": "Time spent in eliminate_lonely_tables()",
+    "openspace_roster_parse_seconds": "Time spent reading a roster file",
+    "openspace_roster_rows_total": "Roster rows read",
+    "openspace_http_request_seconds": "Latency of the web routes",
+    "openspace_room_version": "Version of the current room",
+    "openspace_event_clients": "Open /events streams",
+    "openspace_jobs": "Background jobs kept, by status",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = {}
+_gauges: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], List[float]] = {}  # bucket counts, then sum and count
+_NO_TIMER = nullcontext()
+
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    """
+    Forget every value recorded so far.
+    """
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def _key(name: str, labels: Dict[str, object]) -> Tuple[str, Labels]:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def inc(name: str, value: float = 1.0, **labels: object) -> None:
+    """
+    Add `value` to a counter.
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels: object) -> None:
+    """
+    Set a gauge to its current value.
+    """
+    if not ENABLED:
+        return
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name: str, seconds: float, **labels: object) -> None:
+    """
+    Record a duration in a histogram.
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        values = _histograms.get(key)
+        if values is None:
+            values = _histograms[key] = [0.0] * (len(BUCKETS) + 2)
+        values[bisect.bisect_left(BUCKETS, seconds)] += 1
+        values[-2] += seconds
+        values[-1] += 1
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: Dict[str, object]) -> None:
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+def timer(name: str, **labels: object):
+    """
+    Context manager recording the time spent in its block in a histogram.
+    """
+    if not ENABLED:
+        return _NO_TIMER
+    return _Timer(name, labels)
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+    """
+    lines: List[str] = []
+    with _lock:
+        families: Dict[str, Tuple[str, list]] = {}
+        for kind, values in (("counter", _counters), ("gauge", _gauges), ("histogram", _histograms)):
+            for (name, labels), value in values.items():
+                families.setdefault(name, (kind, []))[1].append((labels, value))
+        for name in sorted(families):
+            kind, samples = families[name]
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples):
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(BUCKETS, value):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_format_labels(labels, (('le', le),))} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {value[-2]:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_number(value[-1])}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,79 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+class Profiler:
+    """
+    Profile a stretch of the program and write the result to `path`:
+
+    - a `.folded` path gets flamegraph-ready collapsed stacks ("a;b;c count"
+      per line, for flamegraph.pl or speedscope), sampled from the profiled
+      thread every `interval` seconds by a background thread;
+    - any other path gets cProfile statistics, for pstats, snakeviz or
+      gprof2dot.
+    """
+
+    def __init__(self, path: str, interval: float = 0.001) -> None:
+        self.path: str = path
+        self.interval: float = interval
+        self.sampling: bool = path.endswith(".folded")
+        self._profile: Optional[cProfile.Profile] = None
+        self._samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.sampling:
+            thread_id = threading.get_ident()
+            self._sampler = threading.Thread(target=self._sample, args=(thread_id,), daemon=True)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _sample(self, thread_id: int) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._samples[";".join(reversed(stack))] += 1
+
+    def stop(self, top: int = 15) -> str:
+        """
+        Stop profiling, write the output file and return a short summary.
+
+        :param top: Functions listed in the summary of a cProfile run
+        :return: Summary text
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self.sampling:
+            self._stop.set()
+            self._sampler.join()
+            with open(self.path, "w", encoding="utf-8") as file:
+                for stack, count in self._samples.most_common():
+                    file.write(f"{stack} {count}\n")
+            return f"{sum(self._samples.values())} samples of {len(self._samples)} distinct stacks"
+
+        self._profile.disable()
+        self._profile.dump_stats(self.path)
+        summary = io.StringIO()
+        pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(top)
+        return summary.getvalue()
+
+
+def profile_path(default_directory: str = "data") -> str:
+    """
+    Default output file of a profile: a timestamped .prof file.
+    """
+    return os.path.join(default_directory, time.strftime("profile-%Y%m%d-%H%M%S.prof"))
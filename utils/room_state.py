@@ -0,0 +1,469 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+from model.openspace import Openspace
+from model.seat_store import SeatStore
+from utils.snapshot_store import RecordBuffer, SnapshotStore, decode_snapshot, encode_snapshot, replay_records
+
+
+class RoomState:
+    """
+    Where the web app keeps its current room.
+
+    Routes never hold on to the room: they open read() to look at it or
+    write() to change it, and replace() installs a new layout. Everything
+    done inside one write() block is applied atomically. `version` grows
+    with every change, so callers can tell whether the room moved on.
+    """
+
+    version: int = 0
+
+    def __init__(self) -> None:
+        # Called as listener(changes, version) after every change, with the
+        # ChangeTracker of a write() or None when the room was replaced
+        self.listeners: List[Callable[[Optional["ChangeTracker"], int], None]] = []
+
+    def _notify(self, changes: Optional["ChangeTracker"]) -> None:
+        for listener in self.listeners:
+            listener(changes, self.version)
+
+    def read(self) -> ContextManager[Optional[Openspace]]:
+        """
+        Give access to the current room (None when no layout was uploaded)
+        for reading only.
+        """
+        raise NotImplementedError
+
+    def write(self) -> ContextManager[Optional[Openspace]]:
+        """
+        Give access to the current room (None when no layout was uploaded)
+        for a change applied atomically when the block ends; an exception
+        raised in the block discards the change where the backend can.
+        """
+        raise NotImplementedError
+
+    def replace(self, room: Optional[Openspace]) -> None:
+        """
+        Install a new room (or none), dropping the current one.
+        """
+        raise NotImplementedError
+
+    def subscribe(self, listener: Callable[[Optional["ChangeTracker"], int], None]) -> None:
+        """
+        Call listener(changes, version) after every change of the room: with
+        the tables and unassigned people a write() touched, or with None when
+        the whole room changed. Listeners run while the change still holds the
+        room, so they must be quick and must not use the room state themselves.
+        """
+        self.listeners.append(listener)
+
+
+class _ReadWriteLock:
+    """
+    Many readers or one writer; waiting writers go first so that a steady
+    flow of dashboard reads cannot starve a mutation.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def reading(self) -> Iterator[None]:
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class LocalRoomState(RoomState):
+    """
+    Room kept in this process, for a single-process (threaded) server.
+
+    Reads share a lock, writes take it alone. The lock covers the whole
+    room rather than single tables: every change also updates room-wide
+    counters and indexes, and the tables it touches are only known once it
+    runs. With a SnapshotStore, the
+    room survives restarts: it is loaded from it on first use (not when the
+    backend is built, so that merely importing the web app neither reads the
+    snapshot nor takes the lock on its log), replace() saves a snapshot and
+    every change is appended to its log.
+    """
+
+    def __init__(self, snapshot_store: Optional[SnapshotStore] = None) -> None:
+        super().__init__()
+        self.snapshot_store: Optional[SnapshotStore] = snapshot_store
+        self._lock = _ReadWriteLock()
+        self._load_lock = threading.Lock()
+        self._loaded: bool = snapshot_store is None
+        self._room: Optional[Openspace] = None
+        self.version = 0
+
+    def _load(self) -> None:
+        """
+        Load the saved room the first time the room is used.
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._room = self.snapshot_store.load()
+                self._loaded = True
+
+    @contextmanager
+    def read(self) -> Iterator[Optional[Openspace]]:
+        self._load()
+        with self._lock.reading():
+            yield self._room
+
+    @contextmanager
+    def write(self) -> Iterator[Optional[Openspace]]:
+        self._load()
+        with self._lock.writing():
+            if self._room is None or not self.listeners:
+                yield self._room
+                self.version += 1
+                return
+            with track_changes(self._room) as changes:
+                yield self._room
+            self.version += 1
+            if changes.changed:
+                self._notify(changes)
+
+    def replace(self, room: Optional[Openspace]) -> None:
+        # The saved room is dropped anyway: no need to load it first
+        with self._load_lock:
+            self._loaded = True
+        with self._lock.writing():
+            if room is not None and self.snapshot_store is not None:
+                self.snapshot_store.save(room)
+            self._room = room
+            self.version += 1
+            self._notify(None)
+
+
+class SQLiteRoomState(RoomState):
+    """
+    Room shared by every process of a multi-worker server through one
+    SQLite database in WAL mode.
+
+    The database holds a binary snapshot of the room (see
+    utils.snapshot_store) at some version, plus one row of seat mutation
+    records per later change. Each process keeps a local copy of the room
+    and the version it reflects. A write() opens an IMMEDIATE transaction,
+    which serializes writers across processes, catches the local copy up
+    with the rows written by others, runs the block while recording its
+    mutations, and stores them as the next version before committing. A
+    read() catches up the same way in a read transaction, which WAL lets
+    run alongside a writer. Past `compact_after` rows, the log is folded
+    into a new snapshot.
+    """
+
+    def __init__(self, path: str, compact_after: int = 1000, timeout: float = 30.0) -> None:
+        """
+        :param path: Database file, created if needed
+        :param compact_after: Mutation rows after which a new snapshot is written
+        :param timeout: Seconds to wait for another process's write transaction
+        """
+        super().__init__()
+        self.path: str = path
+        self.compact_after: int = compact_after
+        self.timeout: float = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()  # guards the local copy of the room
+        self._room: Optional[Openspace] = None
+        self.version = -1  # nothing loaded yet
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        database = self._connection()
+        database.execute("PRAGMA journal_mode=WAL")
+        database.execute(
+            "CREATE TABLE IF NOT EXISTS snapshot (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER, data BLOB)"
+        )
+        database.execute("CREATE TABLE IF NOT EXISTS mutations (version INTEGER PRIMARY KEY, records BLOB)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection (sqlite3 connections are per thread).
+        """
+        database = getattr(self._local, "database", None)
+        if database is None:
+            database = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            database.execute("PRAGMA synchronous=NORMAL")
+            self._local.database = database
+        return database
+
+    def _refresh(self, database: sqlite3.Connection) -> None:
+        """
+        Bring the local room to the latest version in the database.
+        """
+        row = database.execute("SELECT version, data IS NULL FROM snapshot").fetchone()
+        if row is None or row[1]:
+            had_room = self._room is not None
+            self._room, self.version = None, row[0] if row else 0
+            if had_room:
+                self._notify(None)
+            return
+        base = row[0]
+        latest = database.execute("SELECT MAX(version) FROM mutations").fetchone()[0]
+        latest = max(base, latest or base)
+        if self._room is not None and self.version == latest:
+            return
+
+        constraints = self._room.constraints if self._room is not None else None
+        changes = None
+        if self._room is None or not base <= self.version <= latest:
+            store, unassigned, constraints = decode_snapshot(
+                database.execute("SELECT data FROM snapshot").fetchone()[0])
+            pool: Dict[str, None] = dict.fromkeys(unassigned)
+        else:
+            # Replay the rows of other processes over the local copy, noting
+            # what they touched for the listeners
+            store, pool, base = self._room.seat_store, dict.fromkeys(self._room.unassigned), self.version
+            if self.listeners:
+                changes = store.journal = ChangeTracker(store)
+        try:
+            for (records,) in database.execute(
+                "SELECT records FROM mutations WHERE version > ? ORDER BY version", (base,)
+            ):
+                replay_records(records, store, pool)
+        finally:
+            store.journal = None
+        if changes is not None:
+            before = self._room.unassigned
+            changes.waiting = {name: True for name in pool if name not in before}
+            changes.waiting.update((name, False) for name in before if name not in pool)
+        self._room = Openspace.from_store(store, pool)
+        self._room.constraints = constraints
+        self.version = latest
+        self._notify(changes)
+
+    @contextmanager
+    def _transaction(self, begin: str) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block in a database transaction and under the local lock; on
+        error the transaction is rolled back and the local copy reloaded later.
+        """
+        with self._lock:
+            database = self._connection()
+            database.execute(begin)
+            try:
+                yield database
+                database.execute("COMMIT")
+            except BaseException:
+                database.execute("ROLLBACK")
+                self._room, self.version = None, -1
+                raise
+
+    @contextmanager
+    def read(self) -> Iterator[Optional[Openspace]]:
+        with self._transaction("BEGIN") as database:
+            self._refresh(database)
+            yield self._room
+
+    @contextmanager
+    def write(self) -> Iterator[Optional[Openspace]]:
+        with self._transaction("BEGIN IMMEDIATE") as database:
+            self._refresh(database)
+            room = self._room
+            if room is None:
+                yield None
+                return
+            buffer = RecordBuffer()
+            room.seat_store.journal = room.unassigned.journal = buffer
+            try:
+                with track_changes(room) as changes:
+                    yield room
+            finally:
+                room.seat_store.journal = room.unassigned.journal = None
+            if not buffer.records:
+                return
+            self.version += 1
+            database.execute("INSERT INTO mutations (version, records) VALUES (?, ?)",
+                             (self.version, bytes(buffer.records)))
+            if database.execute("SELECT COUNT(*) FROM mutations").fetchone()[0] > self.compact_after:
+                self._write_snapshot(database, room)
+            self._notify(changes)
+
+    def _write_snapshot(self, database: sqlite3.Connection, room: Openspace) -> None:
+        """
+        Store the room as the snapshot of the current version and drop the log rows.
+        """
+        database.execute("INSERT OR REPLACE INTO snapshot (id, version, data) VALUES (1, ?, ?)",
+                         (self.version, encode_snapshot(room.seat_store, room.unassigned,
+                                                        constraints=room.constraints)))
+        database.execute("DELETE FROM mutations WHERE version <= ?", (self.version,))
+
+    def replace(self, room: Optional[Openspace]) -> None:
+        with self._transaction("BEGIN IMMEDIATE") as database:
+            row = database.execute(
+                "SELECT MAX(version) FROM (SELECT version FROM snapshot UNION ALL SELECT version FROM mutations)"
+            ).fetchone()
+            self.version = (row[0] or 0) + 1
+            if room is None:
+                # Keep the version in the table so that versions never repeat
+                database.execute("INSERT OR REPLACE INTO snapshot (id, version, data) VALUES (1, ?, NULL)",
+                                 (self.version,))
+                database.execute("DELETE FROM mutations")
+            else:
+                self._write_snapshot(database, room)
+            self._room = room
+            self._notify(None)
+
+
+class ChangeTracker:
+    """
+    Journal noting which tables and unassigned people a change touched,
+    while forwarding every call to the journals it stands in for. Table
+    positions are those of the room after the change: tables shifted by a
+    removal are renumbered, and removed tables are listed apart, numbered
+    as they were when they left. A table added and removed again within the
+    change is not listed at all.
+    """
+
+    def __init__(self, store: SeatStore, seats_journal=None, pool_journal=None) -> None:
+        self.store = store
+        self.seats_journal = seats_journal
+        self.pool_journal = pool_journal
+        self.tables: Dict[int, None] = {}
+        self.added_tables: Dict[int, None] = {}
+        self.removed_tables: List[int] = []
+        self.waiting: Dict[str, bool] = {}  # name -> True if added to the list, False if removed
+        self.cleared: bool = False
+
+    def take(self, position: int, seat: int, name: str) -> None:
+        self.tables[position] = None
+        if self.seats_journal is not None:
+            self.seats_journal.take(position, seat, name)
+
+    def release(self, position: int, seat: int) -> None:
+        self.tables[position] = None
+        if self.seats_journal is not None:
+            self.seats_journal.release(position, seat)
+
+    def add_table(self, capacity: int) -> None:
+        self.tables[self.store.table_count - 1] = None
+        self.added_tables[self.store.table_count - 1] = None
+        if self.seats_journal is not None:
+            self.seats_journal.add_table(capacity)
+
+    def remove_table(self, position: int) -> None:
+        self._forget_table(position)
+        if self.seats_journal is not None:
+            self.seats_journal.remove_table(position)
+
+    def _forget_table(self, position: int) -> None:
+        # Added tables come after every older one, so removing one of them
+        # shifts no table the reader already knows: it is not reported
+        known = position not in self.added_tables
+        self.tables = self._shift(self.tables, position)
+        self.added_tables = self._shift(self.added_tables, position)
+        if known:
+            self.removed_tables.append(position)
+
+    @staticmethod
+    def _shift(positions: Dict[int, None], removed: int) -> Dict[int, None]:
+        return {(position - 1 if position > removed else position): None
+                for position in positions if position != removed}
+
+    def wait(self, name: str) -> None:
+        self.waiting[name] = True
+        if self.pool_journal is not None:
+            self.pool_journal.wait(name)
+
+    def unwait(self, name: str) -> None:
+        self.waiting[name] = False
+        if self.pool_journal is not None:
+            self.pool_journal.unwait(name)
+
+    def clear_waiting(self) -> None:
+        self.waiting.clear()
+        self.cleared = True
+        if self.pool_journal is not None:
+            self.pool_journal.clear_waiting()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.tables or self.removed_tables or self.waiting or self.cleared)
+
+    def merge(self, later: "ChangeTracker") -> None:
+        """
+        Add a later change to this one, as if both had been tracked together.
+        """
+        for position in later.removed_tables:
+            self._forget_table(position)
+        self.tables.update(later.tables)
+        self.added_tables.update(later.added_tables)
+        if later.cleared:
+            self.waiting, self.cleared = dict(later.waiting), True
+        else:
+            self.waiting.update(later.waiting)
+
+
+@contextmanager
+def track_changes(room: Openspace) -> Iterator[ChangeTracker]:
+    """
+    Record what the block changes in the room, on top of the journals
+    already attached to its seats and unassigned list.
+    """
+    store, pool = room.seat_store, room.unassigned
+    tracker = ChangeTracker(store, store.journal, pool.journal)
+    store.journal = pool.journal = tracker
+    try:
+        yield tracker
+    finally:
+        store.journal, pool.journal = tracker.seats_journal, tracker.pool_journal
+
+
+ROOM_STATES: Dict[str, Callable[[Dict], RoomState]] = {
+    "memory": lambda config: LocalRoomState(SnapshotStore.from_config(config)),
+    "sqlite": lambda config: SQLiteRoomState(
+        config.get("state", {}).get("path", "data/state/room.db"),
+        compact_after=config.get("state", {}).get("compact_after", 1000),
+    ),
+}
+
+
+def open_room_state(config: Dict) -> RoomState:
+    """
+    Build the room state backend named in the "state" section of config.json
+    ('memory' when absent).
+
+    :param config: Full configuration
+    :return: The backend
+    :raises ValueError: If the backend is unknown
+    """
+    backend = config.get("state", {}).get("backend", "memory")
+    try:
+        factory = ROOM_STATES[backend]
+    except KeyError:
+        raise ValueError(f"Unknown room state backend '{backend}'. Choose from: {', '.join(ROOM_STATES)}") from None
+    return factory(config)
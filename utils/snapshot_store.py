@@ -0,0 +1,439 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from model.constraints import PairConstraints
+from model.openspace import Openspace
+from model.seat_store import FREE, SeatStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, a single writer is assumed
+    fcntl = None
+
+SNAPSHOT_FILE: str = "room.snapshot"
+LOG_FILE: str = "mutations.log"
+
+# Snapshot header: magic, byte order of the arrays, then the number of
+# tables, seats, interned names, names holding extra seats, unassigned people,
+# sit-together and sit-apart wishes and the length of the name blob, then
+# the generation of the snapshot. The arrays follow, in _FIELDS order, then
+# the extra seats as (id, count) pairs, then the names (interned names, the
+# unassigned people, then both names of each wish) as one NUL-separated
+# UTF-8 blob.
+MAGIC: bytes = b"OSPSNAP3"
+_HEADER = struct.Struct("<8s2s8IQ")
+_BYTE_ORDERS = {"little": b"LE", "big": b"BE"}
+_FIELDS: Tuple[str, ...] = ("capacities", "offsets", "occupied", "occupants", "seat_of")
+
+# The log starts with the generation of the snapshot it continues: a log
+# left over from an older snapshot (a crash between writing the snapshot
+# and emptying the log) is recognized and dropped instead of replayed.
+LOG_MAGIC: bytes = b"OSPLOG01"
+_LOG_HEADER = struct.Struct("<8sQ")
+
+# Log records: operation, two integers, length of the name that follows
+_RECORD = struct.Struct("<Bii H")
+TAKE, RELEASE, ADD_TABLE, REMOVE_TABLE, WAIT, UNWAIT, CLEAR_WAITING = range(1, 8)
+
+_SEPARATOR = "\0"
+
+
+def encode_snapshot(store: SeatStore, unassigned: Iterable[str], generation: int = 0,
+                    constraints: Optional[PairConstraints] = None) -> bytes:
+    """
+    Serialize a seat store, its unassigned people and the seating wishes
+    of the room to snapshot bytes.
+
+    :param store: Seats of the room
+    :param unassigned: People of the room without a seat
+    :param generation: Identifier of the snapshot, repeated at the start of its log
+    :param constraints: Sit-together and sit-apart wishes of the room
+    :return: The snapshot
+    :raises ValueError: If a name contains a NUL character
+    """
+    waiting = list(unassigned)
+    together = constraints.together if constraints else []
+    apart = constraints.apart if constraints else []
+    names = list(store.names) + waiting
+    for pair in together + apart:
+        names.extend(pair)
+    blob = _SEPARATOR.join(names)
+    if blob.count(_SEPARATOR) != max(len(names) - 1, 0):
+        raise ValueError("Names containing a NUL character cannot be saved in a snapshot.")
+    blob_bytes = blob.encode("utf-8")
+    extra = array("i")
+    for occupant_id, count in store.extra_seats.items():
+        extra.extend((occupant_id, count))
+
+    header = _HEADER.pack(
+        MAGIC, _BYTE_ORDERS[sys.byteorder], store.table_count, len(store.occupants),
+        len(store.names), len(store.extra_seats), len(waiting), len(together), len(apart), len(blob_bytes), generation,
+    )
+    parts = [header]
+    parts.extend(getattr(store, field).tobytes() for field in _FIELDS)
+    parts.append(extra.tobytes())
+    parts.append(blob_bytes)
+    return b"".join(parts)
+
+
+def decode_snapshot(buffer) -> Tuple[SeatStore, List[str], Optional[PairConstraints]]:
+    """
+    Rebuild a seat store from snapshot bytes (or any buffer, such as a
+    memory map): each array is copied out in one block and the room totals
+    are recomputed with C-level array methods.
+
+    :param buffer: The snapshot
+    :return: (seat store, unassigned people, seating wishes or None)
+    :raises ValueError: If the buffer is not a snapshot
+    """
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a seating snapshot.")
+    (magic, byte_order, tables, seats, interned, extra_count, waiting,
+     together, apart, blob_size, _) = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a seating snapshot.")
+    swap = byte_order != _BYTE_ORDERS[sys.byteorder]
+
+    store = SeatStore()
+    offset = _HEADER.size
+    view = memoryview(buffer)
+    try:
+        for field, length in zip(_FIELDS + ("extra",), (tables, tables, tables, seats, interned, 2 * extra_count)):
+            values = array("i")
+            values.frombytes(view[offset:offset + length * values.itemsize])
+            offset += length * values.itemsize
+            if swap:
+                values.byteswap()
+            if field == "extra":
+                store.extra_seats = dict(zip(values[::2], values[1::2]))
+            else:
+                setattr(store, field, values)
+        blob = bytes(view[offset:offset + blob_size]).decode("utf-8")
+    finally:
+        view.release()
+
+    names = blob.split(_SEPARATOR) if interned + waiting + together + apart else []
+    store.names = names[:interned]
+    store._ids = {name: occupant_id for occupant_id, name in enumerate(store.names)}
+    store.total_capacity = sum(store.capacities)
+    store.total_occupied = sum(store.occupied)
+    store.seated_people = interned - store.seat_of.count(FREE)
+    start = interned + waiting
+    pairs = list(zip(names[start::2], names[start + 1::2]))
+    constraints = PairConstraints(pairs[:together], pairs[together:]) if pairs else None
+    return store, names[interned:start], constraints
+
+
+def snapshot_generation(buffer) -> int:
+    """
+    Read the generation stored in the header of a snapshot.
+
+    :raises ValueError: If the buffer is not a snapshot
+    """
+    if len(buffer) < _HEADER.size or _HEADER.unpack_from(buffer)[0] != MAGIC:
+        raise ValueError("Not a seating snapshot.")
+    return _HEADER.unpack_from(buffer)[-1]
+
+
+def write_snapshot(store: SeatStore, unassigned: Iterable[str], path: str, generation: int = 0,
+                   constraints: Optional[PairConstraints] = None) -> int:
+    """
+    Write a binary snapshot of a seat store, its unassigned people and the
+    seating wishes of the room. The file is written next to `path` and
+    renamed over it, so a crash never leaves a half-written snapshot behind.
+
+    :param store: Seats of the room
+    :param unassigned: People of the room without a seat
+    :param path: Snapshot file
+    :param generation: Identifier of the snapshot (see encode_snapshot())
+    :param constraints: Sit-together and sit-apart wishes of the room
+    :return: Size of the snapshot in bytes
+    :raises ValueError: If a name contains a NUL character
+    """
+    data = encode_snapshot(store, unassigned, generation, constraints)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return len(data)
+
+
+def read_snapshot(path: str) -> Tuple[SeatStore, List[str], Optional[PairConstraints], int]:
+    """
+    Load a snapshot written by write_snapshot(), through a memory map of the file.
+
+    :param path: Snapshot file
+    :return: (seat store, unassigned people, seating wishes or None, generation)
+    :raises ValueError: If the file is not a snapshot
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        try:
+            return decode_snapshot(mapped) + (snapshot_generation(mapped),)
+        except ValueError:
+            raise ValueError(f"{path} is not a seating snapshot.") from None
+
+
+def encode_record(operation: int, first: int = 0, second: int = 0, name: str = "") -> bytes:
+    """
+    Encode one seat mutation as a log record.
+    """
+    encoded = name.encode("utf-8")
+    return _RECORD.pack(operation, first, second, len(encoded)) + encoded
+
+
+def replay_records(buffer, store: SeatStore, pool: Dict[str, None], start: int = 0) -> Tuple[int, int]:
+    """
+    Apply log records to a seat store and an unassigned list (a dict used
+    as an ordered set). A record cut short ends the replay.
+
+    :param buffer: Records, back to back
+    :param store: Seats to update
+    :param pool: Unassigned people to update
+    :param start: Offset of the first record in `buffer`
+    :return: (records applied, offset after the last record applied)
+    """
+    offset, count = start, 0
+    end = len(buffer)
+    while offset + _RECORD.size <= end:
+        operation, first, second, length = _RECORD.unpack_from(buffer, offset)
+        if offset + _RECORD.size + length > end:
+            break
+        name = bytes(buffer[offset + _RECORD.size:offset + _RECORD.size + length]).decode("utf-8")
+        offset += _RECORD.size + length
+        count += 1
+        if operation == TAKE:
+            store.take(first, second, name)
+        elif operation == RELEASE:
+            store.release(first, second)
+        elif operation == ADD_TABLE:
+            store.add_table(first)
+        elif operation == REMOVE_TABLE:
+            store.remove_table(first)
+        elif operation == WAIT:
+            pool[name] = None
+        elif operation == UNWAIT:
+            pool.pop(name, None)
+        elif operation == CLEAR_WAITING:
+            pool.clear()
+    return count, offset
+
+
+class Journal:
+    """
+    Journal interface called by SeatStore and UnassignedPool after each
+    change; subclasses decide where the encoded records go.
+    """
+
+    def _append(self, record: bytes) -> None:
+        raise NotImplementedError
+
+    def take(self, position: int, seat: int, name: str) -> None:
+        self._append(encode_record(TAKE, position, seat, name))
+
+    def release(self, position: int, seat: int) -> None:
+        self._append(encode_record(RELEASE, position, seat))
+
+    def add_table(self, capacity: int) -> None:
+        self._append(encode_record(ADD_TABLE, capacity))
+
+    def remove_table(self, position: int) -> None:
+        self._append(encode_record(REMOVE_TABLE, position))
+
+    def wait(self, name: str) -> None:
+        self._append(encode_record(WAIT, name=name))
+
+    def unwait(self, name: str) -> None:
+        self._append(encode_record(UNWAIT, name=name))
+
+    def clear_waiting(self) -> None:
+        self._append(encode_record(CLEAR_WAITING))
+
+
+class RecordBuffer(Journal):
+    """
+    Journal keeping the records of a change in memory.
+    """
+
+    def __init__(self) -> None:
+        self.records = bytearray()
+
+    def _append(self, record: bytes) -> None:
+        self.records += record
+
+
+class SnapshotLockedError(RuntimeError):
+    """
+    Raised when the log of a SnapshotStore is already written by another process.
+    """
+
+
+class SnapshotStore(Journal):
+    """
+    Persistence for one Openspace: a binary snapshot plus an append-only
+    log of the seat mutations made since.
+
+    save() writes a snapshot and starts an empty log, both stamped with a
+    new random generation so that load() never replays a log over a
+    snapshot it does not continue; from then on, the
+    store is set as the journal of the room's SeatStore and UnassignedPool,
+    which report every take, release, add_table, remove_table and change
+    of the unassigned list. Each change is appended to the log as one
+    small binary record in a single write. load() maps the snapshot, replays
+    the log over it and, when the log has grown past `compact_after`
+    records, folds it into a fresh snapshot.
+
+    Only one process at a time may write to a directory: the store holds an
+    exclusive lock on the log from save() or load() until close(), and
+    another process trying to open it gets a SnapshotLockedError.
+    """
+
+    def __init__(self, directory: str, fsync: bool = False, compact_after: int = 10_000) -> None:
+        """
+        :param directory: Folder holding the snapshot and the log
+        :param fsync: Flush every log record to disk before returning
+        :param compact_after: Log records after which load() writes a fresh snapshot
+        """
+        self.directory: str = directory
+        self.fsync: bool = fsync
+        self.compact_after: int = compact_after
+        self.snapshot_path: str = os.path.join(directory, SNAPSHOT_FILE)
+        self.log_path: str = os.path.join(directory, LOG_FILE)
+        self.records: int = 0  # records in the log since the snapshot
+        self.generation: int = 0  # generation of the snapshot the log continues
+        self._log = None
+
+    @classmethod
+    def from_config(cls, config: dict, namespace: Optional[str] = None) -> Optional["SnapshotStore"]:
+        """
+        Build the store described by the "persistence" section of config.json,
+        None when the section is missing or has no directory.
+
+        :param config: Loaded config.json
+        :param namespace: Sub-folder of the directory, so that programs sharing
+                          config.json (the CLI and the web app) keep separate rooms
+        """
+        section = config.get("persistence") or {}
+        if not section.get("directory"):
+            return None
+        directory = os.path.join(section["directory"], namespace) if namespace else section["directory"]
+        return cls(directory, fsync=section.get("fsync", False),
+                   compact_after=section.get("compact_after", 10_000))
+
+    def save(self, room: Openspace) -> int:
+        """
+        Write a snapshot of the room, empty the log and record the room's
+        later changes.
+
+        :param room: Room to persist
+        :return: Size of the snapshot in bytes
+        :raises SnapshotLockedError: If another process writes to the directory
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_log()
+        generation = int.from_bytes(os.urandom(8), "little")
+        size = write_snapshot(room.seat_store, room.unassigned, self.snapshot_path, generation, room.constraints)
+        # A crash here leaves the previous log, which load() drops: its
+        # generation is not the one of the new snapshot
+        self._start_log(generation)
+        self.attach(room)
+        return size
+
+    def load(self) -> Optional[Openspace]:
+        """
+        Rebuild the room from the snapshot and the log, then keep recording
+        its changes.
+
+        :return: The room, or None if nothing was saved yet
+        :raises SnapshotLockedError: If another process writes to the directory
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
+        # Locked before reading, so that no other process appends meanwhile
+        self._lock_log()
+        store, unassigned, constraints, self.generation = read_snapshot(self.snapshot_path)
+        pool = dict.fromkeys(unassigned)
+        self.records = self._replay(store, pool)
+        room = Openspace.from_store(store, pool)
+        room.constraints = constraints
+        if self.records > self.compact_after:
+            self.save(room)
+        else:
+            self.attach(room)
+        return room
+
+    def _lock_log(self) -> None:
+        """
+        Open the log for appending, unless it is open already, and take the
+        exclusive lock on it.
+        """
+        if self._log is not None:
+            return
+        log = open(self.log_path, "ab", buffering=0)
+        if fcntl is not None:
+            try:
+                fcntl.flock(log.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                log.close()
+                raise SnapshotLockedError(f"{self.log_path} is written by another process") from None
+        self._log = log
+
+    def _start_log(self, generation: int) -> None:
+        """
+        Empty the log and stamp it with the generation of the current snapshot.
+        """
+        self._log.truncate(0)
+        self._log.write(_LOG_HEADER.pack(LOG_MAGIC, generation))
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self.generation = generation
+        self.records = 0
+
+    def attach(self, room: Openspace) -> None:
+        """
+        Record the changes of the room's seats and unassigned list in the log.
+        """
+        room.seat_store.journal = self
+        room.unassigned.journal = self
+
+    def close(self) -> None:
+        """
+        Close the log file, which releases its lock.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _replay(self, store: SeatStore, pool: Dict[str, None]) -> int:
+        """
+        Apply the log records to a freshly loaded store and unassigned list.
+        A record cut short by a crash ends the log and is dropped; a log of
+        another generation than the snapshot is dropped whole.
+
+        :return: Number of records applied
+        """
+        if os.path.getsize(self.log_path) >= _LOG_HEADER.size:
+            with open(self.log_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                current = _LOG_HEADER.unpack_from(mapped) == (LOG_MAGIC, self.generation)
+                if current:
+                    count, offset = replay_records(mapped, store, pool, start=_LOG_HEADER.size)
+                    end = len(mapped)
+            if current:
+                if offset < end:
+                    os.truncate(self.log_path, offset)
+                return count
+        self._start_log(self.generation)
+        return 0
+
+    def _append(self, record: bytes) -> None:
+        if self._log is None:
+            return
+        self._log.write(record)
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self.records += 1
@@ -0,0 +1,110 @@
+import os
+import re
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+# Uploads are kept as <sha256 of the content><extension>: a file uploaded
+# twice, or by two people at once, is stored once, and no name sent by a
+# client reaches the file system. Only files named that way are pruned, so
+# anything else in the directory is left alone.
+_STORED_NAME = re.compile(r"[0-9a-f]{64}(\.[0-9a-z]+)?")
+
+
+class UploadStore:
+    """
+    Directory of uploaded files under content-addressed names, pruned after
+    each save to the newest `max_files` files, none older than `max_age`
+    seconds.
+    """
+
+    def __init__(self, directory: str, keep: bool = False, max_files: Optional[int] = 100,
+                 max_age: Optional[float] = None) -> None:
+        self.directory: str = directory
+        # Keep every upload, not only those whose sender asked for it
+        self.keep: bool = keep
+        self.max_files: Optional[int] = max_files
+        self.max_age: Optional[float] = max_age
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["UploadStore"]:
+        """
+        Build the store described by the "uploads" section of config.json,
+        None when the section is missing or has no directory.
+        """
+        section = config.get("uploads") or {}
+        if not section.get("directory"):
+            return None
+        max_age_days = section.get("max_age_days")
+        return cls(section["directory"], keep=section.get("keep", False), max_files=section.get("max_files", 100),
+                   max_age=max_age_days * 86400 if max_age_days is not None else None)
+
+    def path_for(self, content_hash: str, extension: str = "") -> str:
+        """
+        Path of an upload, from the SHA-256 hex digest of its content.
+        """
+        return os.path.join(self.directory, content_hash + extension.lower())
+
+    def save(self, content: bytes, content_hash: str, extension: str = "") -> str:
+        """
+        Store an upload, unless the same content is already stored (its
+        retention then starts again), and prune the directory.
+
+        :param content: Bytes of the uploaded file
+        :param content_hash: SHA-256 hex digest of `content`
+        :param extension: Extension of the file, such as ".xlsx"
+        :return: Path of the stored file
+        """
+        path = self.path_for(content_hash, extension)
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            # Written aside and renamed, so a reader never sees half a file
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=".upload-")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(content)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        self.prune()
+        return path
+
+    def stored(self) -> List[Tuple[float, str]]:
+        """
+        List the stored uploads as (modification time, path), newest first.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        files = []
+        for name in names:
+            if _STORED_NAME.fullmatch(name):
+                path = os.path.join(self.directory, name)
+                try:
+                    files.append((os.stat(path).st_mtime, path))
+                except FileNotFoundError:
+                    pass  # pruned meanwhile by another process
+        files.sort(reverse=True)
+        return files
+
+    def prune(self) -> int:
+        """
+        Delete the uploads beyond `max_files` or older than `max_age`.
+
+        :return: Number of files deleted
+        """
+        files = self.stored()
+        oldest = time.time() - self.max_age if self.max_age is not None else None
+        removed = 0
+        for rank, (modified, path) in enumerate(files):
+            if (self.max_files is not None and rank >= self.max_files) or (oldest is not None and modified < oldest):
+                try:
+                    os.unlink(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed